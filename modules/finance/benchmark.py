@@ -0,0 +1,366 @@
+"""
+Finans modülü performans ölçümleri.
+
+Gerçek IncomeCategory/ExpenseCategory değerleriyle, aynı tohum (seed) için
+her çalıştırmada birebir aynı olan sentetik defterler üretir ve her boyutta
+şu işlemleri ölçer:
+    - defter okuma (FinanceRepository.load_all, soğuk ve sıcak önbellek)
+    - FinancialAnalyzer raporları (soğuk: önbellek boş, sıcak: defter önbellekte)
+    - FinanceManager.add_transaction (tek kayıt, işlem başına süre)
+    - toplu kayıt girişi (FinanceManager.add_transactions)
+    - maaş ödemesi (FinanceManager.process_monthly_salaries)
+
+Sonuçlar JSON olarak yazılır (süre ve tepe bellek). Önceki bir sonuç dosyası
+taban (baseline) olarak verilirse, eşikten fazla yavaşlayan ölçümler listelenir
+ve program 1 ile çıkar:
+
+    python -m modules.finance.benchmark --sizes 10000,100000 --out sonuc.json
+    python -m modules.finance.benchmark --sizes 10000 --baseline sonuc.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from .data import STORAGE_MODES, ShardedFinanceRepository, SqliteFinanceRepository
+from .data.constants import DATETIME_FORMAT, TransactionType, IncomeCategory, ExpenseCategory
+from .data.ids import transaction_id_at
+from .data.ledger_cache import ledger_cache
+from .data.timestamps import SECONDS_PER_DAY, from_epoch, to_epoch
+from .services.analyzer import FinancialAnalyzer
+from .services.manager import FinanceManager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.20
+# Bu süreden kısa ölçümler zamanlayıcı gürültüsü sayılır, gerilemede dikkate alınmaz
+MIN_COMPARABLE_SECONDS = 0.005
+
+_INCOME_CATEGORIES = [c.value for c in IncomeCategory]
+_EXPENSE_CATEGORIES = [c.value for c in ExpenseCategory]
+
+
+# --- SENTETİK VERİ ---
+
+def synthetic_records(count, seed=42, end_day=None, days=730, athletes=500):
+    """
+    'count' adet kaydı, end_day'de biten 'days' günlük döneme zaman sırasıyla
+    yayarak üretir (üretici; bellekte liste tutulmaz). Giderlerin yaklaşık
+    yarısı bir sporcuya bağlıdır. Kimlikler de tohumdan türetilir.
+    """
+    rng = random.Random(seed)
+    end_day = end_day or datetime.now().date()
+    end = to_epoch(datetime(end_day.year, end_day.month, end_day.day)) + SECONDS_PER_DAY
+    start = end - days * SECONDS_PER_DAY
+    step = (end - start) / max(count, 1)
+
+    for i in range(count):
+        zaman = int(start + (i + rng.random()) * step)
+        moment = from_epoch(zaman)
+        is_income = rng.random() < 0.45
+        category = rng.choice(_INCOME_CATEGORIES if is_income else _EXPENSE_CATEGORIES)
+        # 25 TL - 50.000 TL, küçük tutarlar daha sık
+        kurus = min(int(rng.paretovariate(1.2) * 2500), 5_000_000)
+        record = {
+            "id": transaction_id_at(moment, rng.getrandbits(80)),
+            "tarih": moment.strftime(DATETIME_FORMAT),
+            "zaman": zaman,
+            "tip": TransactionType.INCOME.value if is_income else TransactionType.EXPENSE.value,
+            "kategori": category,
+            "tutar": kurus / 100,
+            "tutar_kurus": kurus,
+            "aciklama": f"{category} #{i % 997}",
+        }
+        if not is_income and rng.random() < 0.5:
+            record["sporcu_id"] = f"S{rng.randrange(athletes):04d}"
+        yield record
+
+
+# Boş bir deftere sentetik kayıtları yazar
+def populate(repo, records, chunk_size=50_000):
+    if isinstance(repo, (SqliteFinanceRepository, ShardedFinanceRepository)):
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                repo.save_records(chunk)
+                chunk = []
+        repo.save_records(chunk)
+    else:
+        # JSON ve günlük modunda snapshot dosyası akış halinde yazılır
+        with open(repo.file_path, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for i, record in enumerate(records):
+                f.write(",\n" if i else "\n")
+                f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n]")
+    ledger_cache.invalidate()
+
+
+def synthetic_people(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        {"id": f"P{i:05d}", "name": f"Personel {i}", "salary": rng.randrange(17_000, 120_000)}
+        for i in range(count)
+    ]
+
+
+# process_monthly_salaries için Information modülünün yerine geçen sabit liste
+class _StaticPeople:
+    def __init__(self, people):
+        self.people = people
+
+    def get_all(self):
+        return self.people
+
+
+# --- ÖLÇÜM ---
+
+def measure(func, repeat=1, setup=None, memory=True):
+    """
+    func'ı 'repeat' kez çalıştırıp en kısa süreyi alır. Tepe bellek, süre
+    ölçümünü bozmamak için ayrı bir tracemalloc turunda ölçülür.
+    Dönüş: {'seconds', 'peak_bytes'}
+    """
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def _report_cases(analyzer, today):
+    this_month = (today.year, today.month)
+    quarter = (today.month - 1) // 3 + 1
+    return [
+        ("rapor.haftalik", lambda: analyzer.analyze_by_period("week")),
+        ("rapor.aylik", lambda: analyzer.analyze_by_period("month")),
+        ("rapor.yillik", lambda: analyzer.analyze_by_period("year")),
+        ("rapor.aralik_90_gun", lambda: analyzer.analyze_range(today - timedelta(days=89), today)),
+        ("rapor.ay", lambda: analyzer.analyze_month(*this_month)),
+        ("rapor.ceyrek", lambda: analyzer.analyze_quarter(today.year, quarter)),
+        ("rapor.kayan_toplam", lambda: analyzer.rolling_sum(30, end_date=today)),
+        ("rapor.aydan_aya", lambda: analyzer.compare_month_over_month(*this_month)),
+        ("rapor.yildan_yila", lambda: analyzer.compare_year_over_year(today.year)),
+        ("rapor.bakiye_tarihte", lambda: analyzer.balance_at(today - timedelta(days=200))),
+        ("rapor.bakiye_serisi", lambda: analyzer.balance_series(end_date=today, days=365)),
+        ("rapor.sporcu_maliyeti", lambda: analyzer.calculate_athlete_total_cost("S0007")),
+        ("rapor.tum_sporcular", lambda: analyzer.calculate_all_athletes_cost()),
+        ("rapor.butce_durumu", lambda: analyzer.get_budget_status()),
+        ("rapor.pano", lambda: analyzer.dashboard()),
+        ("rapor.arama", lambda: analyzer.search_transactions("bağış", ignore_case=True)),
+    ]
+
+
+def run_size(size, workdir, storage="json", seed=42, end_day=None, repeat=3,
+             memory=True, single_ops=20, bulk_rows=10_000, people=1_000):
+    """
+    Tek bir defter boyutu için tüm ölçümleri çalıştırır.
+    Okuma ölçümleri önce, defteri büyüten yazma ölçümleri en sonda yapılır.
+    Dönüş: [{'size', 'case', 'ops', 'seconds', 'per_op', 'peak_bytes'}, ...]
+    """
+    end_day = end_day or datetime.now().date()
+    repo_class, default_name = STORAGE_MODES[storage]
+    repo = repo_class(os.path.join(workdir, f"{size}_{default_name}"))
+    populate(repo, synthetic_records(size, seed=seed, end_day=end_day))
+
+    manager = FinanceManager(repo=repo)
+    manager.info_repo = _StaticPeople(synthetic_people(people, seed=seed))
+    analyzer = FinancialAnalyzer(repo=repo)
+    # Özet dosyası bir kez oluşturulur; raporlar onu okur
+    manager.rebuild_aggregates()
+
+    results = []
+
+    def record(case, result, ops=1):
+        results.append({
+            "size": size, "case": case, "ops": ops,
+            "seconds": result["seconds"], "per_op": result["seconds"] / ops,
+            "peak_bytes": result["peak_bytes"],
+        })
+
+    def cold():
+        ledger_cache.invalidate()
+        analyzer.analysis_cache.clear()
+
+    record("load_all.soguk", measure(repo.load_all, repeat, setup=ledger_cache.invalidate, memory=memory))
+    record("load_all.sicak", measure(repo.load_all, repeat, memory=memory))
+
+    for case, func in _report_cases(analyzer, end_day):
+        record(case + ".soguk", measure(func, repeat, setup=cold, memory=memory))
+        record(case + ".sicak", measure(func, repeat, setup=analyzer.analysis_cache.clear, memory=memory))
+
+    rng = random.Random(seed + 1)
+    expense = TransactionType.EXPENSE.value
+
+    def add_single():
+        for i in range(single_ops):
+            manager.add_transaction(expense, rng.choice(_EXPENSE_CATEGORIES), 100 + i, "ölçüm")
+    record("add_transaction", measure(add_single, 1, memory=memory), ops=single_ops)
+
+    bulk = [
+        {"tip": expense, "kategori": rng.choice(_EXPENSE_CATEGORIES),
+         "tutar": rng.randrange(100, 10_000), "aciklama": "toplu ölçüm"}
+        for _ in range(bulk_rows)
+    ]
+    record("toplu_giris", measure(lambda: manager.add_transactions(bulk), 1, memory=memory), ops=bulk_rows)
+    record("maas_odemesi", measure(manager.process_monthly_salaries, 1, memory=memory), ops=people)
+
+    ledger_cache.invalidate()
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, storage="json", seed=42, end_day=None, workdir=None, **options):
+    """
+    Verilen boyutlar için ölçümleri çalıştırır ve sonuç belgesini döner.
+    workdir verilmezse geçici klasör kullanılır ve sonunda silinir.
+    """
+    end_day = end_day or datetime.now().date()
+    own_dir = workdir is None
+    # Göreli yollar depoların veri klasörüne değil çalışma dizinine göre çözülür
+    workdir = os.path.abspath(workdir) if workdir else tempfile.mkdtemp(prefix="finans_olcum_")
+    try:
+        results = []
+        for size in sizes:
+            results.extend(run_size(size, workdir, storage=storage, seed=seed, end_day=end_day, **options))
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "tarih": datetime.now().strftime(DATETIME_FORMAT),
+            "python": platform.python_version(),
+            "numpy": np.__version__ if np is not None else None,
+            "platform": platform.platform(),
+            "depolama": storage,
+            "tohum": seed,
+            "bitis_gunu": end_day.isoformat(),
+            "boyutlar": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Her (boyut, ölçüm) çifti için süreyi tabanla karşılaştırır.
+    İşlem başı süre, tabandakinin (1 + threshold) katını aşarsa gerileme sayılır.
+    Dönüş: [{'size', 'case', 'baseline', 'current', 'ratio'}, ...] (en kötü önce)
+    """
+    previous = {(r["size"], r["case"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["size"], result["case"]))
+        if old is None or old["per_op"] <= 0:
+            continue
+        if max(result["seconds"], old["seconds"]) < MIN_COMPARABLE_SECONDS:
+            continue
+        ratio = result["per_op"] / old["per_op"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "size": result["size"], "case": result["case"],
+                "baseline": old["per_op"], "current": result["per_op"], "ratio": ratio,
+            })
+    regressions.sort(key=lambda r: r["ratio"], reverse=True)
+    return regressions
+
+
+def _format_bytes(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def print_results(document):
+    print(f"{'Boyut':>10}  {'Ölçüm':<28} {'Süre (sn)':>11} {'İşlem başı':>12} {'Tepe bellek':>12}")
+    for r in document["results"]:
+        print(f"{r['size']:>10}  {r['case']:<28} {r['seconds']:>11.4f} "
+              f"{r['per_op']:>12.6f} {_format_bytes(r['peak_bytes']):>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m modules.finance.benchmark",
+        description="Finans modülü performans ölçümleri")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Virgülle ayrılmış defter boyutları (örn. 10000,100000,10000000)")
+    parser.add_argument("--storage", choices=sorted(STORAGE_MODES), default="json")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Okuma ölçümlerinin tekrar sayısı")
+    parser.add_argument("--single-ops", type=int, default=20,
+                        help="Tek tek eklenecek kayıt sayısı (JSON modunda her ekleme defteri yeniden yazar)")
+    parser.add_argument("--bulk-rows", type=int, default=10_000, help="Toplu girişteki satır sayısı")
+    parser.add_argument("--people", type=int, default=1_000, help="Maaş ödemesindeki kişi sayısı")
+    parser.add_argument("--no-memory", action="store_true", help="Tepe bellek ölçümünü atla")
+    parser.add_argument("--workdir", help="Sentetik defterlerin yazılacağı klasör (varsayılan: geçici)")
+    parser.add_argument("--out", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="İzin verilen yavaşlama oranı (0.2 = %%20)")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes tam sayı listesi olmalı")
+
+    document = run_benchmarks(sizes, storage=args.storage, seed=args.seed, workdir=args.workdir,
+                              repeat=args.repeat, memory=not args.no_memory, single_ops=args.single_ops,
+                              bulk_rows=args.bulk_rows, people=args.people)
+    print_results(document)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar yazıldı: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(document, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} ölçümde %{args.threshold * 100:.0f} üzeri yavaşlama:")
+            for r in regressions:
+                print(f"  {r['size']:>10}  {r['case']:<28} {r['baseline']:.6f} -> {r['current']:.6f} "
+                      f"(x{r['ratio']:.2f})")
+            return 1
+        print("\nTabana göre gerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
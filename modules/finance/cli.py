@@ -0,0 +1,64 @@
+"""
+Finans modülü komut satırı araçları (proje kök dizininden çalıştırılır):
+
+    python -m modules.finance.cli import islemler.csv --workers 4
+    python -m modules.finance.cli export rapor.csv --from 01-01-2025 --to 31-03-2025 --type Gider
+
+Depolama modu console_app ile aynı şekilde FINANCE_STORAGE ortam
+değişkeninden okunur (json / journal / sqlite / sharded).
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from modules.finance.data.constants import DATE_FORMAT, TransactionType
+from modules.finance.data.storage import create_repository
+from modules.finance.services.manager import FinanceManager
+
+
+def _date(text):
+    try:
+        return datetime.strptime(text, DATE_FORMAT).date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' geçersiz, beklenen format: GG-AA-YYYY")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m modules.finance.cli",
+                                     description="Finans işlemleri içe/dışa aktarma")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imp = commands.add_parser("import", help="CSV/JSONL dosyasından işlem aktarır")
+    imp.add_argument("path")
+    imp.add_argument("--format", choices=("csv", "jsonl"), help="varsayılan: dosya uzantısı")
+    imp.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                     help="doğrulama süreç sayısı (1: aynı süreçte)")
+    imp.add_argument("--chunk-size", type=int, default=1000)
+    imp.add_argument("--rejects", help="reddedilen satırlar (varsayılan: <girdi>.rejected.jsonl)")
+
+    exp = commands.add_parser("export", help="defteri CSV/JSONL olarak dışa aktarır")
+    exp.add_argument("path")
+    exp.add_argument("--format", choices=("csv", "jsonl"), help="varsayılan: dosya uzantısı")
+    exp.add_argument("--from", dest="start_date", type=_date, help="GG-AA-YYYY (dahil)")
+    exp.add_argument("--to", dest="end_date", type=_date, help="GG-AA-YYYY (dahil)")
+    exp.add_argument("--type", dest="t_type", choices=[t.value for t in TransactionType])
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    manager = FinanceManager(repo=create_repository(os.environ.get("FINANCE_STORAGE", "json")))
+
+    if args.command == "import":
+        ok, msg = manager.import_transactions(args.path, fmt=args.format, workers=args.workers,
+                                              chunk_size=args.chunk_size, rejects_path=args.rejects)
+    else:
+        ok, msg = manager.export_transactions(args.path, fmt=args.format, start_date=args.start_date,
+                                              end_date=args.end_date, t_type=args.t_type)
+    print(msg)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
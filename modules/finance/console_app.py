@@ -32,16 +32,26 @@ try:
     from modules.finance.services.analyzer import FinancialAnalyzer
     from modules.finance.services.calculator import SalaryCalculator, LateFeeCalculator
     from modules.finance.data.constants import TransactionType, IncomeCategory, ExpenseCategory
+    from modules.finance.data.storage import create_repository
+    from modules.finance.services.instrumentation import instrumentation
 except ImportError as e:
     print(f"\n[KRİTİK HATA] Finans modülleri yüklenemedi: {e}")
     sys.exit(1)
 
-# Servisleri Başlat
-manager = FinanceManager()
-analyzer = FinancialAnalyzer()
+# Performans ölçümü (FINANCE_INSTRUMENTATION=1 ile açılır, kapalıyken maliyeti yoktur)
+if os.environ.get("FINANCE_INSTRUMENTATION", "") not in ("", "0"):
+    instrumentation.enable()
+
+# Servisleri Başlat (FINANCE_STORAGE: json / journal / sqlite / sharded)
+repo = create_repository(os.environ.get("FINANCE_STORAGE", "json"))
+manager = FinanceManager(repo=repo)
+analyzer = FinancialAnalyzer(repo=repo)
 salary_calc = SalaryCalculator()
 fee_calc = LateFeeCalculator()
 
+# Eski kayıtlara sayısal zaman damgası ekler (sadece ilk çalıştırmada yazma yapar)
+repo.migrate_timestamps()
+
 # --- YARDIMCILAR ---
 
 def clear_screen():
@@ -91,9 +101,12 @@ def menu_add_transaction():
     category = categories[cat_idx - 1]
     amount = get_input("Tutar (TL): ", float)
     desc = get_input("Açıklama: ")
+    athlete_id = None
+    if t_type == TransactionType.EXPENSE:
+        athlete_id = get_input("Sporcu/Personel ID (opsiyonel): ") or None
 
     if amount:
-        manager.add_transaction(t_type.value, category, amount, desc)
+        manager.add_transaction(t_type.value, category, amount, desc, athlete_id=athlete_id)
         print("\n   [BAŞARILI] İşlem kaydedildi.")
     input("\nDevam etmek için Enter...")
 
@@ -102,14 +115,20 @@ def menu_list_transactions():
     print("1. Tümü")
     print("2. Gelirler")
     print("3. Giderler")
-    filter_choice = get_input("Filtre (1-3): ", int)
+    print("4. Ara (ID, kategori, tarih, açıklama)")
+    filter_choice = get_input("Filtre (1-4): ", int)
     
-    all_data = manager.get_all_transactions()
     filtered = []
     
-    if filter_choice == 1: filtered = all_data
-    elif filter_choice == 2: filtered = [t for t in all_data if t['tip'] == TransactionType.INCOME.value]
-    elif filter_choice == 3: filtered = [t for t in all_data if t['tip'] == TransactionType.EXPENSE.value]
+    if filter_choice == 4:
+        term = get_input("Aranacak metin: ")
+        if not term: return
+        filtered = analyzer.search_transactions(term, ignore_case=True, ranked=True, page=1, page_size=50)
+    elif filter_choice in (1, 2, 3):
+        all_data = manager.get_all_transactions()
+        if filter_choice == 1: filtered = all_data
+        elif filter_choice == 2: filtered = [t for t in all_data if t['tip'] == TransactionType.INCOME.value]
+        else: filtered = [t for t in all_data if t['tip'] == TransactionType.EXPENSE.value]
     else: return
 
     if not filtered:
@@ -124,8 +143,11 @@ def menu_list_transactions():
 
 def menu_financial_report():
     print("\n--- MALİ DURUM RAPORU ---")
-    summary = manager.get_financial_summary()
-    status = analyzer.get_budget_status()
+    # Toplamlar özet tablolarından, dönem raporu zaman indeksinden gelir;
+    # defter sadece en büyük giderler için bir kez taranır
+    report = analyzer.dashboard(period_days=30, top_n=5)
+    summary = report["ozet"]
+    status = report["butce_durumu"]
     
     print(f"\nTOPLAM GELİR : {summary['toplam_gelir']:,.2f} TL")
     print(f"TOPLAM GİDER : {summary['toplam_gider']:,.2f} TL")
@@ -135,6 +157,20 @@ def menu_financial_report():
     print(f"\nBÜTÇE DURUMU : {status.get('durum', 'Bilinmiyor')}")
     if status.get('tavsiye'):
         print(f"TAVSİYE      : {status['tavsiye']}")
+
+    if report["kategori_dagilimi"]:
+        print("\nKATEGORİ DAĞILIMI")
+        for name, total in sorted(report["kategori_dagilimi"].items()):
+            print(f"  {name:<36} {total:>14,.2f} TL")
+
+    print("\nSON 30 GÜN")
+    for t_type, cats in report["donem_raporu"].items():
+        print(f"  {t_type:<8}: {sum(cats.values()):>14,.2f} TL ({len(cats)} kategori)")
+
+    if report["en_buyuk_giderler"]:
+        print("\nEN BÜYÜK GİDERLER")
+        for t in report["en_buyuk_giderler"]:
+            print(f"  {t.get('tarih', '-'):<20} {t['kategori']:<20} {t['tutar']:>14,.2f} TL")
         
     input("\nDevam etmek için Enter...")
 
@@ -175,6 +211,59 @@ def menu_process_salaries():
         
     input("\nDevam etmek için Enter...")
 
+def menu_maintenance():
+    print("\n--- BAKIM ---")
+    print("1. Özet Tablolarını Yeniden Oluştur ve Doğrula")
+    print("2. Aidat Gecikme Faizlerini İşle")
+    c = get_input("Seçim: ", int)
+
+    if c == 1:
+        ok, diffs = manager.rebuild_aggregates()
+        if ok:
+            print("\n   [BAŞARILI] Özet tabloları defterle uyumlu.")
+        else:
+            print(f"\n   [UYARI] Uyumsuz bölümler: {', '.join(diffs)}")
+
+    elif c == 2:
+        success, msg = manager.assess_late_fees()
+        print(f"\n   [{'BAŞARILI' if success else 'UYARI'}] {msg}")
+
+    input("\nDevam etmek için Enter...")
+
+def menu_instrumentation():
+    print("\n--- PERFORMANS ÖLÇÜMLERİ ---")
+    print(f"Durum: {'AÇIK' if instrumentation.enabled else 'KAPALI'}")
+    print("1. Ölçümleri Göster")
+    print("2. Ölçümleri Dosyaya Kaydet (JSON)")
+    print("3. Ölçümleri Sıfırla")
+    print(f"4. Ölçümü {'Kapat' if instrumentation.enabled else 'Aç'}")
+    c = get_input("Seçim: ", int)
+
+    if c == 1:
+        print()
+        print(instrumentation.format_report(limit=30))
+
+    elif c == 2:
+        path = get_input("Dosya adı (varsayılan: finance_metrics.json): ") or "finance_metrics.json"
+        try:
+            instrumentation.dump(path)
+            print(f"\n   [BAŞARILI] Ölçümler yazıldı: {path}")
+        except Exception as e:
+            print(f"\n   [HATA] {e}")
+
+    elif c == 3:
+        instrumentation.reset()
+        print("\n   [BAŞARILI] Ölçümler sıfırlandı.")
+
+    elif c == 4:
+        if instrumentation.enabled:
+            instrumentation.disable()
+        else:
+            instrumentation.enable()
+        print(f"\n   [BAŞARILI] Ölçüm {'açıldı' if instrumentation.enabled else 'kapatıldı'}.")
+
+    input("\nDevam etmek için Enter...")
+
 # --- ANA DÖNGÜ ---
 
 def start_app():
@@ -185,7 +274,9 @@ def start_app():
         print("3. Mali Durum Raporu")
         print("4. Hesaplayıcılar")
         print("5. Maaşları Öde")
-        print("6. Ana Menüye Dön")
+        print("6. Bakım")
+        print("7. Performans Ölçümleri")
+        print("8. Ana Menüye Dön")
         print("-" * 64)
         
         choice = get_input("Seçiminiz: ", int)
@@ -195,7 +286,9 @@ def start_app():
         elif choice == 3: menu_financial_report()
         elif choice == 4: menu_calculators()
         elif choice == 5: menu_process_salaries()
-        elif choice == 6: 
+        elif choice == 6: menu_maintenance()
+        elif choice == 7: menu_instrumentation()
+        elif choice == 8: 
             print("\nFinans modülünden çıkılıyor..."); break
         else:
             pass
@@ -1,5 +1,10 @@
 # Bu dosya sayesinde dışarıdan import yaparken dosya isimlerini tek tek yazmak zorunda kalınmaz
 from .json_db import FinanceRepository
+from .journal_db import JournalFinanceRepository
+from .sqlite_db import SqliteFinanceRepository
+from .sharded_db import ShardedFinanceRepository
+from .storage import create_repository, STORAGE_MODES
 from .json_db_rules import FinanceRules
-from .transaction import Transaction
+from .transaction import Transaction, CompactTransaction
+from .columnar import ColumnarLedger
 from .constants import TransactionType, IncomeCategory, ExpenseCategory
\ No newline at end of file
@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+
+from .constants import TransactionType
+from .money import record_kurus, to_tl
+from .timestamps import from_epoch, record_timestamp
+from ..exceptions.errors import DataStorageError
+
+# Aynı defter için süreç içinde paylaşılan son durum: mutlak yol -> durum
+_memo = {}
+_memo_lock = threading.RLock()
+
+
+# Toplamların birimi; bu alanı taşımayan (eski, TL float) özet dosyaları baştan hesaplanır
+UNIT = "kurus"
+
+
+def _empty_state():
+    return {"imza": None, "birim": UNIT, "adet": 0, "tip": {}, "kategori": {}, "gun": {}}
+
+
+# Kaydın gün anahtarı ("YYYY-AA-GG"), tarihi çözülemeyenler için "tarihsiz"
+def _day_key(item):
+    ts = record_timestamp(item)
+    if math.isnan(ts):
+        return "tarihsiz"
+    return from_epoch(ts).strftime("%Y-%m-%d")
+
+
+# Bir kaydın etkisini duruma ekler (sign=-1 ile geri alır).
+# Her hücre [kuruş toplamı, adet] çiftidir; adet sıfırlanınca hücre silinir.
+def _apply(state, item, sign):
+    amount = sign * record_kurus(item)
+    t_type, cat = item["tip"], item["kategori"]
+
+    def bump(table, key):
+        cell = table.setdefault(key, [0, 0])
+        cell[0] += amount
+        cell[1] += sign
+        if cell[1] <= 0:
+            del table[key]
+
+    day = _day_key(item)
+    state["adet"] += sign
+    bump(state["tip"], t_type)
+    bump(state["kategori"].setdefault(t_type, {}), cat)
+    if not state["kategori"][t_type]:
+        del state["kategori"][t_type]
+    bump(state["gun"].setdefault(day, {}), t_type)
+    if not state["gun"][day]:
+        del state["gun"][day]
+
+
+# Yazma sırasında biriken değişiklikler
+class AggregateDelta:
+    def __init__(self):
+        self.changes = []   # (kayıt, +1/-1)
+
+    def add(self, item):
+        self.changes.append((item, 1))
+
+    def add_all(self, items):
+        self.changes.extend((item, 1) for item in items)
+
+    def remove(self, item):
+        self.changes.append((item, -1))
+
+    def replace(self, old_item, new_item):
+        self.remove(old_item)
+        self.add(new_item)
+
+
+# Tip, kategori ve gün bazında toplamları defterin yanında tutan yapı
+class AggregateStore:
+    """
+    Toplamlar '<defter>.agg.json' dosyasında saklanır ve defterin o anki dosya
+    imzası (stat bilgisi) ile damgalanır. FinanceManager her yazmada sadece
+    değişen kayıtları uygular; özet ekranları defteri taramadan bu dosyadan
+    okunur. Defter başka bir yoldan değiştiyse imza tutmaz ve toplamlar
+    bir kez baştan hesaplanır.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    @property
+    def path(self):
+        return self.repo.file_path.rstrip(os.sep) + ".agg.json"
+
+    def _signature(self):
+        return [list(s) if s else None for s in self.repo.storage_signature()]
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            # Bozuk özet dosyası baştan hesaplanır
+            return None
+
+    def _persist(self, state):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            raise DataStorageError(self.path, f"Özet dosyası yazılamadı: {str(e)}")
+        _memo[os.path.abspath(self.path)] = state
+
+    # Defterle uyumlu güncel durumu döner (gerekirse baştan hesaplar)
+    def current(self):
+        signature = self._signature()
+        with _memo_lock:
+            state = _memo.get(os.path.abspath(self.path))
+            if state is None or state["imza"] != signature:
+                state = self._load()
+            if state is None or state["imza"] != signature or state.get("birim") != UNIT:
+                state = self.rebuild()
+            _memo[os.path.abspath(self.path)] = state
+            return state
+
+    # Tüm defteri tarayarak toplamları sıfırdan oluşturur ve kaydeder
+    def rebuild(self):
+        with _memo_lock:
+            signature = self._signature()
+            state = self.compute()
+            state["imza"] = signature
+            self._persist(state)
+            return state
+
+    # Defteri akış halinde tarayarak toplamları hesaplar (kaydetmez)
+    def compute(self):
+        state = _empty_state()
+        for item in self.repo.iter_records():
+            _apply(state, item, 1)
+        return state
+
+    # Saklanan toplamlar ile sıfırdan hesaplanan toplamları (kuruşu kuruşuna) karşılaştırır.
+    # Dönüş: (uyumlu_mu, farklı olan anahtarlar listesi)
+    def verify(self):
+        stored = self.current()
+        fresh = self.compute()
+        diffs = []
+        for section in ("tip", "kategori", "gun"):
+            if stored[section] != fresh[section]:
+                diffs.append(section)
+        if stored["adet"] != fresh["adet"]:
+            diffs.append("adet")
+        return not diffs, diffs
+
+    @contextmanager
+    def tracking(self):
+        """
+        Yazma işlemini çevreler:
+            with store.tracking() as delta:
+                repo.save_record(kayit)
+                delta.add(kayit)
+        Blok hatasız biterse değişiklikler uygulanıp yeni imza ile kaydedilir.
+        """
+        with _memo_lock:
+            state = self.current()
+            delta = AggregateDelta()
+            yield delta
+            state = json.loads(json.dumps(state))
+            for item, sign in delta.changes:
+                _apply(state, item, sign)
+            state["imza"] = self._signature()
+            self._persist(state)
+
+    # --- OKUMA METOTLARI ---
+    # Toplamlar kuruş olarak tutulur, TL olarak döner
+
+    # (gelir, gider) kuruş toplamları
+    def totals_kurus(self):
+        types = self.current()["tip"]
+        inc = types.get(TransactionType.INCOME.value, [0, 0])[0]
+        exp = types.get(TransactionType.EXPENSE.value, [0, 0])[0]
+        return inc, exp
+
+    def totals(self):
+        inc, exp = self.totals_kurus()
+        return to_tl(inc), to_tl(exp)
+
+    # {(tip, kategori): toplam}
+    def category_totals(self):
+        return {
+            (t_type, cat): to_tl(cell[0])
+            for t_type, cats in self.current()["kategori"].items()
+            for cat, cell in cats.items()
+        }
+
+    # {"YYYY-AA-GG": {tip: toplam}}
+    def daily_totals(self):
+        return {
+            day: {t_type: to_tl(cell[0]) for t_type, cell in types.items()}
+            for day, types in self.current()["gun"].items()
+        }
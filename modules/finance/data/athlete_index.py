@@ -0,0 +1,60 @@
+import re
+
+from .constants import TransactionType
+from .ledger_cache import freeze_record
+from .money import record_kurus, to_tl
+
+# Eski kayıtların açıklamasındaki kimlik adayları ("Ödeme: SPORCU_AHMET",
+# "Maaş Ödemesi: Ad (GS-01)" gibi); boşluk ve noktalama ile ayrılır
+_LEGACY_TOKEN_RE = re.compile(r"[^\s(),;:]+")
+
+
+# Sporcu -> işlem indeksi
+class AthleteIndex:
+    """
+    'sporcu_id' alanı olan gider kayıtları bu kimlik altında toplanır ve her
+    sporcu için toplam/adet tutulur; tüm sporcuların maliyet raporu defter
+    taranmadan bu tablodan okunur. Alanı olmayan eski kayıtlar için açıklama
+    kelimeleri ayrı bir tabloda tutulur; eşleşme alt metin değil kelimenin
+    tamamı üzerinden yapılır (P1, P10'u yakalamaz). Repository önbelleğine
+    bağlı yaşar; yeni kayıtlar 'extend' ile eklenir.
+    """
+
+    def __init__(self):
+        self._records = []      # sadece indekslenen gider kayıtları
+        self._by_athlete = {}   # sporcu_id -> [sıra no]
+        self._totals = {}       # sporcu_id -> [kuruş toplamı, adet]
+        self._legacy = {}       # açıklama kelimesi -> [sıra no]
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        index.extend(records)
+        return index
+
+    def extend(self, records):
+        expense = TransactionType.EXPENSE.value
+        for item in records:
+            if item.get("tip") != expense:
+                continue
+            pos = len(self._records)
+            self._records.append(freeze_record(item))
+            athlete_id = item.get("sporcu_id")
+            if athlete_id:
+                self._by_athlete.setdefault(athlete_id, []).append(pos)
+                cell = self._totals.setdefault(athlete_id, [0, 0])
+                cell[0] += record_kurus(item)
+                cell[1] += 1
+            else:
+                for token in set(_LEGACY_TOKEN_RE.findall(item.get("aciklama") or "")):
+                    self._legacy.setdefault(token, []).append(pos)
+
+    # Sporcuya ait gider kayıtları (defter sırasıyla)
+    def records_for(self, athlete_id):
+        athlete_id = str(athlete_id)
+        positions = self._by_athlete.get(athlete_id, []) + self._legacy.get(athlete_id, [])
+        return [self._records[pos] for pos in sorted(positions)]
+
+    # {sporcu_id: (toplam TL, adet)}; sadece 'sporcu_id' alanı olan kayıtlar
+    def totals(self):
+        return {athlete_id: (to_tl(cell[0]), cell[1]) for athlete_id, cell in self._totals.items()}
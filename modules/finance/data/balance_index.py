@@ -0,0 +1,125 @@
+import math
+
+from .constants import TransactionType
+from .money import record_kurus
+from .timestamps import SECONDS_PER_DAY, record_timestamp
+from .time_index import day_epoch
+
+
+# Günün epoch gün numarası (1970-01-01 = 0); date veya datetime alır
+def day_number(day):
+    return int(day_epoch(day) // SECONDS_PER_DAY)
+
+
+# Günlük net nakit akışı (gelir - gider) için Fenwick ağacı
+class BalanceIndex:
+    """
+    Her günün net akışı kuruş cinsinden bir Fenwick (binary indexed) ağacında
+    tutulur: bir tarihe kadarki bakiye O(log gün) adımda bulunur, geriye
+    tarihli bir kayıt da O(log gün) adımda (nokta güncellemesi) eklenir;
+    sonraki günlerin toplamlarını tek tek kaydırmak gerekmez.
+    Ağaç ilk kayıt gününden başlar ve kapsamı dışına düşen bir kayıt gelince
+    iki katına büyütülerek günlük değerlerden yeniden kurulur.
+    Tarihi çözülemeyen kayıtlar bakiyeye katılmaz. Repository önbelleğine
+    bağlı yaşar; yeni kayıtlar 'extend' ile eklenir.
+    """
+
+    def __init__(self):
+        self._daily = {}    # gün numarası -> net kuruş
+        self._origin = 0    # ağacın ilk günü
+        self._tree = [0]    # 1 tabanlı Fenwick dizisi (boyut + 1)
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        index.extend(records)
+        return index
+
+    def __len__(self):
+        return len(self._daily)
+
+    @property
+    def _size(self):
+        return len(self._tree) - 1
+
+    def extend(self, records):
+        income = TransactionType.INCOME.value
+        deltas = {}
+        for item in records:
+            ts = record_timestamp(item)
+            if math.isnan(ts):
+                continue
+            kurus = record_kurus(item)
+            day = math.floor(ts / SECONDS_PER_DAY)
+            deltas[day] = deltas.get(day, 0) + (kurus if item["tip"] == income else -kurus)
+        if not deltas:
+            return
+
+        low, high = min(deltas), max(deltas)
+        daily = self._daily
+        if not daily or low < self._origin or high >= self._origin + self._size:
+            for day, delta in deltas.items():
+                daily[day] = daily.get(day, 0) + delta
+            self._rebuild(low, high)
+            return
+        for day, delta in deltas.items():
+            daily[day] = daily.get(day, 0) + delta
+            self._add(day, delta)
+
+    # Ağacı [low, high] aralığını kapsayacak şekilde günlük değerlerden O(gün) adımda kurar.
+    # Kapsam iki katına büyütülür, böylece sona eklenen günler çoğunlukla yeniden kurulum gerektirmez.
+    def _rebuild(self, low, high):
+        # Büyüme, yeni günün geldiği yöne doğru yapılır
+        backwards = self._size and low < self._origin
+        if self._size:
+            low = min(low, self._origin)
+            high = max(high, self._origin + self._size - 1)
+        size = max(self._size, 64)
+        while size < high - low + 1:
+            size *= 2
+        origin = high - size + 1 if backwards else low
+        tree = [0] * (size + 1)
+        for day, net in self._daily.items():
+            tree[day - origin + 1] += net
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._origin, self._tree = origin, tree
+
+    def _add(self, day, delta):
+        tree = self._tree
+        i = day - self._origin + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    # Gün numarası 'day' dahil, o güne kadarki net akış (kuruş)
+    def _prefix(self, day):
+        if day < self._origin:
+            return 0
+        tree = self._tree
+        i = min(day - self._origin + 1, len(tree) - 1)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    # Verilen günün sonundaki bakiye (kuruş)
+    def balance_at(self, day):
+        return self._prefix(day_number(day))
+
+    # start_day..end_day (iki uç dahil) her günün sonundaki bakiye (kuruş).
+    # Tek bir ağaç sorgusu ve günlük değerlerin toplanmasıyla bulunur.
+    def balance_series(self, start_day, end_day):
+        first, last = day_number(start_day), day_number(end_day)
+        if last < first:
+            return []
+        daily = self._daily
+        balance = self._prefix(first - 1)
+        series = []
+        for day in range(first, last + 1):
+            balance += daily.get(day, 0)
+            series.append(balance)
+        return series
@@ -0,0 +1,186 @@
+from array import array
+
+from .constants import TransactionType, IncomeCategory, ExpenseCategory
+from .timestamps import SECONDS_PER_DAY, to_epoch, record_timestamp
+from .money import record_kurus, to_tl
+
+# NumPy opsiyoneldir; kurulu değilse aynı sonuçları veren saf Python yolu kullanılır
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# array typecode -> NumPy dtype ('q': kuruş tutarları, int64)
+_DTYPES = {'d': 'float64', 'i': 'int32', 'q': 'int64'}
+
+
+# Büyüyebilen tek tip dizi (NumPy varsa kapasiteyi ikiye katlayarak büyür)
+class _Column:
+    __slots__ = ("_typecode", "_data", "_size")
+
+    def __init__(self, typecode):
+        self._typecode = typecode
+        self._size = 0
+        if np is not None:
+            self._data = np.empty(16, dtype=_DTYPES[typecode])
+        else:
+            self._data = array(typecode)
+
+    def extend(self, values):
+        if np is None:
+            self._data.extend(values)
+            self._size = len(self._data)
+            return
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            capacity = max(needed, 2 * len(self._data))
+            grown = np.empty(capacity, dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    # Kullanılan kısmın görünümü (kopyalanmaz)
+    def values(self):
+        return self._data[:self._size] if np is not None else self._data
+
+
+# Defterin kolon bazlı (columnar) anlık görüntüsü
+class ColumnarLedger:
+    """
+    Her kayıt dört diziye dağıtılır: epoch zaman damgası, tip kodu, kategori
+    kodu ve tam sayı kuruş tutar. Raporlar kayıt sözlükleri üzerinde dönmek
+    yerine bu diziler üzerinde maske + int64 toplama (np.add.at) ile
+    hesaplanır; toplama sırası ve satır sayısı sonucu değiştirmez, kuruş
+    kaybı olmaz. Sonuçlar TL olarak döner.
+    Tarih aralığı okuyabilen depolarda (SQLite, parçalı) dönem raporu için
+    okunan kayıtlardan kurulur.
+    """
+
+    def __init__(self):
+        # Kod tabloları enum sırasıyla başlar, bilinmeyen değerler sona eklenir
+        self.types = [t.value for t in TransactionType]
+        self.categories = [c.value for c in IncomeCategory] + [c.value for c in ExpenseCategory]
+        self._type_codes = {v: i for i, v in enumerate(self.types)}
+        self._category_codes = {v: i for i, v in enumerate(self.categories)}
+
+        self._timestamps = _Column('d')
+        self._type_col = _Column('i')
+        self._category_col = _Column('i')
+        self._amounts = _Column('q')
+
+    @classmethod
+    def from_records(cls, records):
+        ledger = cls()
+        ledger.extend(records)
+        return ledger
+
+    def __len__(self):
+        return len(self._amounts.values())
+
+    def _code(self, table, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    # Yeni kayıtları dizilerin sonuna ekler ('zaman' alanı olmayan eski
+    # kayıtlarda tarih metni sadece burada, bir kez çözülür)
+    def extend(self, records):
+        timestamps, types, categories, amounts = [], [], [], []
+        for item in records:
+            timestamps.append(record_timestamp(item))
+            types.append(self._code(self.types, self._type_codes, item["tip"]))
+            categories.append(self._code(self.categories, self._category_codes, item["kategori"]))
+            amounts.append(record_kurus(item))
+        self._timestamps.extend(timestamps)
+        self._type_col.extend(types)
+        self._category_col.extend(categories)
+        self._amounts.extend(amounts)
+
+    @property
+    def timestamps(self):
+        return self._timestamps.values()
+
+    @property
+    def type_codes(self):
+        return self._type_col.values()
+
+    @property
+    def category_codes(self):
+        return self._category_col.values()
+
+    # Kuruş tutarları (int64)
+    @property
+    def amounts_kurus(self):
+        return self._amounts.values()
+
+    # TL tutarları (sadece gösterim/uyumluluk için; toplamalar kuruşla yapılır)
+    @property
+    def amounts(self):
+        if np is not None:
+            return self.amounts_kurus / 100
+        return [to_tl(k) for k in self.amounts_kurus]
+
+    # Gelir ve gider toplamları (income, expense)
+    def totals(self):
+        income_code = self._type_codes[TransactionType.INCOME.value]
+        expense_code = self._type_codes[TransactionType.EXPENSE.value]
+        if np is not None:
+            sums = np.zeros(len(self.types), dtype=np.int64)
+            np.add.at(sums, self.type_codes, self.amounts_kurus)
+            return to_tl(int(sums[income_code])), to_tl(int(sums[expense_code]))
+
+        income = expense = 0
+        for code, amount in zip(self.type_codes, self.amounts_kurus):
+            if code == income_code:
+                income += amount
+            elif code == expense_code:
+                expense += amount
+        return to_tl(income), to_tl(expense)
+
+    # {(tip, kategori): toplam} sözlüğü; mask verilirse sadece seçili kayıtlar
+    def group_totals(self, mask=None):
+        n_cat = len(self.categories)
+        if np is not None:
+            keys = self.type_codes.astype(np.int64) * n_cat + self.category_codes
+            weights = self.amounts_kurus
+            if mask is not None:
+                keys, weights = keys[mask], weights[mask]
+            size = len(self.types) * n_cat
+            sums = np.zeros(size, dtype=np.int64)
+            np.add.at(sums, keys, weights)
+            counts = np.bincount(keys, minlength=size)
+            return {
+                (self.types[k // n_cat], self.categories[k % n_cat]): to_tl(int(sums[k]))
+                for k in np.flatnonzero(counts)
+            }
+
+        result = {}
+        for i, (t_code, c_code, amount) in enumerate(zip(self.type_codes, self.category_codes, self.amounts_kurus)):
+            if mask is not None and not mask[i]:
+                continue
+            key = (self.types[t_code], self.categories[c_code])
+            result[key] = result.get(key, 0) + amount
+        return {key: to_tl(kurus) for key, kurus in result.items()}
+
+    # Gün bazında (saat yok sayılarak) start..end aralığına düşen kayıtların maskesi
+    def day_mask(self, start_date, end_date):
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        ts = self.timestamps
+        if np is not None:
+            days = ts - np.mod(ts, SECONDS_PER_DAY)
+            return (days >= start) & (days <= end)
+        return [start <= t - t % SECONDS_PER_DAY <= end for t in ts]
+
+    # analyze_by_period ile aynı yapıda rapor: {'Gelir': {...}, 'Gider': {...}}
+    def period_report(self, start_date, end_date):
+        report = {
+            TransactionType.INCOME.value: {},
+            TransactionType.EXPENSE.value: {}
+        }
+        for (t_type, cat), amount in self.group_totals(self.day_mask(start_date, end_date)).items():
+            report.setdefault(t_type, {})[cat] = amount
+        return report
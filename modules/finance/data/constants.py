@@ -1,5 +1,9 @@
 from enum import Enum
 
+# Kayıtlardaki "tarih" alanının formatları
+DATE_FORMAT = "%d-%m-%Y"
+DATETIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
 # İşlem Türleri (Gelir / Gider)
 class TransactionType(Enum):
     INCOME = "Gelir"
@@ -0,0 +1,50 @@
+# Silme (tombstone) ve düzeltme (amendment) kayıtlarının ortak biçimi.
+# Bu kayıtlar asıl veriyi yeniden yazmak yerine sona eklenir, okuyucular
+# yükleme sırasında uygular.
+#   {"_op": "delete", "id": "..."}
+#   {"_op": "update", "id": "...", "changes": {"tutar": 10.0, ...}}
+
+OP_FIELD = "_op"
+
+
+def is_correction(item):
+    return OP_FIELD in item
+
+
+def make_delete(transaction_id):
+    return {OP_FIELD: "delete", "id": transaction_id}
+
+
+def make_update(transaction_id, changes):
+    return {OP_FIELD: "update", "id": transaction_id, "changes": dict(changes)}
+
+
+# Düzeltmeleri kayıt listesine uygular ve yeni liste döner.
+# Güncelleme, base repository'deki gibi ID'si eşleşen ilk kayda uygulanır.
+def apply_corrections(records, corrections):
+    if not corrections:
+        return records
+    return list(iter_corrected(records, corrections))
+
+
+# apply_corrections'ın akış (generator) hali; kayıtlar tek tek işlenir,
+# bellekte sadece düzeltme tablosu tutulur
+def iter_corrected(records, corrections):
+    deleted = set()
+    updates = {}
+    for op in corrections:
+        if op[OP_FIELD] == "delete":
+            deleted.add(op["id"])
+            updates.pop(op["id"], None)
+        elif op[OP_FIELD] == "update" and op["id"] not in deleted:
+            updates.setdefault(op["id"], {}).update(op["changes"])
+
+    for item in records:
+        t_id = item["id"]
+        if t_id in deleted:
+            continue
+        changes = updates.pop(t_id, None)
+        if changes:
+            item = dict(item)
+            item.update(changes)
+        yield item
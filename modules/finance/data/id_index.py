@@ -0,0 +1,85 @@
+from bisect import bisect_left, insort
+
+from .corrections import OP_FIELD
+from .ids import is_time_id
+from .ledger_cache import freeze_record
+
+
+# İşlem kimliği -> kayıt indeksi
+class IdIndex:
+    """
+    Her kimlik için ilk kaydı tutan sözlük (sabit zamanlı arama) ve zaman
+    sıralı (ULID) kimliklerin sıralı listesi. Aynı kimlikle gelen sonraki
+    kayıtlar ayrıca tutulur (silme hepsini kaldırdığı için). Sıralı liste kimlik aralığını
+    zaman aralığı olarak sorgulamayı sağlar; eski 8 haneli kimlikler sadece
+    sözlükte yer alır. Repository önbelleğine bağlı yaşar: yeni kayıtlar
+    'extend', silme/güncelleme kayıtları (bkz. corrections.py) 'apply' ile
+    işlenir, indeks yeniden kurulmaz.
+    """
+
+    def __init__(self):
+        self._records = {}      # kimlik -> kayıt (CompactTransaction)
+        self._time_ids = []     # sıralı ULID kimlikleri
+        self._duplicates = {}   # kimlik -> aynı kimlikli sonraki kayıtlar
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        index.extend(records)
+        return index
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, transaction_id):
+        return transaction_id in self._records
+
+    def extend(self, records):
+        time_ids = self._time_ids
+        for item in records:
+            item = freeze_record(item)
+            t_id = item.get("id")
+            if t_id is None:
+                continue
+            if t_id in self._records:
+                self._duplicates.setdefault(t_id, []).append(item)
+                continue
+            self._records[t_id] = item
+            if is_time_id(t_id):
+                # Kimlikler artan sırada üretildiği için çoğunlukla sona eklenir
+                if not time_ids or t_id > time_ids[-1]:
+                    time_ids.append(t_id)
+                else:
+                    insort(time_ids, t_id)
+
+    # Düzeltme kaydını (silme/güncelleme) indekse uygular
+    def apply(self, op):
+        t_id = op["id"]
+        item = self._records.get(t_id)
+        if item is None:
+            return
+        if op[OP_FIELD] == "delete":
+            del self._records[t_id]
+            self._duplicates.pop(t_id, None)
+            if is_time_id(t_id):
+                del self._time_ids[bisect_left(self._time_ids, t_id)]
+        elif op[OP_FIELD] == "update":
+            self._records[t_id] = freeze_record({**item, **op["changes"]})
+            if t_id in self._duplicates:
+                self._duplicates[t_id] = [freeze_record({**d, **op["changes"]}) for d in self._duplicates[t_id]]
+
+    def get(self, transaction_id):
+        return self._records.get(transaction_id)
+
+    # Kimliği taşıyan tüm kayıtlar (defterdeki sırasıyla)
+    def get_all(self, transaction_id):
+        item = self._records.get(transaction_id)
+        if item is None:
+            return []
+        return [item] + self._duplicates.get(transaction_id, [])
+
+    # [low, high) aralığındaki ULID kimlikli kayıtlar (oluşturulma sırasıyla)
+    def between(self, low, high):
+        time_ids = self._time_ids
+        lo, hi = bisect_left(time_ids, low), bisect_left(time_ids, high)
+        return [self._records[t_id] for t_id in time_ids[lo:hi]]
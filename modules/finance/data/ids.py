@@ -0,0 +1,92 @@
+import os
+import threading
+from datetime import datetime
+
+from .timestamps import SECONDS_PER_DAY, to_epoch
+from .time_index import day_epoch
+
+# ULID benzeri işlem kimliği: 48 bit milisaniye zaman + 80 bit rastgele,
+# Crockford base32 ile 26 karakter. Metin sıralaması zaman sıralamasıdır.
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {c: i for i, c in enumerate(_ALPHABET)}
+ID_LENGTH = 26
+# Eski kayıtların kimliği: uuid4'ün ilk 8 karakteri
+LEGACY_ID_LENGTH = 8
+
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+_TIME_MAX = (1 << 48) - 1
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+
+def _encode(value):
+    chars = []
+    for _ in range(ID_LENGTH):
+        value, digit = divmod(value, 32)
+        chars.append(_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+def _ms(dt):
+    return int(round(to_epoch(dt) * 1000))
+
+
+def new_transaction_id(at=None):
+    """
+    Yeni işlem kimliği üretir; defter okunmaz. Zaman, kayıtların 'zaman'
+    alanıyla aynı kuralla (yerel saat UTC gibi) milisaniyeye çevrilir.
+    Saatten üretilen kimlikler bu süreçte kesin artan sıradadır: aynı
+    milisaniyede (veya saat geri alınırsa) rastgele kısım bir artırılır.
+    'at' verilirse (geriye tarihli kayıt) kimlik o ana göre üretilir.
+    Süreçler arası çakışmayı 80 bitlik rastgele kısım önler.
+    """
+    global _last_ms, _last_random
+    ms = _ms(at or datetime.now())
+    # En üst bit boş bırakılır; aynı milisaniyede taşma pratikte olmaz
+    random_part = int.from_bytes(os.urandom(10), "big") >> 1
+    with _lock:
+        if ms == _last_ms or (ms < _last_ms and at is None):
+            ms, random_part = _last_ms, _last_random + 1
+            if random_part > _RANDOM_MAX:
+                ms, random_part = ms + 1, int.from_bytes(os.urandom(10), "big") >> 1
+        if ms >= _last_ms:
+            _last_ms, _last_random = ms, random_part
+    return _encode((min(ms, _TIME_MAX) << _RANDOM_BITS) | random_part)
+
+
+# Verilen an ve rastgele kısımdan kimlik oluşturur (tekrarlanabilir test/ölçüm verisi için)
+def transaction_id_at(at, random_part):
+    return _encode((min(_ms(at), _TIME_MAX) << _RANDOM_BITS) | (random_part & (_RANDOM_MAX >> 1)))
+
+
+def is_time_id(transaction_id):
+    return (
+        isinstance(transaction_id, str)
+        and len(transaction_id) == ID_LENGTH
+        and all(c in _DECODE for c in transaction_id)
+    )
+
+
+# Kimliğin zaman damgası (epoch saniye); eski 8 haneli kimlikler için None
+def id_timestamp(transaction_id):
+    if not is_time_id(transaction_id):
+        return None
+    ms = 0
+    for c in transaction_id[:10]:
+        ms = ms * 32 + _DECODE[c]
+    return ms / 1000
+
+
+# Verilen andan itibaren üretilebilecek en küçük kimlik (aralık sınırı olarak kullanılır)
+def id_floor(dt):
+    return _encode(_ms(dt) << _RANDOM_BITS)
+
+
+# start_day..end_day (iki uç dahil, gün bazında) için [alt, üst) kimlik aralığı
+def id_bounds(start_day, end_day):
+    low = _encode(int(day_epoch(start_day)) * 1000 << _RANDOM_BITS)
+    high = _encode(int(day_epoch(end_day) + SECONDS_PER_DAY) * 1000 << _RANDOM_BITS)
+    return low, high
@@ -0,0 +1,208 @@
+import itertools
+import json
+import os
+import threading
+
+from .json_db import FinanceRepository
+from .corrections import make_delete, make_update, is_correction, apply_corrections, iter_corrected
+from .streaming import iter_json_lines
+from ..exceptions.errors import DataStorageError
+
+# Aynı dosya üzerinde çalışan tüm repository nesneleri ortak kilidi paylaşır
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def _lock_for(path):
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+# Yeni kayıtları tek satırlık JSON olarak sona ekleyen (append-only) depolama modu
+class JournalFinanceRepository(FinanceRepository):
+    """
+    finance.json anlık görüntü (snapshot) olarak kalır, yeni kayıtlar
+    'finance.json.journal' dosyasına satır satır eklenir. Günlük belirlenen
+    kayıt sayısına ulaşınca snapshot ile birleştirilir (compaction).
+    Silme ve güncellemeler de günlüğe küçük düzeltme kayıtları olarak eklenir
+    ve birleştirmede snapshot'a işlenir.
+    Mevcut finance.json dosyaları hiçbir dönüşüm gerekmeden okunur.
+    """
+
+    def __init__(self, filename="finance.json", compact_threshold=1000, background_compaction=False):
+        self.compact_threshold = compact_threshold
+        self.background_compaction = background_compaction
+        self._compaction_thread = None
+        # Dosya yolu -> günlükte bekleyen kayıt sayısı (ilk kullanımda sayılır)
+        self._pending_counts = {}
+        super().__init__(filename)
+
+    # Günlük dosyası her zaman snapshot dosyasının yanında durur
+    @property
+    def journal_path(self):
+        return self.file_path + ".journal"
+
+    # Birleştirme sırasında snapshot'a katılmakta olan günlük
+    @property
+    def folding_path(self):
+        return self.journal_path + ".katlaniyor"
+
+    def _ensure_file_exists(self):
+        super()._ensure_file_exists()
+        self._recover_compaction()
+
+    def _recover_compaction(self):
+        """
+        Yarıda kalmış birleştirmeyi tamamlar (bkz. _write_file). Katlanan günlük
+        duruyorsa yeni snapshot ya hâlâ '.tmp' dosyasındadır (yerine konur) ya
+        da zaten yerine konmuştur; her iki durumda da katlanan günlük silinir.
+        Böylece günlük kayıtları snapshot'a ikinci kez eklenmez.
+        """
+        if not os.path.exists(self.folding_path):
+            return
+        with _lock_for(self.file_path):
+            if not os.path.exists(self.folding_path):
+                return
+            tmp_path = self.file_path + ".tmp"
+            try:
+                if os.path.exists(tmp_path):
+                    os.replace(tmp_path, self.file_path)
+                os.remove(self.folding_path)
+            except OSError as e:
+                raise DataStorageError(self.file_path, f"Yarım kalan birleştirme tamamlanamadı: {str(e)}")
+
+    # Tek bir kaydı günlüğün sonuna ekler (dosyanın geri kalanına dokunmaz)
+    def save_record(self, record_dict):
+        line = json.dumps(record_dict, ensure_ascii=False) + "\n"
+        with _lock_for(self.file_path):
+            self._cached_write(lambda: self._append_lines(line.encode('utf-8'), 1), appended=[record_dict])
+        self._maybe_compact()
+
+    # Toplu kayıtları tek bir append ile günlüğe ekler
+    def save_records(self, records):
+        records = list(records)
+        if not records:
+            return
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with _lock_for(self.file_path):
+            self._cached_write(lambda: self._append_lines(payload.encode('utf-8'), len(records)), appended=records)
+        self._maybe_compact()
+
+    # Silme/güncelleme günlüğe tek satırlık düzeltme kaydı olarak eklenir
+    # (bkz. corrections.py); snapshot yeniden yazılmaz, okuyucular yüklerken uygular
+    def delete_record(self, transaction_id):
+        if self.find_by_id(transaction_id) is None:
+            return False
+        self._append_correction(make_delete(transaction_id))
+        return True
+
+    def update_record(self, transaction_id, changes):
+        if self.find_by_id(transaction_id) is None:
+            return False
+        if changes:
+            self._append_correction(make_update(transaction_id, changes))
+        return True
+
+    def _append_correction(self, op):
+        line = json.dumps(op, ensure_ascii=False) + "\n"
+        with _lock_for(self.file_path):
+            self._cached_write(lambda: self._append_lines(line.encode('utf-8'), 1), corrected=[op])
+        self._maybe_compact()
+
+    # Snapshot ve günlüğü birlikte okuyup düzeltmeleri uygulanmış tek liste döner
+    def _read_records(self):
+        self._recover_compaction()
+        data = super()._read_records()
+        records, corrections = self._split_journal()
+        data.extend(records)
+        return apply_corrections(data, corrections)
+
+    # Günlük tek seferde okunup ayrılır (eşik kadar kısa kalır), snapshot akış halinde okunur
+    def _stream_records(self):
+        self._recover_compaction()
+        journal, corrections = self._split_journal()
+        return iter_corrected(itertools.chain(super()._stream_records(), journal), corrections)
+
+    def _watched_paths(self):
+        return [self.file_path, self.journal_path]
+
+    # Bekleyen günlüğü snapshot'a katlar
+    def compact(self):
+        with _lock_for(self.file_path):
+            self._save_to_file(self.load_all())
+
+    # Tüm veriyi snapshot olarak yazar ve günlüğü boşaltır.
+    # Sıra: yeni snapshot '.tmp'ye tam yazılır -> günlük '.katlaniyor' adına
+    # taşınır -> snapshot yerine konur -> katlanan günlük silinir. Hangi adımda
+    # kesilirse kesilsin _recover_compaction tutarlı duruma getirir; snapshot'a
+    # katılmış günlük kayıtları tekrar uygulanmaz.
+    def _write_file(self, data):
+        with _lock_for(self.file_path):
+            self._recover_compaction()
+            tmp_path = self.file_path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                had_journal = os.path.exists(self.journal_path)
+                if had_journal:
+                    os.replace(self.journal_path, self.folding_path)
+                # Yarım kalmış snapshot oluşmaması için atomik yer değiştirme
+                os.replace(tmp_path, self.file_path)
+                if had_journal:
+                    open(self.journal_path, 'w').close()
+                    os.remove(self.folding_path)
+            except OSError as e:
+                raise DataStorageError(self.file_path, f"Yazma hatası: {str(e)}")
+            self._pending_counts[self.file_path] = 0
+
+    # Satırları günlüğe ekler, yarım kalmış son satırı kapatarak başlar
+    def _append_lines(self, payload, count):
+        self._recover_compaction()
+        pending = self._pending_count()
+        try:
+            with open(self.journal_path, 'a+b') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+                f.write(payload)
+        except OSError as e:
+            raise DataStorageError(self.journal_path, f"Yazma hatası: {str(e)}")
+        self._pending_counts[self.file_path] = pending + count
+
+    # Günlükteki satırları (kayıtlar ve düzeltmeler) sırayla okur
+    def _read_journal(self):
+        return list(iter_json_lines(self.journal_path))
+
+    # Günlüğü (kayıtlar, düzeltmeler) olarak ikiye ayırır
+    def _split_journal(self):
+        records, corrections = [], []
+        for item in self._read_journal():
+            (corrections if is_correction(item) else records).append(item)
+        return records, corrections
+
+    def _pending_count(self):
+        count = self._pending_counts.get(self.file_path)
+        if count is None:
+            count = len(self._read_journal())
+            self._pending_counts[self.file_path] = count
+        return count
+
+    # Eşik aşıldıysa birleştirmeyi hemen ya da arka planda başlatır
+    def _maybe_compact(self):
+        if self._pending_count() < self.compact_threshold:
+            return
+        if not self.background_compaction:
+            self.compact()
+            return
+        if self._compaction_thread is None or not self._compaction_thread.is_alive():
+            self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self._compaction_thread.start()
+
+    # Arka plandaki birleştirmenin bitmesini bekler (testler ve kapanış için)
+    def wait_for_compaction(self, timeout=None):
+        if self._compaction_thread is not None:
+            self._compaction_thread.join(timeout)
@@ -1,14 +1,27 @@
 import json
+import math
 import os
 # Kendi özel hata sınıfımızı çağırıyoruz
 from ..exceptions.errors import DataStorageError
+from .timestamps import SECONDS_PER_DAY, to_epoch, record_timestamp
+from .ledger_cache import ledger_cache, LedgerCache
+from .text_index import TextIndex
+from .id_index import IdIndex
+from .ids import id_bounds
+from .streaming import iter_json_array
+
+# Veri dosyalarının varsayılan olarak tutulduğu klasör (modules/finance/data)
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # JSON dosyası ile kod arasındaki veri alışverişini yöneten sınıf
 class FinanceRepository:
+
+    # Tarih aralığı sorgusunu tüm defteri okumadan yapabilen depolar True döner
+    supports_range_reads = False
+
     def __init__(self, filename="finance.json"):
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.file_path = os.path.join(current_dir, filename)
+        self.file_path = os.path.join(DATA_DIR, filename)
         
         # Başlangıçta dosya kontrolü yapar
         self._ensure_file_exists()
@@ -28,11 +41,61 @@ class FinanceRepository:
         # Önce mevcut veriyi çek (Burada hata olursa load_all )
         data = self.load_all()
         data.append(record_dict)
-        # Sonra kaydet (Burada hata olursa _save_to_file )
-        self._save_to_file(data)
+        # Sonra kaydet (Burada hata olursa _write_file )
+        self._cached_write(lambda: self._write_file(data), appended=[record_dict])
 
-    # Tüm kayıtları okur ve liste olarak döner
+    # Birden fazla kaydı tek bir dosya yazımıyla ekler
+    def save_records(self, records):
+        records = list(records)
+        if not records:
+            return
+        data = self.load_all()
+        data.extend(records)
+        self._cached_write(lambda: self._write_file(data), appended=records)
+
+    # Tüm kayıtları okur ve liste olarak döner (değiştirilebilir kopya)
     def load_all(self):
+        return [r.to_dict() for r in self.load_view()]
+
+    # Önbellekteki kayıtların salt okunur görünümünü döner.
+    # Dosya değişmediyse tekrar okunmaz; raporlama metotları bunu kullanır.
+    def load_view(self):
+        return ledger_cache.get(self._cache_key(), self._watched_paths(), self._read_records)
+
+    # Kayıtları tek tek döner; tüm defter belleğe alınmaz.
+    # Önbellekte güncel kopya varsa oradan, yoksa doğrudan dosyadan akış
+    # halinde okunur. Dönen kayıtlar salt okunur kabul edilmelidir.
+    def iter_records(self):
+        view = ledger_cache.peek(self._cache_key(), self._watched_paths())
+        if view is not None:
+            return iter(view)
+        return self._stream_records()
+
+    # Kayıtlardan türetilen ve önbellekle birlikte yaşayan yapıyı döner
+    # (örn. kolon bazlı analiz dizileri). Kayıtlar bellekte değilse builder'a
+    # akış verilir, kayıt listesi oluşturulmaz.
+    def derived(self, name, builder):
+        return ledger_cache.derived(
+            self._cache_key(), self._watched_paths(), self._read_records, name, builder,
+            stream=self._stream_records,
+        )
+
+    # Defter sürümü: her yazmada (bu süreçte veya dışarıda) değişen damga.
+    # Analiz sonuçlarının önbelleği bununla doğrulanır.
+    def version(self):
+        return ledger_cache.signature(self._watched_paths())
+
+    # Depolama dosyalarının stat bilgisi; süreçler arası kalıcı damga olarak kullanılır
+    def storage_signature(self):
+        return [LedgerCache.stat(p) for p in self._watched_paths()]
+
+    # Önbellek isabet/kaçırma sayaçları
+    @staticmethod
+    def cache_stats():
+        return ledger_cache.stats()
+
+    # Kayıtları doğrudan dosyadan okur (önbellek kullanılmaz)
+    def _read_records(self):
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -46,11 +109,109 @@ class FinanceRepository:
             # Beklenmeyen tüm okuma hataları
             raise DataStorageError(self.file_path, f"Okuma hatası: {str(e)}")
 
+    # Kayıtları dosyadan parça parça okuyan generator (önbellek kullanılmaz)
+    def _stream_records(self):
+        return iter_json_array(self.file_path)
+
+    # Önbellek anahtarı: depolama türü + dosyanın mutlak yolu
+    def _cache_key(self):
+        return (type(self).__name__, os.path.abspath(self.file_path))
+
+    # Değiştiğinde önbelleği geçersiz kılan dosyalar (ilki ana dosya)
+    def _watched_paths(self):
+        return [self.file_path]
+
+    # Yazma işlemini önbelleği güncel tutarak çalıştırır
+    def _cached_write(self, write_func, appended=None, replaced=None, corrected=None):
+        return ledger_cache.write(
+            self._cache_key(), self._watched_paths(), write_func,
+            appended=appended, replaced=replaced, corrected=corrected
+        )
+
+    # Tarihi (gün bazında) verilen aralığa düşen kayıtları döner
+    def load_between(self, start_date, end_date):
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        result = []
+        for item in self.iter_records():
+            ts = record_timestamp(item)
+            if start <= ts - ts % SECONDS_PER_DAY <= end:
+                result.append(item)
+        return result
+
+    # ID, kategori, tarih veya açıklamada alt metin araması (ters indeks ile).
+    # ignore_case: Türkçe harf kurallarıyla büyük/küçük harf ayrımı yapılmaz
+    # ranked: terimin kelimeleriyle birebir eşleşen kayıtlar öne alınır
+    def search(self, search_term, ignore_case=False, ranked=False):
+        index = self.derived("text_index", TextIndex.from_records)
+        positions = index.search(search_term, ignore_case)
+        if ranked:
+            positions.sort(key=lambda pos: index.score(pos, search_term), reverse=True)
+        return [index.record(pos).to_dict() for pos in positions]
+
+    # 'zaman' alanı olmayan eski kayıtlara sayısal zaman damgası ekler (tek seferlik).
+    # Tarihi çözülemeyen kayıtlar 'zaman' almaz; sadece onlar kaldıysa defter
+    # kopyalanmadan çıkılır. Dönüş: güncellenen kayıt sayısı
+    def migrate_timestamps(self):
+        if not any("zaman" not in item and not math.isnan(record_timestamp(item))
+                   for item in self.iter_records()):
+            return 0
+        data = self.load_all()
+        migrated = 0
+        for item in data:
+            if "zaman" in item:
+                continue
+            ts = record_timestamp(item)
+            if not math.isnan(ts):
+                item["zaman"] = int(ts)
+                migrated += 1
+        if migrated:
+            self._save_to_file(data)
+        return migrated
+
+    # ID'si verilen ilk kaydın kopyasını döner, yoksa None (kimlik indeksi ile)
+    def find_by_id(self, transaction_id):
+        item = self.derived("id_index", IdIndex.from_records).get(transaction_id)
+        return item.to_dict() if item is not None else None
+
+    # Aynı kimliği taşıyan tüm kayıtlar (delete_record bunların hepsini siler)
+    def find_all_by_id(self, transaction_id):
+        return [item.to_dict() for item in self.derived("id_index", IdIndex.from_records).get_all(transaction_id)]
+
+    # Kimliğinin zamanına göre start_date..end_date (gün bazında, iki uç dahil)
+    # arasında oluşturulmuş kayıtlar. Kimlik aralığı zaman aralığı olarak
+    # kullanılır; eski 8 haneli kimlikli kayıtlar dönmez.
+    def load_created_between(self, start_date, end_date):
+        low, high = id_bounds(start_date, end_date)
+        return [item.to_dict() for item in self.derived("id_index", IdIndex.from_records).between(low, high)]
+
+    # ID'si verilen kaydı siler, kayıt yoksa False döner
+    def delete_record(self, transaction_id):
+        data = self.load_all()
+        new_data = [t for t in data if t["id"] != transaction_id]
+        if len(data) == len(new_data):
+            return False
+        self._save_to_file(new_data)
+        return True
+
+    # ID'si verilen kaydın alanlarını günceller, kayıt yoksa False döner
+    def update_record(self, transaction_id, changes):
+        data = self.load_all()
+        for item in data:
+            if item["id"] == transaction_id:
+                item.update(changes)
+                self._save_to_file(data)
+                return True
+        return False
+
     # Veriyi dosyaya yazar (Private method)
     def _save_to_file(self, data):
+        self._cached_write(lambda: self._write_file(data), replaced=data)
+
+    # Listeyi JSON dosyasına yazar (önbellekten bağımsız ham yazma)
+    def _write_file(self, data):
         try:
             with open(self.file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
         except OSError as e:
             # Disk dolu, yazma izni yok vb.
-            raise DataStorageError(self.file_path, f"Yazma hatası: {str(e)}")
\ No newline at end of file
+            raise DataStorageError(self.file_path, f"Yazma hatası: {str(e)}")
@@ -0,0 +1,231 @@
+import os
+import threading
+from collections.abc import Sequence
+
+from .corrections import apply_corrections
+from .transaction import CompactTransaction
+
+
+# Önbellekteki kayıtların salt okunur görünümü
+class LedgerView(Sequence):
+    """
+    Kayıtlar salt okunur CompactTransaction olarak tutulur, liste de dışarıya kapalıdır.
+    Görünüm oluşturulduğu andaki uzunluğu sabitler; sonradan eklenen
+    kayıtlar eski görünümleri etkilemez.
+    """
+    __slots__ = ("_records", "_length")
+
+    def __init__(self, records, length=None):
+        self._records = records
+        self._length = len(records) if length is None else length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._records[i] for i in range(*index.indices(self._length)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LedgerView index out of range")
+        return self._records[index]
+
+    def __iter__(self):
+        records = self._records
+        for i in range(self._length):
+            yield records[i]
+
+    def __repr__(self):
+        return f"LedgerView({self._length} kayıt)"
+
+
+# Önbelleğe alınan kayıt: salt okunur ve sıkıştırılmış (bkz. CompactTransaction)
+def freeze_record(record):
+    if isinstance(record, CompactTransaction):
+        return record
+    return CompactTransaction.from_dict(record)
+
+
+class _CacheEntry:
+    __slots__ = ("signature", "records", "derived")
+
+    def __init__(self, signature, records):
+        self.signature = signature
+        # None: kayıtlar belleğe alınmadı, sadece türetilmiş yapılar tutuluyor
+        self.records = records
+        # Kayıtlardan türetilen yapılar (kolon dizileri, indeksler vb.)
+        self.derived = {}
+
+
+# Aynı süreçteki tüm repository nesnelerinin paylaştığı okuma önbelleği
+class LedgerCache:
+    """
+    Girdiler dosyanın mtime/boyut/inode bilgisi ve süreç içi yazma sayacı ile
+    doğrulanır. Başka bir süreç dosyayı değiştirirse stat bilgisi değişir ve
+    veri yeniden okunur; bu süreçteki yazmalar sayaç üzerinden yakalanır.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._write_counters = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    # paths[0] ana dosyadır, yazma sayacı onun mutlak yolu ile tutulur
+    def signature(self, paths):
+        counter = self._write_counters.get(os.path.abspath(paths[0]), 0)
+        return (counter,) + tuple(self.stat(p) for p in paths)
+
+    # Geçerli girdi varsa onu, yoksa loader ile okunan veriyi döner
+    def get(self, key, paths, loader):
+        with self._lock:
+            signature = self.signature(paths)
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature and entry.records is not None:
+                self.hits += 1
+                return LedgerView(entry.records)
+            self.misses += 1
+
+        # Okuma kilit dışında yapılır; imza okumadan önce alındığı için
+        # bu arada yapılan değişiklik bir sonraki çağrıda fark edilir
+        records = [freeze_record(r) for r in loader()]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature and entry.records is None:
+                # Akıştan kurulmuş yapılar korunur, kayıtlar yanlarına eklenir
+                entry.records = records
+            else:
+                self._entries[key] = _CacheEntry(signature, records)
+        return LedgerView(records)
+
+    # Geçerli girdi kayıtları bellekteyse görünümünü, değilse None döner (okuma yapmaz)
+    def peek(self, key, paths):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.records is not None and entry.signature == self.signature(paths):
+                self.hits += 1
+                return LedgerView(entry.records)
+            return None
+
+    # Kayıtlardan türetilmiş bir yapıyı döner, yoksa builder(kayıtlar) ile kurar.
+    # Yapı 'extend(records)' metoduna sahipse eklemelerde artımlı güncellenir,
+    # aksi halde bir sonraki erişimde yeniden kurulur.
+    # stream verilirse ve kayıtlar bellekte değilse yapı stream() akışından
+    # kurulur; kayıt listesi hiç oluşturulmaz.
+    def derived(self, key, paths, loader, name, builder, stream=None):
+        with self._lock:
+            signature = self.signature(paths)
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                structure = entry.derived.get(name)
+                if structure is not None:
+                    self.hits += 1
+                    return structure
+                if entry.records is not None:
+                    self.hits += 1
+                    structure = entry.derived[name] = builder(LedgerView(entry.records))
+                    return structure
+
+        if stream is None:
+            view = self.get(key, paths, loader)
+            source = view
+        else:
+            with self._lock:
+                self.misses += 1
+            view = None
+            source = (freeze_record(r) for r in stream())
+
+        structure = builder(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if view is not None:
+                if entry is None or entry.records is not view._records:
+                    # Bu arada başka bir yazma girdiyi değiştirdi, önbelleğe alınmaz
+                    return structure
+            elif entry is None or entry.signature != signature:
+                if self.signature(paths) != signature:
+                    return structure
+                entry = self._entries[key] = _CacheEntry(signature, None)
+            return entry.derived.setdefault(name, structure)
+
+    # Yazma işlemini yürütür ve önbelleği yazılan veriyle günceller
+    # corrected: sona eklenen silme/güncelleme kayıtları (bkz. corrections.py);
+    # 'apply(op)' metodu olan türetilmiş yapılar yerinde güncellenir.
+    def write(self, key, paths, write_func, appended=None, replaced=None, corrected=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and entry.signature == self.signature(paths)
+            try:
+                result = write_func()
+            except BaseException:
+                self._bump(paths[0])
+                self._entries.pop(key, None)
+                raise
+            self._bump(paths[0])
+
+            if replaced is not None:
+                self._entries[key] = _CacheEntry(self.signature(paths), [freeze_record(r) for r in replaced])
+            elif fresh and appended is not None:
+                # Önbellek yazmadan önce güncelse yeni kayıtları sona eklemek yeterli
+                new_records = [freeze_record(r) for r in appended]
+                if entry.records is not None:
+                    entry.records.extend(new_records)
+                entry.signature = self.signature(paths)
+                for name, structure in list(entry.derived.items()):
+                    if hasattr(structure, "extend"):
+                        structure.extend(new_records)
+                    else:
+                        del entry.derived[name]
+            elif fresh and corrected is not None:
+                if entry.records is not None:
+                    entry.records = [freeze_record(r) for r in apply_corrections(entry.records, corrected)]
+                entry.signature = self.signature(paths)
+                for name, structure in list(entry.derived.items()):
+                    if hasattr(structure, "apply"):
+                        for op in corrected:
+                            structure.apply(op)
+                    else:
+                        del entry.derived[name]
+            else:
+                self._entries.pop(key, None)
+            return result
+
+    def _bump(self, path):
+        path = os.path.abspath(path)
+        self._write_counters[path] = self._write_counters.get(path, 0) + 1
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+# Süreç genelinde paylaşılan tek önbellek nesnesi
+ledger_cache = LedgerCache()
@@ -0,0 +1,36 @@
+# Para tutarlarının tam sayı kuruş gösterimi.
+# Kayıtlarda 'tutar' (TL, float) eski kodlar için durur; toplamalar
+# 'tutar_kurus' (int) üzerinden yapılır, böylece yüz binlerce satırlık
+# toplamlarda kayan nokta hatası birikmez ve NumPy ile toplama kesin olur.
+
+# NumPy opsiyoneldir; dizi dönüşümleri yoksa liste ile yapılır
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# TL tutarını en yakın kuruşa yuvarlar (round: ...5'te çifte yuvarlama)
+def to_kurus(amount):
+    return round(float(amount) * 100)
+
+
+def to_tl(kurus):
+    return kurus / 100
+
+
+# Kaydın kuruş tutarı. 'tutar' esas alınır: 'tutar_kurus' alanı yoksa veya
+# eski bir kod sadece 'tutar'ı değiştirdiği için uyuşmuyorsa 'tutar'dan hesaplanır
+def record_kurus(item):
+    kurus = item.get("tutar_kurus")
+    amount = item["tutar"]
+    if kurus is None or kurus / 100 != amount:
+        return to_kurus(amount)
+    return kurus
+
+
+# TL dizisini int64 kuruş dizisine çevirir (to_kurus ile aynı yuvarlama)
+def to_kurus_array(amounts):
+    if np is None:
+        return [to_kurus(a) for a in amounts]
+    return np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
@@ -0,0 +1,301 @@
+import itertools
+import json
+import math
+import os
+from datetime import datetime
+
+from .json_db import FinanceRepository
+from .journal_db import _lock_for
+from .corrections import make_delete, make_update, apply_corrections, iter_corrected
+from .streaming import iter_json_lines
+from .timestamps import SECONDS_PER_DAY, to_epoch, from_epoch, record_timestamp
+from ..exceptions.errors import DataStorageError
+
+# Tarihi çözülemeyen kayıtların tutulduğu parça
+UNDATED_SHARD = "tarihsiz"
+
+
+# Defteri aylık parça (shard) dosyalarına bölen depolama modu
+class ShardedFinanceRepository(FinanceRepository):
+    """
+    Klasör yapısı:
+        finance/manifest.json      -> parça listesi, kayıt sayıları ve nesil
+        finance/2025-12.jsonl      -> o aya ait kayıtlar (satır başına bir JSON)
+        finance/duzeltmeler.jsonl  -> silme/güncelleme kayıtları
+    Yeni kayıtlar sadece kendi ayının parçasına eklenir; geçmiş aylar bir kez
+    kapandıktan sonra değişmez. Silme ve güncellemeler eski parçalara dokunmadan
+    düzeltme dosyasına yazılır ve okuma sırasında uygulanır; düzeltme sayısı
+    'compact_threshold' değerine ulaşınca düzeltmeler yeni bir nesil yazılarak
+    parçalara katlanır ve düzeltme dosyası boş başlar.
+    Defterin tamamı yeniden yazılırken (bakım, taşıma) yeni parçalar bir
+    sonraki nesil adıyla (örn. 2025-12.1.jsonl) yazılır; manifest atomik olarak
+    yeni nesle geçirildikten sonra eski dosyalar silinir. Yarıda kalan bir
+    yeniden yazma eski nesli bozmaz.
+    """
+
+    supports_range_reads = True
+
+    def __init__(self, filename="finance", compact_threshold=1000):
+        self.compact_threshold = compact_threshold
+        super().__init__(filename)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.file_path, "manifest.json")
+
+    # Manifestteki geçerli neslin dosyaları; nesil verilmezse manifest okunur
+    @property
+    def corrections_path(self):
+        return self._corrections_file(self.load_manifest().get("nesil", 0))
+
+    def shard_path(self, shard_key, generation=None):
+        if generation is None:
+            generation = self.load_manifest().get("nesil", 0)
+        return os.path.join(self.file_path, f"{shard_key}{self._suffix(generation)}.jsonl")
+
+    def _corrections_file(self, generation):
+        return os.path.join(self.file_path, f"duzeltmeler{self._suffix(generation)}.jsonl")
+
+    # İlk neslin dosyaları eski adlarıyla durur (mevcut klasörler dönüşümsüz okunur)
+    @staticmethod
+    def _suffix(generation):
+        return f".{generation}" if generation else ""
+
+    # Klasör ve boş manifest yoksa oluşturulur
+    def _ensure_file_exists(self):
+        try:
+            os.makedirs(self.file_path, exist_ok=True)
+            if not os.path.exists(self.manifest_path):
+                self._write_manifest({"shards": {}, "duzeltme": 0})
+        except OSError as e:
+            raise DataStorageError(self.file_path, f"Klasör oluşturulamadı: {str(e)}")
+
+    # Her yazma manifesti güncellediği için önbellek sadece ona bakar
+    def _watched_paths(self):
+        return [self.manifest_path]
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"shards": {}, "duzeltme": 0}
+        except (OSError, json.JSONDecodeError) as e:
+            raise DataStorageError(self.manifest_path, f"Manifest okunamadı: {str(e)}")
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=4, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            raise DataStorageError(self.manifest_path, f"Manifest yazılamadı: {str(e)}")
+
+    # Kaydın ait olduğu parça: zaman damgasının ayı ("YYYY-AA")
+    @staticmethod
+    def shard_key(item):
+        ts = record_timestamp(item)
+        if math.isnan(ts):
+            return UNDATED_SHARD
+        return from_epoch(ts).strftime("%Y-%m")
+
+    def save_record(self, record_dict):
+        self.save_records([record_dict])
+
+    # Kayıtlar aylarına göre gruplanır, her grup kendi parçasına eklenir
+    def save_records(self, records):
+        records = list(records)
+        if not records:
+            return
+        groups = {}
+        for item in records:
+            groups.setdefault(self.shard_key(item), []).append(item)
+        self._cached_write(lambda: self._append_groups(groups), appended=records)
+
+    def _append_groups(self, groups):
+        with _lock_for(self.file_path):
+            manifest = self.load_manifest()
+            generation = manifest.get("nesil", 0)
+            # Yeni ayın parçası, içine yazılmadan önce manifeste eklenir; aksi halde
+            # yazma ile manifest arasında kesilen bir işlemde parça okunmaz kalırdı
+            new_keys = [key for key in groups if key not in manifest["shards"]]
+            if new_keys:
+                for key in new_keys:
+                    manifest["shards"][key] = {"kayit": 0}
+                self._write_manifest(manifest)
+            for key, items in groups.items():
+                payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in items)
+                self._append(self.shard_path(key, generation), payload)
+                manifest["shards"][key]["kayit"] += len(items)
+            self._write_manifest(manifest)
+
+    # Satırları dosyanın sonuna ekler. Önceki bir yazma yarım satır bıraktıysa
+    # önce satır kapatılır; yeni kayıt yarım satıra yapışıp kaybolmaz
+    # (bkz. JournalFinanceRepository._append_lines).
+    @staticmethod
+    def _append(path, payload):
+        payload = payload.encode('utf-8')
+        try:
+            with open(path, 'a+b') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        payload = b"\n" + payload
+                f.write(payload)
+        except OSError as e:
+            raise DataStorageError(path, f"Yazma hatası: {str(e)}")
+
+    # Yeni nesil parçasını baştan yazar ve diske indirir
+    @staticmethod
+    def _write_new(path, payload):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            raise DataStorageError(path, f"Yazma hatası: {str(e)}")
+
+    @staticmethod
+    def _read_lines(path):
+        return list(iter_json_lines(path))
+
+    def _read_shards(self, manifest, keys):
+        generation = manifest.get("nesil", 0)
+        records = []
+        for key in keys:
+            records.extend(self._read_lines(self.shard_path(key, generation)))
+        return apply_corrections(records, self._read_lines(self._corrections_file(generation)))
+
+    def _read_records(self):
+        manifest = self.load_manifest()
+        return self._read_shards(manifest, sorted(manifest["shards"]))
+
+    # Parçalar sırayla satır satır okunur; düzeltmeler akış üzerinde uygulanır
+    def _stream_records(self):
+        manifest = self.load_manifest()
+        generation = manifest.get("nesil", 0)
+        shards = itertools.chain.from_iterable(
+            iter_json_lines(self.shard_path(k, generation)) for k in sorted(manifest["shards"])
+        )
+        return iter_corrected(shards, self._read_lines(self._corrections_file(generation)))
+
+    # Sadece aralıkla kesişen aylık parçalar okunur
+    def load_between(self, start_date, end_date):
+        first = start_date.strftime("%Y-%m")
+        last = end_date.strftime("%Y-%m")
+        manifest = self.load_manifest()
+        keys = [
+            key for key in sorted(manifest["shards"])
+            if key != UNDATED_SHARD and first <= key <= last
+        ]
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        result = []
+        for item in self._read_shards(manifest, keys):
+            ts = record_timestamp(item)
+            if start <= ts - ts % SECONDS_PER_DAY <= end:
+                result.append(item)
+        return result
+
+    # Silme ve güncellemeler düzeltme dosyasına eklenir, parçalar değişmez
+    # Kimlik indeksi (bkz. IdIndex) önbellekte güncel tutulur, yeniden kurulmaz
+    def delete_record(self, transaction_id):
+        if self.find_by_id(transaction_id) is None:
+            return False
+        op = make_delete(transaction_id)
+        self._cached_write(lambda: self._append_correction(op), corrected=[op])
+        self._maybe_compact()
+        return True
+
+    def update_record(self, transaction_id, changes):
+        if self.find_by_id(transaction_id) is None:
+            return False
+        if changes:
+            op = make_update(transaction_id, changes)
+            self._cached_write(lambda: self._append_correction(op), corrected=[op])
+            self._maybe_compact()
+        return True
+
+    def _append_correction(self, op):
+        with _lock_for(self.file_path):
+            manifest = self.load_manifest()
+            self._append(self._corrections_file(manifest.get("nesil", 0)), json.dumps(op, ensure_ascii=False) + "\n")
+            manifest["duzeltme"] = manifest.get("duzeltme", 0) + 1
+            self._write_manifest(manifest)
+
+    # Bekleyen düzeltmeleri parçalara katlar: düzeltilmiş defter yeni nesil
+    # olarak yazılır, düzeltme dosyası yeni nesilde boş başlar
+    def compact(self):
+        with _lock_for(self.file_path):
+            self._save_to_file(self.load_all())
+
+    # Düzeltme sayısı eşiğe ulaştıysa birleştirir
+    def _maybe_compact(self):
+        if self.load_manifest().get("duzeltme", 0) < self.compact_threshold:
+            return
+        with _lock_for(self.file_path):
+            # Kilit beklenirken başka bir yazıcı birleştirmiş olabilir
+            if self.load_manifest().get("duzeltme", 0) >= self.compact_threshold:
+                self.compact()
+
+    # Tüm veriyi parçalara yeniden dağıtır (toplu bakım / içe aktarma işlemi).
+    # Yeni parçalar bir sonraki nesil adıyla yazılır; geçiş noktası manifestin
+    # atomik olarak değiştirilmesidir. extra: aynı manifest yazımına eklenecek alanlar.
+    def _write_file(self, data, extra=None):
+        with _lock_for(self.file_path):
+            manifest = self.load_manifest()
+            old_generation = manifest.get("nesil", 0)
+            generation = old_generation + 1
+            # Daha önce yarıda kalmış bir yeniden yazmanın artıkları temizlenir
+            self._remove_generation(generation)
+
+            groups = {}
+            for item in data:
+                groups.setdefault(self.shard_key(item), []).append(item)
+            shards = {}
+            for key, items in groups.items():
+                payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in items)
+                self._write_new(self.shard_path(key, generation), payload)
+                shards[key] = {"kayit": len(items)}
+
+            manifest.update(extra or {})
+            manifest["shards"] = shards
+            manifest["duzeltme"] = 0
+            manifest["nesil"] = generation
+            self._write_manifest(manifest)
+            self._remove_generation(old_generation)
+
+    # Verilen nesle ait parça ve düzeltme dosyalarını siler
+    def _remove_generation(self, generation):
+        suffix = self._suffix(generation) + ".jsonl"
+        try:
+            names = os.listdir(self.file_path)
+        except OSError:
+            return
+        for name in names:
+            stem = name[:-len(suffix)]
+            # İlk neslin adlarında nesil eki yoktur ('2025-12.jsonl'); sonraki nesillerinki eşleşmemeli
+            if not name.endswith(suffix) or (not generation and "." in stem):
+                continue
+            try:
+                os.remove(os.path.join(self.file_path, name))
+            except OSError:
+                pass
+
+    # Tek parçalı finance.json defterini bir kereye mahsus aylara böler.
+    # Kayıtlar ve taşındı işareti aynı manifest yazımıyla görünür olur;
+    # yarıda kalan bir taşıma kayıtları iki kez içeri almaz.
+    def migrate_from_json(self, json_path):
+        manifest = self.load_manifest()
+        if manifest.get("json_migrated") or not os.path.exists(json_path):
+            return 0
+        records = FinanceRepository(json_path).load_all()
+        data = self.load_all() + records
+        marker = {
+            "json_migrated": os.path.abspath(json_path),
+            "migrated_at": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+        }
+        self._cached_write(lambda: self._write_file(data, extra=marker), replaced=data)
+        return len(records)
@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from .json_db import FinanceRepository
+from .constants import DATE_FORMAT
+from ..exceptions.errors import DataStorageError
+
+# Kayıt sözlüğünde doğrudan sütun olarak tutulan alanlar (sıra önemli)
+_COLUMNS = ("id", "tarih", "tip", "kategori", "tutar", "aciklama")
+# Kayıtta tam sayı olarak bulunduklarında kendi sütunlarında tutulan alanlar
+_INT_COLUMNS = ("tutar_kurus", "zaman")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    sira INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    tarih TEXT NOT NULL,
+    gun TEXT,
+    tip TEXT NOT NULL,
+    kategori TEXT NOT NULL,
+    tutar REAL NOT NULL,
+    aciklama TEXT,
+    tutar_kurus INTEGER,
+    zaman INTEGER,
+    ek TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_id ON transactions(id);
+CREATE INDEX IF NOT EXISTS idx_transactions_gun ON transactions(gun);
+CREATE INDEX IF NOT EXISTS idx_transactions_tip ON transactions(tip);
+CREATE INDEX IF NOT EXISTS idx_transactions_kategori ON transactions(kategori);
+CREATE TABLE IF NOT EXISTS meta (
+    anahtar TEXT PRIMARY KEY,
+    deger TEXT
+);
+"""
+
+
+# "GG-AA-YYYY ..." formatındaki tarihi sıralanabilir "YYYY-AA-GG" haline getirir
+def _sortable_day(tarih):
+    try:
+        return datetime.strptime(tarih.split()[0], DATE_FORMAT).strftime("%Y-%m-%d")
+    except (ValueError, IndexError, AttributeError):
+        return None
+
+
+# FinanceRepository ile aynı arayüzü sunan, stdlib sqlite3 tabanlı depolama
+class SqliteFinanceRepository(FinanceRepository):
+    """
+    Kayıtlar 'transactions' tablosunda tutulur. id, tarih (sıralanabilir 'gun'
+    sütunu üzerinden), tip ve kategori indekslidir; tarih aralığı, ID ile silme
+    ve güncelleme işlemleri tüm dosyayı okumadan indeks üzerinden yapılır;
+    metin araması ise indekslenmez (bkz. search).
+    Kuruş tutarı ve zaman damgası tam sayı sütunlardadır; bilinmeyen ek
+    alanlar 'ek' sütununda JSON olarak saklanır.
+    """
+
+    supports_range_reads = True
+
+    def __init__(self, filename="finance.db"):
+        # Şeması hazırlanmış veritabanı yolları (file_path sonradan değişebilir)
+        self._initialized_paths = set()
+        super().__init__(filename)
+
+    # Veritabanı dosyası ve şema yoksa oluşturulur
+    def _ensure_file_exists(self):
+        self._connect().close()
+
+    def _connect(self):
+        try:
+            conn = sqlite3.connect(self.file_path)
+            if self.file_path not in self._initialized_paths:
+                conn.executescript(_SCHEMA)
+                self._migrate_columns(conn)
+                self._initialized_paths.add(self.file_path)
+            return conn
+        except (sqlite3.Error, ValueError) as e:
+            raise DataStorageError(self.file_path, f"Veritabanı açılamadı: {str(e)}")
+
+    # Eski tablolara tam sayı sütunlarını ekler ve 'ek' JSON'undaki değerleri oraya taşır
+    @staticmethod
+    def _migrate_columns(conn):
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+        missing = [name for name in _INT_COLUMNS if name not in existing]
+        if not missing:
+            return
+        with conn:
+            for name in missing:
+                conn.execute(f"ALTER TABLE transactions ADD COLUMN {name} INTEGER")
+            updates = []
+            for sira, ek in conn.execute("SELECT sira, ek FROM transactions WHERE ek IS NOT NULL").fetchall():
+                extra = json.loads(ek)
+                values = [extra.pop(name) if type(extra.get(name)) is int else None for name in _INT_COLUMNS]
+                if values != [None] * len(values):
+                    updates.append((*values, json.dumps(extra, ensure_ascii=False) if extra else None, sira))
+            conn.executemany(
+                "UPDATE transactions SET tutar_kurus = COALESCE(?, tutar_kurus), "
+                "zaman = COALESCE(?, zaman), ek = ? WHERE sira = ?", updates)
+
+    # Sorguyu çalıştırır, sqlite hatalarını kendi hata sınıfımıza çevirir
+    def _execute(self, sql, params=(), many=False):
+        conn = self._connect()
+        try:
+            with conn:
+                if many:
+                    return conn.executemany(sql, params).rowcount
+                cursor = conn.execute(sql, params)
+                return cursor.fetchall() if cursor.description else cursor.rowcount
+        except sqlite3.Error as e:
+            raise DataStorageError(self.file_path, f"Sorgu hatası: {str(e)}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_row(record):
+        ints = [record.get(name) if type(record.get(name)) is int else None for name in _INT_COLUMNS]
+        extra = {
+            k: v for k, v in record.items()
+            if k not in _COLUMNS and not (k in _INT_COLUMNS and type(v) is int)
+        }
+        return (
+            record["id"], record["tarih"], _sortable_day(record["tarih"]),
+            record["tip"], record["kategori"], record["tutar"], record.get("aciklama", ""),
+            *ints, json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    @staticmethod
+    def _to_record(row):
+        record = dict(zip(_COLUMNS, row[:6]))
+        for name, value in zip(_INT_COLUMNS, row[6:8]):
+            if value is not None:
+                record[name] = value
+        if row[8]:
+            record.update(json.loads(row[8]))
+        return record
+
+    _INSERT = ("INSERT INTO transactions (id, tarih, gun, tip, kategori, tutar, aciklama, tutar_kurus, zaman, ek) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    _SELECT = "SELECT id, tarih, tip, kategori, tutar, aciklama, tutar_kurus, zaman, ek FROM transactions"
+
+    # Tek kayıt ekler (tabloyu yeniden yazmaz)
+    def save_record(self, record_dict):
+        row = self._to_row(record_dict)
+        self._cached_write(lambda: self._execute(self._INSERT, row), appended=[record_dict])
+
+    # Toplu ekleme tek transaction içinde yapılır
+    def save_records(self, records):
+        records = list(records)
+        if not records:
+            return
+        rows = [self._to_row(r) for r in records]
+        self._cached_write(lambda: self._execute(self._INSERT, rows, many=True), appended=records)
+
+    def _read_records(self):
+        return [self._to_record(r) for r in self._execute(self._SELECT + " ORDER BY sira")]
+
+    # İmleç (cursor) üzerinden satır satır okuma; bağlantı akış bitince kapanır
+    def _stream_records(self):
+        conn = self._connect()
+        try:
+            cursor = conn.execute(self._SELECT + " ORDER BY sira")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._to_record(row)
+        except sqlite3.Error as e:
+            raise DataStorageError(self.file_path, f"Sorgu hatası: {str(e)}")
+        finally:
+            conn.close()
+
+    # 'id' indeksi ile tek kayıt
+    def find_by_id(self, transaction_id):
+        rows = self._execute(self._SELECT + " WHERE id = ? ORDER BY sira LIMIT 1", (transaction_id,))
+        return self._to_record(rows[0]) if rows else None
+
+    def find_all_by_id(self, transaction_id):
+        rows = self._execute(self._SELECT + " WHERE id = ? ORDER BY sira", (transaction_id,))
+        return [self._to_record(row) for row in rows]
+
+    # 'gun' indeksi üzerinden tarih aralığı sorgusu
+    def load_between(self, start_date, end_date):
+        # Kayıt tarihi gün başı (00:00) olarak karşılaştırılır
+        first_day = start_date.date()
+        if start_date != datetime.combine(first_day, datetime.min.time()):
+            first_day += timedelta(days=1)
+        rows = self._execute(
+            self._SELECT + " WHERE gun BETWEEN ? AND ? ORDER BY sira",
+            (first_day.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")),
+        )
+        return [self._to_record(r) for r in rows]
+
+    # Alt metin araması (instr) JSON çözümlemeden veritabanı içinde yapılır,
+    # ancak hiçbir indeks kullanılamaz: her aramada tablo baştan sona taranır.
+    # Harf duyarsız veya sıralı arama, tüm defteri belleğe alıp önbellekteki
+    # ters indeksi (bkz. TextIndex) kurar ve onu kullanır.
+    def search(self, search_term, ignore_case=False, ranked=False):
+        if ignore_case or ranked:
+            return super().search(search_term, ignore_case, ranked)
+        rows = self._execute(
+            self._SELECT + " WHERE instr(id, ?) > 0 OR instr(kategori, ?) > 0"
+            " OR instr(tarih, ?) > 0 OR instr(aciklama, ?) > 0 ORDER BY sira",
+            (search_term,) * 4,
+        )
+        return [self._to_record(r) for r in rows]
+
+    def delete_record(self, transaction_id):
+        deleted = self._cached_write(
+            lambda: self._execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+        )
+        return deleted > 0
+
+    def update_record(self, transaction_id, changes):
+        rows = self._execute(self._SELECT + " WHERE id = ? ORDER BY sira LIMIT 1", (transaction_id,))
+        if not rows:
+            return False
+        if changes:
+            record = self._to_record(rows[0])
+            record.update(changes)
+            row = self._to_row(record)
+            self._cached_write(lambda: self._execute(
+                "UPDATE transactions SET tarih = ?, gun = ?, tip = ?, kategori = ?, tutar = ?, "
+                "aciklama = ?, tutar_kurus = ?, zaman = ?, ek = ? WHERE sira = (SELECT MIN(sira) FROM transactions WHERE id = ?)",
+                row[1:] + (transaction_id,),
+            ))
+        return True
+
+    # Tüm tabloyu verilen liste ile değiştirir (tek transaction içinde)
+    def _write_file(self, data):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM transactions")
+                conn.executemany(self._INSERT, [self._to_row(r) for r in data])
+        except sqlite3.Error as e:
+            raise DataStorageError(self.file_path, f"Yazma hatası: {str(e)}")
+        finally:
+            conn.close()
+
+    # JSON defterindeki kayıtları bir kereye mahsus veritabanına aktarır
+    def migrate_from_json(self, json_path):
+        done = self._execute("SELECT deger FROM meta WHERE anahtar = 'json_migrated'")
+        if done or not os.path.exists(json_path):
+            return 0
+        records = FinanceRepository(json_path).load_all()
+        self._cached_write(lambda: self._import_rows(records, json_path))
+        return len(records)
+
+    def _import_rows(self, records, json_path):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(self._INSERT, [self._to_row(r) for r in records])
+                conn.execute("INSERT INTO meta (anahtar, deger) VALUES ('json_migrated', ?)",
+                             (os.path.abspath(json_path),))
+        except sqlite3.Error as e:
+            raise DataStorageError(self.file_path, f"Aktarım hatası: {str(e)}")
+        finally:
+            conn.close()
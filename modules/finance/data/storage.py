@@ -0,0 +1,29 @@
+import os
+
+from .json_db import FinanceRepository, DATA_DIR
+from .journal_db import JournalFinanceRepository
+from .sqlite_db import SqliteFinanceRepository
+from .sharded_db import ShardedFinanceRepository
+from ..exceptions.errors import FinanceError
+
+# Depolama modu -> (repository sınıfı, varsayılan dosya adı)
+STORAGE_MODES = {
+    "json": (FinanceRepository, "finance.json"),
+    "journal": (JournalFinanceRepository, "finance.json"),
+    "sqlite": (SqliteFinanceRepository, "finance.db"),
+    "sharded": (ShardedFinanceRepository, "finance"),
+}
+
+
+# İstenen depolama moduna göre repository nesnesi oluşturur
+def create_repository(mode="json", filename=None, **options):
+    if mode not in STORAGE_MODES:
+        raise FinanceError(f"Bilinmeyen depolama modu: '{mode}'", error_code=1013)
+
+    repo_class, default_name = STORAGE_MODES[mode]
+    repo = repo_class(filename or default_name, **options)
+
+    # SQLite ve parçalı mod ilk açılışta mevcut JSON defterini içeri alır
+    if mode in ("sqlite", "sharded"):
+        repo.migrate_from_json(os.path.join(DATA_DIR, "finance.json"))
+    return repo
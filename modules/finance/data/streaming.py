@@ -0,0 +1,90 @@
+import json
+
+from ..exceptions.errors import DataStorageError
+
+# Dosyalar bu boyutta parçalar halinde okunur
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\r\n"
+
+
+# JSON dizisi ('[{...}, {...}]') biçimindeki dosyayı eleman eleman okur.
+# Bellekte aynı anda sadece bir parça ve o anki eleman tutulur.
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            buf, pos, eof = "", 0, False
+            state = "start"   # start -> value/end -> separator -> value ...
+
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == len(buf):
+                    if eof:
+                        if state == "done":
+                            return
+                        raise DataStorageError(path, "JSON formatı bozuk, okunamadı: beklenmeyen dosya sonu")
+                    chunk = f.read(chunk_size)
+                    buf, pos, eof = chunk, 0, not chunk
+                    continue
+
+                ch = buf[pos]
+                if state == "done":
+                    raise DataStorageError(path, "JSON formatı bozuk, okunamadı: dizi sonrası fazla veri")
+                if state == "start":
+                    if ch != "[":
+                        raise DataStorageError(path, "JSON formatı bozuk, okunamadı: kayıt listesi bekleniyordu")
+                    pos += 1
+                    state = "first"
+                elif ch == "]" and state in ("first", "separator"):
+                    pos += 1
+                    state = "done"
+                elif state == "separator":
+                    if ch != ",":
+                        raise DataStorageError(path, f"JSON formatı bozuk, okunamadı: beklenmeyen '{ch}'")
+                    pos += 1
+                    state = "value"
+                else:
+                    try:
+                        item, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError as e:
+                        item, end = None, None
+                        error = e
+                    # Eleman parçanın sonuna denk geldiyse yarım olabilir, devamı okunur
+                    if end is None or (end == len(buf) and not eof):
+                        if eof:
+                            raise DataStorageError(path, f"JSON formatı bozuk, okunamadı: {str(error)}")
+                        chunk = f.read(chunk_size)
+                        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                        continue
+                    pos = end
+                    state = "separator"
+                    yield item
+
+                # Tüketilen kısım atılır
+                if pos > chunk_size:
+                    buf, pos = buf[pos:], 0
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        raise DataStorageError(path, f"Okuma hatası: {str(e)}")
+
+
+# Satır başına bir JSON kayıt içeren dosyayı (günlük, aylık parça) okur.
+# Çökme sırasında yarım yazılmış satırlar atlanır.
+def iter_json_lines(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        raise DataStorageError(path, f"Okuma hatası: {str(e)}")
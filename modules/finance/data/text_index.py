@@ -0,0 +1,111 @@
+import re
+
+from .ledger_cache import freeze_record
+
+# Aramanın baktığı alanlar (eski search() ile aynı)
+SEARCH_FIELDS = ("id", "kategori", "tarih", "aciklama")
+
+# Alan metni bu karakterle çevrelenir; böylece 1-2 harflik metinler de
+# en az bir üçlüye (trigram) girer
+_PAD = "\x00"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+# Türkçe kurallarına göre küçük harfe çevirir (İ -> i, I -> ı).
+# Dönüşüm karakter karakter yapıldığı için alt metin ilişkisi korunur.
+def fold(text):
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+
+def _field_text(item, field):
+    value = item.get(field)
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Arama alanları üzerinde üçlü (trigram) ve kelime (token) ters indeksi
+class TextIndex:
+    """
+    Her kaydın arama alanları Türkçe küçük harfe çevrilip üçlülere bölünür;
+    her üçlü için o üçlüyü içeren kayıtların sıra numaraları tutulur.
+    Arama terimi üçlülerinin kesişimi aday kümesini verir, adaylar eski
+    alt metin (substring) kontrolü ile doğrulanır. Bu yüzden sonuç kümesi
+    tam taramayla birebir aynıdır. Repository önbelleğine bağlı yaşar;
+    yeni kayıtlar 'extend' ile eklenir.
+    """
+
+    def __init__(self):
+        self._records = []
+        self._grams = {}    # üçlü -> {sıra no}
+        self._tokens = {}   # kelime -> {sıra no}
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        index.extend(records)
+        return index
+
+    def __len__(self):
+        return len(self._records)
+
+    def extend(self, records):
+        for item in records:
+            pos = len(self._records)
+            self._records.append(freeze_record(item))
+            for field in SEARCH_FIELDS:
+                text = fold(_field_text(item, field))
+                for gram in _trigrams(_PAD + text + _PAD):
+                    self._grams.setdefault(gram, set()).add(pos)
+                for token in _TOKEN_RE.findall(text):
+                    self._tokens.setdefault(token, set()).add(pos)
+
+    # Terimi içerebilecek kayıtların sıra numaraları (fazlası olabilir, eksiği olmaz)
+    def _candidates(self, folded_term):
+        if len(folded_term) >= 3:
+            postings = sorted(
+                (self._grams.get(g, ()) for g in _trigrams(folded_term)), key=len
+            )
+            if not postings[0]:
+                return set()
+            result = set(postings[0])
+            for p in postings[1:]:
+                result &= p
+                if not result:
+                    break
+            return result
+        # Kısa terimler: terimi içeren tüm üçlülerin birleşimi
+        result = set()
+        for gram, positions in self._grams.items():
+            if folded_term in gram:
+                result |= positions
+        return result
+
+    def _matches(self, item, term, ignore_case):
+        for field in SEARCH_FIELDS:
+            text = _field_text(item, field)
+            if term in (fold(text) if ignore_case else text):
+                return True
+        return False
+
+    # Eşleşen kayıtların sıra numaraları (defter sırasıyla)
+    def search(self, term, ignore_case=False):
+        if not term:
+            return list(range(len(self._records)))
+        folded = fold(term)
+        if ignore_case:
+            term = folded
+        return [
+            pos for pos in sorted(self._candidates(folded))
+            if self._matches(self._records[pos], term, ignore_case)
+        ]
+
+    # Terimin kelimelerinden birebir eşleşenlerin sayısı (sıralama puanı)
+    def score(self, pos, term):
+        return sum(1 for token in _TOKEN_RE.findall(fold(term)) if pos in self._tokens.get(token, ()))
+
+    def record(self, pos):
+        return self._records[pos]
@@ -0,0 +1,79 @@
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from .constants import TransactionType
+from .money import record_kurus
+from .timestamps import SECONDS_PER_DAY, to_epoch, record_timestamp
+
+
+# Verilen günün başlangıcının (00:00) epoch saniyesi; date veya datetime alır
+def day_epoch(day):
+    return to_epoch(datetime(day.year, day.month, day.day))
+
+
+# (tip, kategori) başına zamana göre sıralı indeks
+class TimeIndex:
+    """
+    Her (tip, kategori) için kayıtların zaman damgaları sıralı bir listede,
+    tutarları ise kuruş cinsinden kümülatif toplam (prefix sum) olarak tutulur.
+    Bir tarih aralığının toplamı iki ikili arama (bisect) ve bir çıkarma ile
+    bulunur; defter satır satır taranmaz. Tam sayı kuruş kullanıldığı için
+    aralık toplamlarında kayan nokta hatası birikmez.
+    Tarihi çözülemeyen kayıtlar indekse alınmaz. Repository önbelleğine bağlı
+    yaşar; yeni kayıtlar 'extend' ile eklenir.
+    """
+
+    def __init__(self):
+        self._series = {}   # (tip, kategori) -> ([zaman], [0, kümülatif kuruş...])
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        index.extend(records)
+        return index
+
+    def extend(self, records):
+        for item in records:
+            ts = record_timestamp(item)
+            if math.isnan(ts):
+                continue
+            kurus = record_kurus(item)
+            times, prefix = self._series.setdefault((item["tip"], item["kategori"]), ([], [0]))
+            if not times or ts >= times[-1]:
+                times.append(ts)
+                prefix.append(prefix[-1] + kurus)
+                continue
+            # Geriye tarihli kayıt: araya eklenir, sonraki toplamlar kaydırılır
+            i = bisect_right(times, ts)
+            times.insert(i, ts)
+            prefix.insert(i + 1, prefix[i] + kurus)
+            for j in range(i + 2, len(prefix)):
+                prefix[j] += kurus
+
+    def __len__(self):
+        return sum(len(times) for times, _ in self._series.values())
+
+    # [start, end) epoch aralığındaki kuruş toplamları: {(tip, kategori): kuruş}.
+    # Aralıkta kaydı olmayan gruplar dönmez.
+    def totals_between(self, start, end):
+        result = {}
+        for key, (times, prefix) in self._series.items():
+            lo = bisect_left(times, start)
+            hi = bisect_left(times, end)
+            if hi > lo:
+                result[key] = prefix[hi] - prefix[lo]
+        return result
+
+    # start_day..end_day (iki uç dahil, gün bazında) için
+    # {'Gelir': {...}, 'Gider': {...}} yapısında TL rapor
+    def report(self, start_day, end_day):
+        report = {
+            TransactionType.INCOME.value: {},
+            TransactionType.EXPENSE.value: {}
+        }
+        start = day_epoch(start_day)
+        end = day_epoch(end_day) + SECONDS_PER_DAY
+        for (t_type, cat), kurus in self.totals_between(start, end).items():
+            report.setdefault(t_type, {})[cat] = kurus / 100
+        return report
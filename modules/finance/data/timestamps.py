@@ -0,0 +1,39 @@
+import calendar
+from datetime import datetime, timedelta
+
+from .constants import DATE_FORMAT, DATETIME_FORMAT
+
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+
+
+# Saat dilimi içermeyen datetime nesnesini epoch saniyesine çevirir.
+# "tarih" alanı yerel saatle yazıldığı için yerel saat UTC gibi yorumlanır;
+# böylece gün sınırları her zaman 86400'ün katına denk gelir ve sıralama korunur.
+def to_epoch(dt):
+    return calendar.timegm(dt.timetuple()) + dt.microsecond / 1e6
+
+
+# to_epoch işleminin tersi (saat dilimsiz datetime döner)
+def from_epoch(seconds):
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+# "GG-AA-YYYY SS:DD:ss" metnini epoch saniyesine çevirir, çözülemezse NaN
+def parse_tarih(tarih):
+    try:
+        return float(calendar.timegm(datetime.strptime(tarih, DATETIME_FORMAT).timetuple()))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(calendar.timegm(datetime.strptime(tarih.split()[0], DATE_FORMAT).timetuple()))
+    except (AttributeError, IndexError, ValueError):
+        return float("nan")
+
+
+# Kaydın zaman damgası: 'zaman' alanı varsa o, yoksa (eski kayıt) tarih metninden
+def record_timestamp(item):
+    zaman = item.get("zaman")
+    if zaman is not None:
+        return float(zaman)
+    return parse_tarih(item.get("tarih"))
@@ -1,9 +1,17 @@
-import uuid
+import functools
+import re
+import sys
+import threading
+from collections.abc import Mapping
 from datetime import datetime
 from ..exceptions.errors import InvalidAmountError, InvalidDataTypeError
+from .constants import DATE_FORMAT, DATETIME_FORMAT, TransactionType, IncomeCategory, ExpenseCategory
+from .timestamps import SECONDS_PER_DAY, to_epoch, from_epoch
+from .ids import new_transaction_id
+from .money import to_kurus, to_tl
 
 class Transaction:
-    def __init__(self, t_type, category, amount, description=""):
+    def __init__(self, t_type, category, amount, description="", athlete_id=None):
         # 1. KONTROL: Veri Tipi float/int mi?
         if not isinstance(amount, (int, float)):
         
@@ -14,19 +22,273 @@ class Transaction:
             raise InvalidAmountError(amount)
 
         # Veri temizse atamaları yap
-        self.transaction_id = str(uuid.uuid4())[:8]
-        self.timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        now = datetime.now()
+        # Zaman sıralı, çakışmaya dayanıklı kimlik (bkz. ids.py); eski kayıtların
+        # 8 haneli kimlikleri olduğu gibi geçerlidir
+        self.transaction_id = new_transaction_id()
+        self.timestamp = now.strftime(DATETIME_FORMAT)
+        # Sıralanabilir sayısal zaman damgası (saniye, bkz. timestamps.to_epoch)
+        self.epoch = int(to_epoch(now))
         self.type = t_type
         self.category = category
-        self.amount = float(amount)
+        # Tutar içeride tam sayı kuruş tutulur; 'tutar' alanı bundan türetilir
+        self.amount_kurus = to_kurus(amount)
+        if self.amount_kurus <= 0:
+            raise InvalidAmountError(amount)
+        self.amount = to_tl(self.amount_kurus)
         self.description = description if description else "Açıklama yok"
+        # İşlemin ilgili olduğu sporcu/personel (opsiyonel)
+        self.athlete_id = str(athlete_id) if athlete_id not in (None, "") else None
 
     def to_dict(self):
-        return {
+        record = {
             "id": self.transaction_id,
             "tarih": self.timestamp,
+            "zaman": self.epoch,
             "tip": self.type,
             "kategori": self.category,
             "tutar": self.amount,
+            "tutar_kurus": self.amount_kurus,
             "aciklama": self.description
-        }
\ No newline at end of file
+        }
+        if self.athlete_id is not None:
+            record["sporcu_id"] = self.athlete_id
+        return record
+
+    def to_compact(self):
+        return CompactTransaction.from_dict(self.to_dict())
+
+
+# Kayıt yokluğunu None değerinden ayıran işaret
+_ABSENT = object()
+# 'tarih' metni 'zaman' alanından birebir üretilebiliyorsa saklanmaz
+_FROM_ZAMAN = object()
+
+# Kayıt alanları bu sırayla döner; diğer alanlar (bordro_no vb.) sonra gelir
+COMPACT_FIELDS = ("id", "tarih", "zaman", "tip", "kategori", "tutar", "tutar_kurus", "aciklama", "sporcu_id")
+
+_ID_RE = re.compile(r"[0-9a-f]{8}")
+_MAX_EPOCH = 253402300800   # 01-01-10000
+
+# Tip/kategori kod tabloları enum sırasıyla başlar, bilinmeyen değerler sona eklenir
+_TYPE_TABLE = [t.value for t in TransactionType]
+_CATEGORY_TABLE = [c.value for c in IncomeCategory] + [c.value for c in ExpenseCategory]
+_TYPE_CODES = {v: i for i, v in enumerate(_TYPE_TABLE)}
+_CATEGORY_CODES = {v: i for i, v in enumerate(_CATEGORY_TABLE)}
+_CODE_LOCK = threading.Lock()
+_intern = sys.intern
+
+
+# 'zaman' için "GG-AA-YYYY SS:DD:ss" metni; gün kısmı önbellekten gelir
+# (strftime'a göre belirgin hızlı, kayıt yüklerken her satırda çağrılır)
+@functools.lru_cache(maxsize=8192)
+def _day_text(day):
+    return from_epoch(day * SECONDS_PER_DAY).strftime(DATE_FORMAT)
+
+
+def _tarih_text(zaman):
+    day, seconds = divmod(zaman, SECONDS_PER_DAY)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{_day_text(day)} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _code(table, codes, value):
+    code = codes.get(value)
+    if code is None:
+        with _CODE_LOCK:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(table)
+                table.append(value)
+    return code
+
+
+# Bellekte az yer kaplayan, salt okunur işlem kaydı
+class CompactTransaction(Mapping):
+    """
+    Defter kaydının sözlük yerine __slots__ ile tutulan hali; okuma tarafında
+    salt okunur bir sözlük gibi davranır (item["tutar"], .get, dict(item)).
+    Tip ve kategori küçük tam sayı kodları, tutar (ve 'tutar_kurus') tek bir
+    tam sayı kuruş, 8 haneli onaltılık ID tam sayı olarak saklanır; 'tarih'
+    metni 'zaman' alanından birebir üretilebiliyorsa ayrıca tutulmaz,
+    açıklamalar paylaşılır (intern).
+    Bu kalıplara uymayan değerler (örn. tam sayı tutar, 3 haneli kuruş,
+    bordro_no gibi ek alanlar) olduğu gibi '_extra' sözlüğünde kalır; to_dict()
+    her zaman kaydın orijinal değerlerini döner.
+    """
+    __slots__ = ("_id", "_tarih", "_zaman", "_tip", "_kategori", "_kurus", "_kurus_field",
+                 "_aciklama", "_sporcu_id", "_extra")
+
+    @classmethod
+    def from_dict(cls, record):
+        self = cls.__new__(cls)
+        extra = None
+        get = record.get
+
+        value = get("id", _ABSENT)
+        if type(value) is str and _ID_RE.fullmatch(value):
+            self._id = int(value, 16)
+        elif value is _ABSENT or type(value) is str:
+            self._id = value
+        else:
+            self._id = _ABSENT
+            extra = {"id": value}
+
+        zaman = get("zaman", _ABSENT)
+        if type(zaman) is not int and zaman is not _ABSENT:
+            extra = extra or {}
+            extra["zaman"] = zaman
+            zaman = _ABSENT
+        self._zaman = zaman
+
+        value = get("tarih", _ABSENT)
+        if type(value) is str and len(value) == 19 and zaman is not _ABSENT \
+                and 0 <= zaman < _MAX_EPOCH and _tarih_text(zaman) == value:
+            self._tarih = _FROM_ZAMAN
+        elif value is _ABSENT or type(value) is str:
+            self._tarih = value
+        else:
+            self._tarih = _ABSENT
+            extra = extra or {}
+            extra["tarih"] = value
+
+        value = get("tip", _ABSENT)
+        if type(value) is str:
+            code = _TYPE_CODES.get(value)
+            self._tip = code if code is not None else _code(_TYPE_TABLE, _TYPE_CODES, value)
+        else:
+            self._tip = _ABSENT
+            if value is not _ABSENT:
+                extra = extra or {}
+                extra["tip"] = value
+
+        value = get("kategori", _ABSENT)
+        if type(value) is str:
+            code = _CATEGORY_CODES.get(value)
+            self._kategori = code if code is not None else _code(_CATEGORY_TABLE, _CATEGORY_CODES, value)
+        else:
+            self._kategori = _ABSENT
+            if value is not _ABSENT:
+                extra = extra or {}
+                extra["kategori"] = value
+
+        # Kuruşa çevrilip geri dönüşte aynı float'ı veren tutarlar sıkıştırılır
+        value = get("tutar", _ABSENT)
+        self._kurus = _ABSENT
+        if type(value) is float and value == value and abs(value) < 1e13:
+            kurus = round(value * 100)
+            if kurus / 100 == value:
+                self._kurus = kurus
+        if self._kurus is _ABSENT and value is not _ABSENT:
+            extra = extra or {}
+            extra["tutar"] = value
+        # 'tutar_kurus' tutarla tutarlıysa ayrıca saklanmaz, sadece varlığı işaretlenir
+        value = get("tutar_kurus", _ABSENT)
+        self._kurus_field = value is not _ABSENT and type(value) is int and value == self._kurus
+        if value is not _ABSENT and not self._kurus_field:
+            extra = extra or {}
+            extra["tutar_kurus"] = value
+
+        value = get("aciklama", _ABSENT)
+        if type(value) is str:
+            value = _intern(value)
+        elif value is not _ABSENT and value is not None:
+            extra = extra or {}
+            extra["aciklama"] = value
+            value = _ABSENT
+        self._aciklama = value
+
+        value = get("sporcu_id", _ABSENT)
+        if type(value) is str:
+            value = _intern(value)
+        elif value is not _ABSENT and value is not None:
+            extra = extra or {}
+            extra["sporcu_id"] = value
+            value = _ABSENT
+        self._sporcu_id = value
+
+        for key in record:
+            if key not in _FIELD_SET:
+                extra = extra or {}
+                extra[key] = record[key]
+        self._extra = extra
+        return self
+
+    # Slot değerini orijinal alan değerine çevirir (alan yoksa _ABSENT)
+    def _value(self, key):
+        if key == "tutar":
+            kurus = self._kurus
+            if kurus is not _ABSENT:
+                return kurus / 100
+        elif key == "tutar_kurus":
+            if self._kurus_field:
+                return self._kurus
+        elif key == "tip":
+            if self._tip is not _ABSENT:
+                return _TYPE_TABLE[self._tip]
+        elif key == "kategori":
+            if self._kategori is not _ABSENT:
+                return _CATEGORY_TABLE[self._kategori]
+        elif key == "zaman":
+            if self._zaman is not _ABSENT:
+                return self._zaman
+        elif key == "id":
+            value = self._id
+            if type(value) is int:
+                return f"{value:08x}"
+            if value is not _ABSENT:
+                return value
+        elif key == "tarih":
+            value = self._tarih
+            if value is _FROM_ZAMAN:
+                return _tarih_text(self._zaman)
+            if value is not _ABSENT:
+                return value
+        elif key == "aciklama":
+            if self._aciklama is not _ABSENT:
+                return self._aciklama
+        elif key == "sporcu_id":
+            if self._sporcu_id is not _ABSENT:
+                return self._sporcu_id
+        if self._extra is not None:
+            return self._extra.get(key, _ABSENT)
+        return _ABSENT
+
+    def __getitem__(self, key):
+        value = self._value(key)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._value(key)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key):
+        return self._value(key) is not _ABSENT
+
+    def __iter__(self):
+        for key in COMPACT_FIELDS:
+            if self._value(key) is not _ABSENT:
+                yield key
+        if self._extra:
+            for key in self._extra:
+                if key not in _FIELD_SET:
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CompactTransaction({self.to_dict()!r})"
+
+    def to_dict(self):
+        return {key: self._value(key) for key in self}
+
+    # Pickle/deepcopy için slot değerleri yerine sözlük hali taşınır
+    def __reduce__(self):
+        return (CompactTransaction.from_dict, (self.to_dict(),))
+
+
+_FIELD_SET = frozenset(COMPACT_FIELDS)
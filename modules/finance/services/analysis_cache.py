@@ -0,0 +1,111 @@
+import copy
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+
+
+# Sonucun bellekteki yaklaşık boyutu (iç içe sözlük/liste dahil, bayt)
+def estimate_size(obj):
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v) for v in obj)
+    return size
+
+
+# Analiz sonuçları için sürüm damgalı, boyut sınırlı LRU önbellek
+class AnalysisCache:
+    """
+    Anahtar: (metot adı, argümanlar, defter sürümü). Defter sürümü
+    repository'nin önbellek imzasıdır; FinanceManager (veya başka bir süreç)
+    deftere yazdığında değişir. Sürüm değiştiğinde eski sonuçların hepsi
+    atılır. Girdi sayısı veya toplam boyut sınırı aşılırsa en uzun süredir
+    kullanılmayan sonuç çıkarılır.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # anahtar -> (sonuç, boyut)
+        self._version = None
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Önbellekteki sonucun kopyasını döner, yoksa compute() ile hesaplar
+    def get_or_compute(self, key, version, compute):
+        with self._lock:
+            if version != self._version:
+                self._drop_all()
+                self._version = version
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(cached[0])
+            self.misses += 1
+
+        result = compute()
+        size = estimate_size(result)
+        with self._lock:
+            # Hesaplama sırasında sürüm değiştiyse sonuç saklanmaz
+            if version == self._version and size <= self.max_bytes:
+                self._store(key, result, size)
+        return copy.deepcopy(result)
+
+    def _store(self, key, result, size):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _drop_all(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def clear(self):
+        with self._lock:
+            self._drop_all()
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+            }
+
+
+def cached_analysis(relative_to_today=False):
+    """
+    Analiz metotlarını önbelleğe bağlayan dekoratör. Metodun sahibi
+    'analysis_cache' (AnalysisCache) ve 'repo' özelliklerine sahip olmalıdır.
+    relative_to_today: sonuç bugünün tarihine bağlıysa (örn. son 7 gün)
+    anahtara günün tarihi de eklenir.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            if relative_to_today:
+                key += (date.today(),)
+            return self.analysis_cache.get_or_compute(
+                key, self.repo.version(), lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -1,5 +1,13 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from ..data import FinanceRepository, TransactionType
+from ..data.columnar import ColumnarLedger
+from ..data.aggregates import AggregateStore
+from ..data.athlete_index import AthleteIndex
+from ..data.time_index import TimeIndex
+from ..data.balance_index import BalanceIndex
+from ..data.money import record_kurus, to_tl
+from .analysis_cache import AnalysisCache, cached_analysis
+from .report_builder import ReportBuilder, TopN
 
 # Finansal verileri analiz ederek raporlar üreten servis sınıfı
 class FinancialAnalyzer:
@@ -7,10 +15,22 @@ class FinancialAnalyzer:
     # Raporlama dili (Varsayılan Türkçe)
     __report_language = "TR"
 
-    def __init__(self):
-        self.repo = FinanceRepository()
-        # Analiz sonuçlarını geçici olarak hafızada tutmak için (Encapsulation)
-        self.__analysis_cache = {}
+    def __init__(self, repo=None):
+        # Farklı bir depolama modu (örn. JournalFinanceRepository) dışarıdan verilebilir
+        self.repo = repo if repo is not None else FinanceRepository()
+        # Özet toplamları (FinanceManager ile aynı dosyayı paylaşır)
+        self.aggregates = AggregateStore(self.repo)
+        # Analiz sonuçlarını hafızada tutmak için (Encapsulation); defter
+        # sürümü değişince (yazma olunca) sonuçlar kendiliğinden geçersizleşir
+        self.__analysis_cache = AnalysisCache()
+
+    @property
+    def analysis_cache(self):
+        return self.__analysis_cache
+
+    # Sonuç önbelleğinin isabet oranı, girdi sayısı ve boyutu
+    def cache_stats(self):
+        return self.__analysis_cache.stats()
 
     # (Rapor dili değiştirme)
     @classmethod
@@ -29,12 +49,12 @@ class FinancialAnalyzer:
             return False
 
     # Haftalık, Aylık, Yıllık Gelir/Gider Hesabı (Kategori Bazlı)
+    @cached_analysis(relative_to_today=True)
     def analyze_by_period(self, period_type="month"):
         """
         period_type: 'week', 'month', 'year' olabilir.
         Dönüş: {'Gelir': {'Sponsor': 500}, 'Gider': {'Maaş': 1000}}
         """
-        all_data = self.repo.load_all()
         now = datetime.now()
         
         # Tarih aralığını belirle
@@ -47,54 +67,143 @@ class FinancialAnalyzer:
         else:
             return {} # Geçersiz periyot
 
-        # Sonuçları tutacak sözlük yapısı
-        report = {
-            TransactionType.INCOME.value: {},
-            TransactionType.EXPENSE.value: {}
-        }
-        
-        for item in all_data:
-            # Tarih kontrolü 
-            if self.is_date_in_range(item["tarih"], start_date, now):
-                t_type = item["tip"]
-                cat = item["kategori"]
-                amount = item["tutar"]
-                
-                # İlgili kategorinin toplamını güncelle
-                if cat in report[t_type]:
-                    report[t_type][cat] += amount
-                else:
-                    report[t_type][cat] = amount
-        
-        self.__analysis_cache[f"period_{period_type}"] = report
+        if self.repo.supports_range_reads:
+            # Parçalı/SQLite depoda sadece ilgili dönemin kayıtları okunur
+            columns = ColumnarLedger.from_records(self.repo.load_between(start_date, now))
+            report = columns.period_report(start_date, now)
+        else:
+            # Gün başı sayılır: saatli başlangıç, ertesi günden itibaren demektir
+            first_day = start_date.date()
+            if start_date != datetime.combine(first_day, datetime.min.time()):
+                first_day += timedelta(days=1)
+            report = self.analyze_range(first_day, now)
         return report
 
+    # --- TARİH ARALIĞI ANALİZLERİ (sıralı zaman indeksi ile) ---
+
+    # İki tarih arasındaki (iki uç dahil, gün bazında) kategori toplamları
+    @cached_analysis()
+    def analyze_range(self, start_date, end_date):
+        return self._time_index().report(start_date, end_date)
+
+    # Takvim ayı raporu (örn. 2025, 3 -> 01.03.2025 - 31.03.2025)
+    @cached_analysis()
+    def analyze_month(self, year, month):
+        start, end = self._month_bounds(year, month)
+        return self.analyze_range(start, end)
+
+    # Takvim çeyreği raporu (quarter: 1-4)
+    @cached_analysis()
+    def analyze_quarter(self, year, quarter):
+        if quarter not in (1, 2, 3, 4):
+            return {}
+        first_month = 3 * (quarter - 1) + 1
+        start, _ = self._month_bounds(year, first_month)
+        _, end = self._month_bounds(year, first_month + 2)
+        return self.analyze_range(start, end)
+
+    @cached_analysis(relative_to_today=True)
+    def rolling_sum(self, window_days=30, end_date=None, days=30):
+        """
+        Kayan pencere toplamı: son 'days' günün her biri için, o güne kadarki
+        'window_days' günlük kategori toplamları.
+        Dönüş: [(gün, {'Gelir': {...}, 'Gider': {...}}), ...] (eskiden yeniye)
+        """
+        index = self._time_index()
+        end_date = end_date or datetime.now()
+        last_day = end_date.date() if isinstance(end_date, datetime) else end_date
+        series = []
+        for offset in range(days - 1, -1, -1):
+            day = last_day - timedelta(days=offset)
+            series.append((day, index.report(day - timedelta(days=window_days - 1), day)))
+        return series
+
+    # Verilen günün sonundaki kasa bakiyesi (o güne kadarki tüm gelirler - giderler, TL)
+    def balance_at(self, day):
+        day = day.date() if isinstance(day, datetime) else day
+        return to_tl(self._balances().balance_at(day))
+
+    def balance_series(self, end_date=None, days=365):
+        """
+        Bakiye eğrisi: 'end_date' ile biten 'days' günün her birinin sonundaki bakiye.
+        Dönüş: [(gün, bakiye TL), ...] (eskiden yeniye)
+        """
+        end_date = end_date or datetime.now()
+        last_day = end_date.date() if isinstance(end_date, datetime) else end_date
+        first_day = last_day - timedelta(days=days - 1)
+        balances = self._balances().balance_series(first_day, last_day)
+        start = first_day.toordinal()
+        return [(date.fromordinal(start + i), to_tl(kurus)) for i, kurus in enumerate(balances)]
+
+    # Aydan aya karşılaştırma: verilen ay ile bir önceki ay
+    @cached_analysis()
+    def compare_month_over_month(self, year, month):
+        prev_year, prev_month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return self._compare(self.analyze_month(prev_year, prev_month), self.analyze_month(year, month))
+
+    # Yıldan yıla karşılaştırma: verilen ay (veya tüm yıl) ile geçen yılın aynı dönemi
+    @cached_analysis()
+    def compare_year_over_year(self, year, month=None):
+        if month is None:
+            previous = self.analyze_range(datetime(year - 1, 1, 1), datetime(year - 1, 12, 31))
+            current = self.analyze_range(datetime(year, 1, 1), datetime(year, 12, 31))
+        else:
+            previous = self.analyze_month(year - 1, month)
+            current = self.analyze_month(year, month)
+        return self._compare(previous, current)
+
+    # İki raporu kategori bazında karşılaştırır:
+    # {'Gelir': {'Sponsor': {'onceki', 'simdiki', 'fark', 'oran'}}}; oran yüzde, önceki 0 ise None
+    @staticmethod
+    def _compare(previous, current):
+        result = {}
+        for t_type in set(previous) | set(current):
+            prev_cats, cur_cats = previous.get(t_type, {}), current.get(t_type, {})
+            rows = result.setdefault(t_type, {})
+            for cat in set(prev_cats) | set(cur_cats):
+                before, now = prev_cats.get(cat, 0.0), cur_cats.get(cat, 0.0)
+                rows[cat] = {
+                    "onceki": before,
+                    "simdiki": now,
+                    "fark": round(now - before, 2),
+                    "oran": round((now - before) / before * 100, 2) if before else None,
+                }
+        return result
+
+    @staticmethod
+    def _month_bounds(year, month):
+        start = datetime(year, month, 1)
+        next_month = datetime(year + (month == 12), month % 12 + 1, 1)
+        return start, next_month - timedelta(days=1)
+
     # Oyuncu Bazlı Toplam Maliyet Hesabı (ID ile Arama)
+    @cached_analysis()
     def calculate_athlete_total_cost(self, athlete_id):
         """
         Belirli bir sporcuya (ID'sine göre) yapılan tüm harcamaları hesaplar.
-        Not: Açıklama kısmında ID geçiyorsa o kişiye ait sayar.
+        Kayıtlar 'sporcu_id' alanından, bu alan olmayan eski kayıtlarda ise
+        açıklamada kelime olarak geçen ID'den bulunur (sporcu indeksi ile).
         """
-        all_data = self.repo.load_all()
-        total_cost = 0.0
-        details = []
-
-        for item in all_data:
-            # Sadece giderlere bakıyoruz
-            if item["tip"] == TransactionType.EXPENSE.value:
-                # Açıklama içinde ID geçiyor mu kontrolü (Arama mantığı)
-                if athlete_id in item["aciklama"]:
-                    total_cost += item["tutar"]
-                    details.append(item)
-        
+        details = [item.to_dict() for item in self._athletes().records_for(athlete_id)]
+        total_kurus = sum(record_kurus(item) for item in details)
+
         return {
             "athlete_id": athlete_id,
-            "total_cost": total_cost,
+            "total_cost": to_tl(total_kurus),
             "transaction_count": len(details),
             "transactions": details
         }
 
+    # Tüm sporcuların maliyet özeti (sadece 'sporcu_id' alanı olan kayıtlar)
+    @cached_analysis()
+    def calculate_all_athletes_cost(self):
+        return {
+            athlete_id: {"total_cost": total, "transaction_count": count}
+            for athlete_id, (total, count) in self._athletes().totals().items()
+        }
+
     # Bütçe Açığı veya Kâr Durumu (Genel)
+    @cached_analysis()
     def get_budget_status(self):
         summary = self._calculate_totals() # Private yardımcı metod
         balance = summary["balance"]
@@ -111,24 +220,59 @@ class FinancialAnalyzer:
             "detay": summary
         }
 
+    # --- TEK TARAMALI RAPORLAR ---
+
+    # İstenen toplamaları (bkz. ReportBuilder) defterin tek taramasında hesaplar
+    def build_report(self, aggregates):
+        return ReportBuilder(aggregates).run(self.repo.iter_records())
+
+    @cached_analysis(relative_to_today=True)
+    def dashboard(self, period_days=30, top_n=5):
+        """
+        Ana rapor ekranının tüm verisi: özet, kategori dağılımı, bütçe durumu,
+        son 'period_days' günün (bugün dahil) dönem raporu ve en büyük 'top_n'
+        gider. Alanlar ilgili tekil metotlarla aynı yapıdadır
+        (get_financial_summary, get_category_breakdown, get_budget_status,
+        analyze_range). Toplamlar özet tablolarından, dönem raporu zaman
+        indeksinden gelir; defter sadece en büyük giderler için taranır.
+        """
+        inc, exp = self.aggregates.totals_kurus()
+        today = datetime.now().date()
+        top = self.build_report([TopN(top_n, t_type=TransactionType.EXPENSE.value, name="en_buyuk_giderler")])
+        return {
+            "ozet": {"toplam_gelir": to_tl(inc), "toplam_gider": to_tl(exp), "bakiye": to_tl(inc - exp)},
+            "kategori_dagilimi": {
+                f"{t_type} - {cat}": total for (t_type, cat), total in self.aggregates.category_totals().items()
+            },
+            "butce_durumu": self.get_budget_status(),
+            "donem_raporu": self.analyze_range(today - timedelta(days=period_days - 1), today),
+            "en_buyuk_giderler": top["en_buyuk_giderler"],
+            "adet": top.scanned,
+        }
+
     # ID veya Kriter ile Gelişmiş Arama (Genel Kullanım İçin)
-    def search_transactions(self, search_term):
-        all_data = self.repo.load_all()
-        results = []
-        
-        for item in all_data:
-            # ID'de, kategoride , tarihte veya açıklamada arama yapar
-            if (search_term in item["id"] or 
-                search_term in item["kategori"] or 
-                search_term in item["tarih"] or
-                search_term in item["aciklama"]):
-                results.append(item)
-                
+    def search_transactions(self, search_term, ignore_case=False, ranked=False, page=None, page_size=20):
+        # ID'de, kategoride , tarihte veya açıklamada arama yapar.
+        # page verilirse (1'den başlar) sadece o sayfadaki kayıtlar döner
+        results = self.repo.search(search_term, ignore_case=ignore_case, ranked=ranked)
+        if page is not None:
+            start = (max(page, 1) - 1) * page_size
+            results = results[start:start + page_size]
         return results
 
     # Özel yardımcı metot (Kapsülleme örneği)
     def _calculate_totals(self):
-        data = self.repo.load_all()
-        inc = sum(t["tutar"] for t in data if t["tip"] == TransactionType.INCOME.value)
-        exp = sum(t["tutar"] for t in data if t["tip"] == TransactionType.EXPENSE.value)
-        return {"income": inc, "expense": exp, "balance": inc - exp}
\ No newline at end of file
+        inc, exp = self.aggregates.totals_kurus()
+        return {"income": to_tl(inc), "expense": to_tl(exp), "balance": to_tl(inc - exp)}
+
+    # Sporcu -> işlem indeksi (önbellekle birlikte tutulur)
+    def _athletes(self):
+        return self.repo.derived("athletes", AthleteIndex.from_records)
+
+    # Günlük net akış indeksi (önbellekle birlikte tutulur)
+    def _balances(self):
+        return self.repo.derived("balances", BalanceIndex.from_records)
+
+    # Zamana göre sıralı indeks (önbellekle birlikte tutulur)
+    def _time_index(self):
+        return self.repo.derived("time_index", TimeIndex.from_records)
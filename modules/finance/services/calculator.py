@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
+from ..data.money import to_kurus, to_kurus_array
 from ..exceptions.errors import (
     InvalidAmountError, 
     InvalidDataTypeError,
@@ -8,6 +9,25 @@ from ..exceptions.errors import (
     InvalidDateFormatError
 )
 
+# NumPy opsiyoneldir; kurulu değilse toplu hesaplar tek tek (skaler yolla) yapılır
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# round(x, 2) ile birebir aynı sonucu veren vektörel yuvarlama.
+# np.round(x*100)/100 sadece ...5 sınırına çok yakın değerlerde Python'un
+# ondalık tabanlı yuvarlamasından ayrışabilir; bu değerler tek tek düzeltilir.
+def _round2(values):
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    tolerance = np.maximum(1e-6, 4 * np.spacing(np.abs(scaled)))
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= tolerance
+    for i in np.flatnonzero(near_half):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
 # Tüm finansal hesaplayıcıların türetileceği soyut ata sınıf
 class BaseFinancialCalculator(ABC):
     
@@ -22,6 +42,27 @@ class BaseFinancialCalculator(ABC):
     def calculate(self, amount, **kwargs):
         pass
 
+    # Toplu hesap: tutar dizisi (liste veya NumPy dizisi) alır, dizi döner.
+    # Alt sınıflar NumPy varsa vektörel sürümü uygular; bu varsayılan sürüm
+    # her tutarı calculate() ile tek tek hesaplar.
+    def calculate_batch(self, amounts, **kwargs):
+        results = [self.calculate(a, **kwargs) for a in self._scalar_values(amounts)]
+        return np.array(results, dtype=np.float64) if np is not None else results
+
+    # Sonuçların yuvarlama noktası: hesaplayıcılar TL'yi 2 haneye yuvarlar,
+    # deftere ve toplamlara giden değer bu yuvarlanmış sonucun tam sayı kuruşudur
+    def calculate_kurus(self, amount, **kwargs):
+        return to_kurus(self.calculate(amount, **kwargs))
+
+    # calculate_batch sonucunun int64 kuruş dizisi (NumPy yoksa liste)
+    def calculate_batch_kurus(self, amounts, **kwargs):
+        return to_kurus_array(self.calculate_batch(amounts, **kwargs))
+
+    # NumPy skalerlerini (np.float64 vb.) Python sayılarına çevirir
+    @staticmethod
+    def _scalar_values(values):
+        return [v.item() if np is not None and isinstance(v, np.generic) else v for v in values]
+
     # Class Method (Para birimi okuma)
     @classmethod
     def get_currency(cls):
@@ -53,6 +94,25 @@ class BaseFinancialCalculator(ABC):
             
         return float(value)
 
+    # Static Method (Toplu Tutar Validasyonu)
+    # Dizinin tamamı tek seferde kontrol edilir; hata ilk geçersiz değer ile bildirilir
+    @staticmethod
+    def validate_amounts(values):
+        if np is None:
+            return [BaseFinancialCalculator.validate_amount(v) for v in values]
+
+        arr = np.atleast_1d(np.asarray(values))
+        if arr.dtype.kind not in "biuf":
+            # Karışık tipli dizide hatalı elemanın tipi raporlanır
+            for v in arr.ravel():
+                BaseFinancialCalculator.validate_amount(v.item() if isinstance(v, np.generic) else v)
+            raise InvalidDataTypeError("Sayı (int/float)", arr.dtype.name)
+        arr = arr.astype(np.float64)
+        negative = arr < 0
+        if negative.any():
+            raise InvalidAmountError(float(arr[np.argmax(negative)]))
+        return arr
+
 # Üyelik Aidatı Gecikme Hesaplayıcısı
 class LateFeeCalculator(BaseFinancialCalculator):
     
@@ -117,6 +177,25 @@ class LateFeeCalculator(BaseFinancialCalculator):
         interest = valid_amount * active_rate * days
         return round(valid_amount + interest, 2)
 
+    # Toplu gecikme hesabı; days_late tek sayı veya tutarlarla aynı boyda dizi olabilir
+    def calculate_batch(self, base_amounts, **kwargs):
+        days = kwargs.get('days_late', 0)
+        if np is None:
+            if isinstance(days, (list, tuple)):
+                return [self.calculate(a, days_late=d) for a, d in zip(base_amounts, days)]
+            return super().calculate_batch(base_amounts, **kwargs)
+
+        amounts = self.validate_amounts(base_amounts)
+        days = np.asarray(days)
+        if days.dtype.kind not in "biu":
+            raise InvalidDataTypeError("Gün Sayısı (int)", days.dtype.name)
+        days = np.broadcast_to(days, amounts.shape).astype(np.float64)
+
+        # Gecikme 6 ayı geçtiğinde ceza faizi uygulanır
+        rates = np.where(days > 180, self.__penalty_rate, self.__daily_rate)
+        totals = _round2(amounts + amounts * rates * days)
+        return np.where(days <= 0, amounts, totals)
+
     # Static Method: Tarih farkı hesabı (Hata Kontrollü)
     @staticmethod
     def calculate_days_overdue(due_date_str):
@@ -128,6 +207,34 @@ class LateFeeCalculator(BaseFinancialCalculator):
            #Tarih farkı hatalı gelirse hata döndürür
             raise InvalidDateFormatError(due_date_str)
 
+    # Toplu gecikme günü hesabı. Vadeler genelde az sayıda farklı tarihte
+    # toplandığı için her farklı tarih metni bir kez çözülür, sonuç tüm
+    # diziye dağıtılır. today verilmezse bugünün tarihi kullanılır.
+    @staticmethod
+    def calculate_days_overdue_batch(due_date_strs, today=None):
+        if today is None:
+            today = datetime.now()
+        if isinstance(today, datetime):
+            today = today.date()
+        ordinal = today.toordinal()
+
+        def days_for(due_date_str):
+            try:
+                return max(0, ordinal - datetime.strptime(due_date_str, "%d-%m-%Y").toordinal())
+            except (TypeError, ValueError):
+                raise InvalidDateFormatError(due_date_str)
+
+        if np is None:
+            cache = {}
+            return [cache[d] if d in cache else cache.setdefault(d, days_for(d)) for d in due_date_strs]
+
+        due = np.asarray(due_date_strs)
+        if due.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        unique, inverse = np.unique(due, return_inverse=True)
+        unique_days = np.array([days_for(str(d)) for d in unique], dtype=np.int64)
+        return unique_days[inverse.reshape(due.shape)]
+
     @classmethod
     def create_strict_calculator(cls):
         return cls(daily_rate=0.010, penalty_rate=0.050)
@@ -155,6 +262,12 @@ class TaxDeductionCalculator(BaseFinancialCalculator):
         tax_amount = valid_amount * self.__tax_rate
         return round(valid_amount - tax_amount, 2)
 
+    def calculate_batch(self, gross_amounts, **kwargs):
+        if np is None:
+            return super().calculate_batch(gross_amounts, **kwargs)
+        amounts = self.validate_amounts(gross_amounts)
+        return _round2(amounts - amounts * self.__tax_rate)
+
     @staticmethod
     def get_tax_bracket_info(amount):
         if amount > 100000:
@@ -183,6 +296,14 @@ class SalaryCalculator(BaseFinancialCalculator):
         
         return round(valid_salary - (insurance + income_tax), 2)
 
+    def calculate_batch(self, gross_salaries, **kwargs):
+        if np is None:
+            return super().calculate_batch(gross_salaries, **kwargs)
+        salaries = self.validate_amounts(gross_salaries)
+        insurance = salaries * self.__insurance_rate
+        income_tax = (salaries - insurance) * self.__income_tax_rate
+        return _round2(salaries - (insurance + income_tax))
+
     @staticmethod
     def estimate_annual_cost(monthly_gross):
         try:
@@ -0,0 +1,172 @@
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from ..data import Transaction, TransactionType, IncomeCategory
+from ..data.dues_db import DUE_OPEN
+from ..data.json_db_rules import FinanceRules
+from ..data.money import to_kurus, to_kurus_array, to_tl
+from ..exceptions.errors import DataStorageError, FinanceError
+from .calculator import LateFeeCalculator
+
+# NumPy opsiyoneldir; yoksa faiz farkları tek tek kontrol edilir
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Açık aidatların gecikme faizlerini toplu hesaplayıp deftere işleyen motor
+class DuesAssessment:
+    """
+    Tüm açık aidatların gecikme günleri ve kademeli faizleri (LateFeeCalculator,
+    180 gün sonrası ceza oranı) tek vektörel geçişte hesaplanır. Her aidatın
+    şimdiye kadar işlenmiş faizi 'tahakkuk_faiz' alanında tutulur; her gece
+    sadece yeni oluşan fark 'Üyelik Aidatı' geliri olarak tek yazmada işlenir.
+    Deftere yazılan her kayıt 'aidat_no' ve 'tahakkuk_no' alanlarını taşır;
+    yarıda kalan bir değerlendirme bir sonraki çalıştırmada defterden
+    tamamlanır, aynı fark iki kez işlenmez. İşlenecek her fark
+    FinanceRules.check_business_limits'ten geçer; geçemeyen aidat işlenmeden
+    bırakılır ve 'rejected' listesinde sebebiyle döner.
+    """
+
+    def __init__(self, dues_repo, finance_repo, calculator=None, commit=None, rules=None):
+        self.dues_repo = dues_repo
+        self.finance_repo = finance_repo
+        self.calculator = calculator or LateFeeCalculator()
+        self.rules = rules or FinanceRules()
+        # commit verilmezse kayıtlar doğrudan finance_repo.save_records ile yazılır
+        self.commit = commit
+
+    # Kontrol noktası dosyası aidat defterinin yanında tutulur
+    @property
+    def checkpoint_path(self):
+        return self.dues_repo.file_path + ".assessment.json"
+
+    # Aynı anda başlayan çalıştırmalar çakışmasın diye rastgele ek taşır
+    @staticmethod
+    def new_run_id(today):
+        return f"TAHAKKUK-{today.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:4]}"
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"devam": None, "son": None}
+        except (OSError, json.JSONDecodeError) as e:
+            raise DataStorageError(self.checkpoint_path, f"Kontrol noktası okunamadı: {str(e)}")
+
+    def _save_checkpoint(self, checkpoint):
+        tmp_path = self.checkpoint_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError as e:
+            raise DataStorageError(self.checkpoint_path, f"Kontrol noktası yazılamadı: {str(e)}")
+
+    # Yarıda kalan çalıştırmada deftere işlenmiş faizleri aidat kayıtlarına geri yazar
+    def _recover(self, dues, run_id):
+        posted = {
+            item["aidat_no"]: item["tahakkuk_toplam"]
+            for item in self.finance_repo.iter_records()
+            if item.get("tahakkuk_no") == run_id
+        }
+        for due in dues:
+            if due["id"] in posted:
+                due["tahakkuk_faiz"] = posted[due["id"]]
+        return len(posted)
+
+    def assess(self, today=None):
+        """
+        Dönüş: run_id, assessed_count (değerlendirilen açık aidat),
+        posted_count, total_posted, rejected ([(aidat_no, sebep)]),
+        elapsed (sn) ve throughput (aidat/sn).
+        """
+        started = time.perf_counter()
+        today = today or datetime.now()
+        run_id = self.new_run_id(today)
+
+        dues = self.dues_repo.load_all()
+        checkpoint = self.load_checkpoint()
+        if checkpoint.get("devam"):
+            self._recover(dues, checkpoint["devam"])
+            self.dues_repo.save_all(dues)
+            checkpoint["devam"] = None
+            self._save_checkpoint(checkpoint)
+
+        open_dues = [d for d in dues if d.get("durum") == DUE_OPEN]
+        amounts = [d["tutar"] for d in open_dues]
+        days = self.calculator.calculate_days_overdue_batch([d["son_odeme"] for d in open_dues], today)
+        # Faiz farkları tam sayı kuruşla hesaplanır (yuvarlama hesaplayıcıda, bir kez)
+        totals = self.calculator.calculate_batch_kurus(amounts, days_late=days) if open_dues else []
+        assessed = [d.get("tahakkuk_faiz", 0.0) for d in open_dues]
+
+        # Sadece işlenmiş faizden büyük olanlar (vektörel ön eleme)
+        if np is not None and open_dues:
+            fees = totals - to_kurus_array(amounts)
+            deltas = fees - to_kurus_array(assessed)
+            candidates = np.flatnonzero(deltas > 0).tolist()
+            days, fees, deltas = days.tolist(), fees.tolist(), deltas.tolist()
+        else:
+            fees = [total - to_kurus(amount) for total, amount in zip(totals, amounts)]
+            deltas = [fee - to_kurus(done) for fee, done in zip(fees, assessed)]
+            candidates = range(len(open_dues))
+
+        records = []
+        rejected = []
+        for i in candidates:
+            due = open_dues[i]
+            if deltas[i] <= 0:
+                continue
+            amount = to_tl(deltas[i])
+            try:
+                self.rules.check_business_limits(amount)
+            except FinanceError as e:
+                rejected.append((due["id"], e.message))
+                continue
+            record = Transaction(
+                t_type=TransactionType.INCOME.value,
+                category=IncomeCategory.MEMBERSHIP_FEE.value,
+                amount=amount,
+                description=f"Gecikme Faizi: {due['uye_id']} ({due['donem']}, {days[i]} gün)"
+            ).to_dict()
+            record["aidat_no"] = due["id"]
+            record["tahakkuk_no"] = run_id
+            record["tahakkuk_toplam"] = to_tl(fees[i])
+            records.append((due, record))
+
+        # Defter yazılmadan önce çalıştırma "devam" olarak işaretlenir
+        checkpoint["devam"] = run_id
+        self._save_checkpoint(checkpoint)
+        if records:
+            (self.commit or self.finance_repo.save_records)([r for _, r in records])
+            for due, record in records:
+                due["tahakkuk_faiz"] = record["tahakkuk_toplam"]
+            self.dues_repo.save_all(dues)
+
+        elapsed = time.perf_counter() - started
+        total_posted = round(sum(r["tutar"] for _, r in records), 2)
+        checkpoint["devam"] = None
+        checkpoint["son"] = {
+            "run_id": run_id,
+            "aidat": len(open_dues),
+            "islenen": len(records),
+            "reddedilen": len(rejected),
+            "toplam": total_posted,
+            "sure_sn": round(elapsed, 4),
+        }
+        self._save_checkpoint(checkpoint)
+
+        return {
+            "run_id": run_id,
+            "assessed_count": len(open_dues),
+            "posted_count": len(records),
+            "total_posted": total_posted,
+            "rejected": rejected,
+            "elapsed": elapsed,
+            "throughput": len(open_dues) / elapsed if elapsed > 0 else float(len(open_dues)),
+        }
@@ -0,0 +1,306 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
+from ..data import timestamps
+from ..data.json_db import FinanceRepository
+from ..data.journal_db import JournalFinanceRepository
+from ..data.sqlite_db import SqliteFinanceRepository
+from ..data.sharded_db import ShardedFinanceRepository
+from ..data.ledger_cache import LedgerCache
+from ..exceptions.errors import DataStorageError
+
+# Gecikme histogramının üst sınırları (saniye); son kova sınırsızdır
+BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+# Repository G/Ç metotları. Okuma metotlarında dönen satırlar sayılır,
+# tam okumalarda (önbellek dışı) deponun dosya boyutu okunan bayt sayılır.
+REPO_CLASSES = (FinanceRepository, JournalFinanceRepository, SqliteFinanceRepository, ShardedFinanceRepository)
+REPO_READS = ("load_all", "iter_records", "load_between", "search", "find_by_id", "find_all_by_id")
+REPO_FULL_READS = ("_read_records", "_stream_records")
+REPO_WRITES = ("save_record", "save_records", "_save_to_file", "delete_record", "update_record")
+# Ham yazma metotları -> argümanlardan yazılan satır sayısı. '_write_file'
+# dosyayı baştan yazar, diğerleri sona ekler (yazılan bayt farklı hesaplanır).
+REPO_RAW_WRITES = {
+    "_write_file": lambda data: len(data),
+    "_append_lines": lambda payload, count: count,
+    "_append_groups": lambda groups: sum(len(items) for items in groups.values()),
+}
+
+
+def _bucket_label(index):
+    if index < len(BUCKETS):
+        return f"<{BUCKETS[index] * 1000:g}ms"
+    return f">={BUCKETS[-1] * 1000:g}ms"
+
+
+# Bir ölçüm noktasının toplanmış değerleri
+class _Metric:
+    __slots__ = ("calls", "errors", "total", "max", "histogram", "rows", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def add(self, seconds, rows, bytes_read, bytes_written, failed):
+        self.calls += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = 0
+        while index < len(BUCKETS) and seconds >= BUCKETS[index]:
+            index += 1
+        self.histogram[index] += 1
+        self.rows += rows
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+    def to_dict(self):
+        return {
+            "cagri": self.calls,
+            "hata": self.errors,
+            "toplam_sn": self.total,
+            "ortalama_sn": self.total / self.calls if self.calls else 0.0,
+            "en_uzun_sn": self.max,
+            "histogram": {_bucket_label(i): n for i, n in enumerate(self.histogram) if n},
+            "satir": self.rows,
+            "okunan_bayt": self.bytes_read,
+            "yazilan_bayt": self.bytes_written,
+        }
+
+
+# Deponun diskteki toplam boyutu (klasör tabanlı depolarda tüm dosyalar)
+def _storage_bytes(repo):
+    path = repo.file_path
+    if os.path.isdir(path):
+        total = 0
+        for entry in os.scandir(path):
+            if entry.is_file():
+                total += entry.stat().st_size
+        return total
+    total = 0
+    for p in {path, *repo._watched_paths()}:
+        try:
+            total += os.path.getsize(p)
+        except OSError:
+            pass
+    return total
+
+
+# Dönen satır sayısı: tek kayıt (sözlük) için 1, liste için uzunluğu
+def _row_count(result):
+    if result is None:
+        return 0
+    if isinstance(result, Mapping):
+        return 1
+    try:
+        return len(result)
+    except TypeError:
+        return 1
+
+
+class Instrumentation:
+    """
+    İsteğe bağlı ölçüm katmanı. enable() çağrılınca repository G/Ç metotları,
+    FinanceManager ve FinancialAnalyzer'ın açık (public) metotları, önbellekteki
+    türetilmiş yapı kurulumları (LedgerCache.derived: indeks/toplama) ve tarih
+    metni çözümleme (timestamps.parse_tarih: strptime) sınıf/modül üzerinde
+    sarmalanır; disable() orijinal metotları geri koyar. Kapalıyken hiçbir
+    sarmalayıcı yoktur, yani ek maliyet sıfırdır.
+    Her ölçüm noktası için çağrı sayısı, gecikme histogramı, okunan/yazılan
+    bayt ve taranan satır sayısı tutulur.
+    FINANCE_INSTRUMENTATION=1 ortam değişkeni ile konsol uygulamasında açılır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._patches = []      # (hedef, ad, orijinal değer)
+
+    @property
+    def enabled(self):
+        return bool(self._patches)
+
+    # --- KAYIT ---
+
+    def record(self, name, seconds, rows=0, bytes_read=0, bytes_written=0, failed=False):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = _Metric()
+            metric.add(seconds, rows, bytes_read, bytes_written, failed)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # {ölçüm noktası: değerler} (toplam süreye göre azalan)
+    # Örn. {'FinanceRepository._read_records': {'cagri': 2, 'toplam_sn': 0.41, 'satir': 200000, ...}}
+    def snapshot(self):
+        with self._lock:
+            items = [(name, metric.to_dict()) for name, metric in self._metrics.items()]
+        items.sort(key=lambda item: item[1]["toplam_sn"], reverse=True)
+        return dict(items)
+
+    def dump(self, path):
+        data = {"olcumler": self.snapshot(), "kovalar_sn": list(BUCKETS)}
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise DataStorageError(path, f"Ölçüm dosyası yazılamadı: {str(e)}")
+
+    # Okunabilir tablo metni
+    def format_report(self, limit=None):
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "Ölçüm kaydı yok." + ("" if self.enabled else " (Ölçüm kapalı)")
+        lines = [f"{'Ölçüm noktası':<46} {'Çağrı':>7} {'Toplam sn':>10} {'Ort. ms':>9} "
+                 f"{'Satır':>10} {'Okunan':>10} {'Yazılan':>10}"]
+        for name, m in list(snapshot.items())[:limit]:
+            lines.append(f"{name:<46} {m['cagri']:>7} {m['toplam_sn']:>10.4f} "
+                         f"{m['ortalama_sn'] * 1000:>9.3f} {m['satir']:>10} "
+                         f"{m['okunan_bayt']:>10} {m['yazilan_bayt']:>10}")
+            lines.append(f"{'':<4}{'  '.join(f'{k}: {v}' for k, v in m['histogram'].items())}")
+        return "\n".join(lines)
+
+    # --- AÇMA / KAPAMA ---
+
+    def enable(self):
+        with self._lock:
+            if self._patches:
+                return
+            for cls in REPO_CLASSES:
+                self._patch_repo(cls)
+            from .manager import FinanceManager
+            from .analyzer import FinancialAnalyzer
+            for cls in (FinanceManager, FinancialAnalyzer):
+                for attr, value in list(vars(cls).items()):
+                    if not attr.startswith("_") and inspect.isfunction(value):
+                        self._patch(cls, attr, self._timed(f"{cls.__name__}.{attr}", value))
+            self._patch(LedgerCache, "derived", self._timed_derived(LedgerCache.derived))
+            self._patch(timestamps, "parse_tarih", self._timed("timestamps.parse_tarih", timestamps.parse_tarih))
+
+    def disable(self):
+        with self._lock:
+            for target, attr, original in reversed(self._patches):
+                setattr(target, attr, original)
+            self._patches = []
+
+    @contextmanager
+    def active(self):
+        """
+        Blok süresince ölçümü açar (önceden açıksa açık bırakır):
+            with instrumentation.active():
+                analyzer.analyze_by_period("month")
+        """
+        was_enabled = self.enabled
+        self.enable()
+        try:
+            yield self
+        finally:
+            if not was_enabled:
+                self.disable()
+
+    def _patch(self, target, attr, wrapper):
+        self._patches.append((target, attr, getattr(target, attr)))
+        setattr(target, attr, wrapper)
+
+    # Sadece sınıfın kendi tanımladığı metotlar sarılır; alt sınıfın
+    # super() ile çağırdığı metot kendi sınıfının adıyla ayrıca görünür
+    def _patch_repo(self, cls):
+        own = vars(cls)
+        for attr in REPO_READS + REPO_FULL_READS + REPO_WRITES + tuple(REPO_RAW_WRITES):
+            func = own.get(attr)
+            if not inspect.isfunction(func):
+                continue
+            name = f"{cls.__name__}.{attr}"
+            if attr in REPO_READS:
+                wrapper = self._timed(name, func, count_rows=True)
+            elif attr in REPO_FULL_READS:
+                wrapper = self._timed(name, func, count_rows=True, full_read=True)
+            elif attr in REPO_RAW_WRITES:
+                wrapper = self._timed_write(name, func, REPO_RAW_WRITES[attr], append=attr != "_write_file")
+            else:
+                wrapper = self._timed(name, func)
+            self._patch(cls, attr, wrapper)
+
+    # --- SARMALAYICILAR ---
+
+    def _timed(self, name, func, count_rows=False, full_read=False):
+        record = self.record
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(name, time.perf_counter() - started, failed=True)
+                raise
+            bytes_read = _storage_bytes(args[0]) if full_read else 0
+            if count_rows and isinstance(result, Iterator):
+                # Akışlarda satırlar ve süre akış tükenince kaydedilir
+                # (süreye tüketen tarafın işi de dahildir)
+                return self._counted(name, result, started, bytes_read)
+            rows = _row_count(result) if count_rows else 0
+            record(name, time.perf_counter() - started, rows=rows, bytes_read=bytes_read)
+            return result
+        return wrapper
+
+    def _counted(self, name, iterator, started, bytes_read):
+        rows = 0
+        try:
+            for item in iterator:
+                rows += 1
+                yield item
+        finally:
+            self.record(name, time.perf_counter() - started, rows=rows, bytes_read=bytes_read)
+
+    def _timed_write(self, name, func, rows_of, append):
+        record = self.record
+
+        @functools.wraps(func)
+        def wrapper(repo, *args, **kwargs):
+            before = _storage_bytes(repo) if append else 0
+            started = time.perf_counter()
+            try:
+                result = func(repo, *args, **kwargs)
+            except BaseException:
+                record(name, time.perf_counter() - started, failed=True)
+                raise
+            elapsed = time.perf_counter() - started
+            written = _storage_bytes(repo) - before
+            record(name, elapsed, rows=rows_of(*args, **kwargs), bytes_written=max(written, 0))
+            return result
+        return wrapper
+
+    # Türetilmiş yapı erişimi yapı adına göre ayrı ayrı ölçülür
+    def _timed_derived(self, func):
+        record = self.record
+
+        @functools.wraps(func)
+        def wrapper(cache, key, paths, loader, name, builder, stream=None):
+            started = time.perf_counter()
+            try:
+                return func(cache, key, paths, loader, name, builder, stream)
+            finally:
+                record(f"LedgerCache.derived[{name}]", time.perf_counter() - started)
+        return wrapper
+
+
+# Süreç genelinde paylaşılan ölçüm nesnesi
+instrumentation = Instrumentation()
@@ -6,10 +6,14 @@ from ..data import (
     FinanceRepository, 
     FinanceRules, 
     Transaction, 
-    TransactionType,
-    ExpenseCategory
+    TransactionType
 )
-from ..services.calculator import SalaryCalculator
+from ..data.aggregates import AggregateStore
+from ..data.money import to_kurus, to_tl
+from ..services.payroll import PayrollRun
+from ..services.dues import DuesAssessment
+from ..services.transfer import TransactionImporter, export_transactions
+from ..data.dues_db import DuesRepository
 from ..exceptions.errors import (
     FinanceError, 
     InvalidAmountError, 
@@ -20,64 +24,119 @@ from modules.information.repository import AthleteRepository
 
 class FinanceManager:
     
-    def __init__(self):
-        self.repo = FinanceRepository()
+    # repo verilmezse varsayılan JSON deposu kullanılır
+    def __init__(self, repo=None):
+        self.repo = repo if repo is not None else FinanceRepository()
         self.rules = FinanceRules()
+        # Tip/kategori/gün toplamları; her yazmada artımlı güncellenir
+        self.aggregates = AggregateStore(self.repo)
         
         self.info_repo = AthleteRepository()
 
     # --- STANDART METOTLAR ---
     
-    def add_transaction(self, t_type_val, category_val, amount_val, description=""):
+    def add_transaction(self, t_type_val, category_val, amount_val, description="", athlete_id=None):
         try:
-            try:
-                val_amount = float(amount_val)
-            except ValueError:
-                raise InvalidDataTypeError("Sayısal Tutar", type(amount_val).__name__)
-
-            self.rules.check_business_limits(val_amount)
-            self.rules.validate_category_consistency(t_type_val, category_val)
-
-            new_transaction = Transaction(
-                t_type=t_type_val,
-                category=category_val,
-                amount=val_amount,
-                description=description
-            )
-            self.repo.save_record(new_transaction.to_dict())
+            new_transaction = self._build_transaction(t_type_val, category_val, amount_val, description, athlete_id)
+            self._persist([new_transaction.to_dict()])
             return True, "İşlem başarıyla kaydedildi."
         except FinanceError as e:
             return False, f"Engel: {e.message}"
         except Exception as e:
             return False, f"Sistem Hatası: {str(e)}"
 
+    def add_transactions(self, rows):
+        """
+        Toplu işlem girişi. Her satır ya sözlük ({'tip', 'kategori', 'tutar',
+        'aciklama', 'sporcu_id'}) ya da (tip, kategori, tutar[, açıklama[, sporcu_id]])
+        demeti olabilir.
+        Geçerli satırlar tek bir yazma işlemiyle kaydedilir.
+        Dönüş: satır sırasıyla (başarılı_mı, mesaj) listesi.
+        """
+        results = []
+        accepted = []   # (sonuç indeksi, kayıt sözlüğü)
+
+        for row in rows:
+            try:
+                if isinstance(row, dict):
+                    args = (row.get("tip"), row.get("kategori"), row.get("tutar"),
+                            row.get("aciklama", ""), row.get("sporcu_id"))
+                else:
+                    args = tuple(row) + ("",) * (4 - len(row)) + (None,) * (5 - max(len(row), 4))
+                new_transaction = self._build_transaction(*args[:5])
+                accepted.append((len(results), new_transaction.to_dict()))
+                results.append((True, "İşlem başarıyla kaydedildi."))
+            except FinanceError as e:
+                results.append((False, f"Engel: {e.message}"))
+            except Exception as e:
+                results.append((False, f"Hatalı Satır: {str(e)}"))
+
+        try:
+            self._persist([record for _, record in accepted])
+        except Exception as e:
+            # Yazma başarısızsa kabul edilen satırların hiçbiri kaydedilmemiştir
+            for index, _ in accepted:
+                results[index] = (False, f"Sistem Hatası: {str(e)}")
+        return results
+
+    # Kayıtları deftere yazar ve toplam tablolarını aynı anda günceller
+    def _persist(self, records):
+        if not records:
+            return
+        with self.aggregates.tracking() as delta:
+            if len(records) == 1:
+                self.repo.save_record(records[0])
+            else:
+                self.repo.save_records(records)
+            delta.add_all(records)
+
+    # Tutarı doğrular, iş kurallarını uygular ve Transaction nesnesini oluşturur
+    def _build_transaction(self, t_type_val, category_val, amount_val, description="", athlete_id=None):
+        try:
+            val_amount = float(amount_val)
+        except (TypeError, ValueError):
+            raise InvalidDataTypeError("Sayısal Tutar", type(amount_val).__name__)
+
+        self.rules.check_business_limits(val_amount)
+        self.rules.validate_category_consistency(t_type_val, category_val)
+
+        return Transaction(
+            t_type=t_type_val,
+            category=category_val,
+            amount=val_amount,
+            description=description,
+            athlete_id=athlete_id
+        )
+
     def delete_transaction(self, transaction_id):
         try:
-            all_data = self.repo.load_all()
-            new_data = [t for t in all_data if t["id"] != transaction_id]
-            if len(all_data) == len(new_data):
+            # delete_record aynı kimlikli tüm kayıtları siler; özetten de hepsi düşülür
+            old_records = self.repo.find_all_by_id(transaction_id)
+            if not old_records:
                 raise FinanceError("Silinecek kayıt bulunamadı.", error_code=404)
-            self.repo._save_to_file(new_data)
+            with self.aggregates.tracking() as delta:
+                self.repo.delete_record(transaction_id)
+                for old_record in old_records:
+                    delta.remove(old_record)
             return True, "Kayıt silindi."
         except Exception as e:
             return False, f"Hata: {str(e)}"
 
     def update_transaction(self, transaction_id, new_amount=None, new_desc=None):
         try:
-            all_data = self.repo.load_all()
-            found = False
-            for item in all_data:
-                if item["id"] == transaction_id:
-                    found = True
-                    if new_amount:
-                        val = float(new_amount)
-                        self.rules.check_business_limits(val)
-                        item["tutar"] = val
-                    if new_desc:
-                        item["aciklama"] = new_desc
-                    break
-            if not found: return False, "Kayıt bulunamadı."
-            self.repo._save_to_file(all_data)
+            changes = {}
+            if new_amount:
+                val = float(new_amount)
+                self.rules.check_business_limits(val)
+                changes["tutar_kurus"] = to_kurus(val)
+                changes["tutar"] = to_tl(changes["tutar_kurus"])
+            if new_desc:
+                changes["aciklama"] = new_desc
+            old_record = self.repo.find_by_id(transaction_id)
+            if old_record is None: return False, "Kayıt bulunamadı."
+            with self.aggregates.tracking() as delta:
+                self.repo.update_record(transaction_id, changes)
+                delta.replace(old_record, {**old_record, **changes})
             return True, "Güncellendi."
         except Exception as e:
             return False, f"Hata: {str(e)}"
@@ -87,10 +146,11 @@ class FinanceManager:
 
     # --- MAAŞ ÖDEME ---
 
-    def process_monthly_salaries(self):
+    def process_monthly_salaries(self, run_id=None):
         """
         Information modülünden verileri çeker ve ödeme yapar.
         Bağlantı hatası olursa program hata fırlatır.
+        Yarıda kalmış bir bordro varsa (veya run_id verilirse) kaldığı yerden devam eder.
         """
         try:
             # Veriyi çek
@@ -99,66 +159,92 @@ class FinanceManager:
             if not data_list:
                 return False, "Sistemde ödenecek kişi bulunamadı (Liste boş)."
 
-            success_count = 0
-            fail_count = 0
-            total_paid = 0
-            salary_calc = SalaryCalculator()
-
-            for person in data_list:
-                try:
-
-                    name = person.get("name", person.get("ad", "İsimsiz"))
-                    p_id = person.get("id", "??")
-                    gross = person.get("salary", person.get("maas", 0))
-
-                    if isinstance(gross, str):
-                        try:
-                            gross = float(gross)
-                        except ValueError:
-                            gross = 0
-
-                    if gross <= 0:
-                        continue
-
-                    # Hesapla
-                    net_salary = salary_calc.calculate(gross)
-                    
-                    # Kaydet
-                    desc = f"Maaş Ödemesi: {name} ({p_id})"
-                    new_trans = Transaction(
-                        t_type=TransactionType.EXPENSE.value,
-                        category=ExpenseCategory.SALARY.value,
-                        amount=net_salary,
-                        description=desc
-                    )
-                    self.repo.save_record(new_trans.to_dict())
-                    
-                    success_count += 1
-                    total_paid += net_salary
-                    
-                except Exception as inner_e:
-                    print(f"[ATLANDI] {name}: {inner_e}")
-                    fail_count += 1
-
-            return True, (f"İşlem Tamamlandı.\n"
-                          f"✔ {success_count} Kişiye {total_paid:.2f} TL ödendi.\n"
-                          f"⚠ {fail_count} Hatalı kayıt atlandı.")
+            # Hesapla ve toplu kaydet
+            result = PayrollRun(self.repo, commit=self._persist).run(data_list, run_id=run_id)
+
+            message = (f"İşlem Tamamlandı.\n"
+                       f"✔ {result['success_count']} Kişiye {result['total_paid']:.2f} TL ödendi.\n"
+                       f"⚠ {result['fail_count']} Hatalı kayıt atlandı.\n")
+            if result["skipped_count"]:
+                message += f"↻ {result['skipped_count']} Kişi önceki denemede ödenmişti.\n"
+            message += (f"⏱ {result['elapsed']:.3f} sn ({result['throughput']:.0f} kayıt/sn) "
+                        f"| Bordro No: {result['run_id']}")
+            return True, message
 
         except Exception as e:
             # Burada yakalanan hata, veri çekme veya işleme hatasıdır.
             return False, f"İşlem Hatası: {str(e)}"
 
+    # --- AİDAT GECİKME FAİZİ ---
+
+    def assess_late_fees(self, dues_repo=None, today=None):
+        """
+        Tüm açık aidatların gecikme faizini hesaplar ve önceki değerlendirmeden
+        bu yana oluşan farkı 'Üyelik Aidatı' geliri olarak tek seferde kaydeder.
+        """
+        try:
+            engine = DuesAssessment(dues_repo or DuesRepository(), self.repo,
+                                    commit=self._persist, rules=self.rules)
+            result = engine.assess(today=today)
+            message = (f"İşlem Tamamlandı.\n"
+                       f"✔ {result['assessed_count']} açık aidat değerlendirildi, "
+                       f"{result['posted_count']} kayıtta {result['total_posted']:.2f} TL faiz işlendi.\n"
+                       f"⏱ {result['elapsed']:.3f} sn ({result['throughput']:.0f} aidat/sn) "
+                       f"| Tahakkuk No: {result['run_id']}")
+            if result["rejected"]:
+                message += f"\n✖ {len(result['rejected'])} aidat limit dışı olduğu için işlenmedi."
+            return True, message
+        except Exception as e:
+            return False, f"İşlem Hatası: {str(e)}"
+
+    # --- İÇE / DIŞA AKTARMA ---
+
+    def import_transactions(self, path, fmt=None, workers=1, chunk_size=1000, rejects_path=None):
+        """
+        CSV/JSONL dosyasındaki işlemleri parça parça doğrulayıp toplu kaydeder.
+        Reddedilen satırlar sebebiyle birlikte yan dosyaya yazılır.
+        """
+        try:
+            importer = TransactionImporter(self.repo, commit=self._persist,
+                                           chunk_size=chunk_size, workers=workers)
+            result = importer.run(path, fmt=fmt, rejects_path=rejects_path)
+            message = (f"İşlem Tamamlandı.\n"
+                       f"✔ {result['accepted_count']} satır kaydedildi.\n")
+            if result["rejected_count"]:
+                message += (f"⚠ {result['rejected_count']} satır reddedildi "
+                            f"(sebepler: {result['rejects_path']}).\n")
+            message += (f"⏱ {result['elapsed']:.3f} sn ({result['throughput']:.0f} satır/sn) "
+                        f"| Aktarım No: {result['run_id']}")
+            return True, message
+        except FinanceError as e:
+            return False, f"Engel: {e.message}"
+        except Exception as e:
+            return False, f"İşlem Hatası: {str(e)}"
+
+    def export_transactions(self, path, fmt=None, start_date=None, end_date=None, t_type=None):
+        try:
+            count = export_transactions(self.repo, path, fmt=fmt, start_date=start_date,
+                                        end_date=end_date, t_type=t_type)
+            return True, f"{count} kayıt '{path}' dosyasına aktarıldı."
+        except FinanceError as e:
+            return False, f"Engel: {e.message}"
+        except Exception as e:
+            return False, f"İşlem Hatası: {str(e)}"
+
     # --- RAPORLAMA ---
+    # Toplamlar defter taranmadan özet tablosundan okunur
+    # Toplama tam sayı kuruşla yapılır, sonuç TL olarak döner
     def get_financial_summary(self):
-        data = self.repo.load_all()
-        inc = sum(t["tutar"] for t in data if t["tip"] == TransactionType.INCOME.value)
-        exp = sum(t["tutar"] for t in data if t["tip"] == TransactionType.EXPENSE.value)
-        return {"toplam_gelir": inc, "toplam_gider": exp, "bakiye": inc - exp}
+        inc, exp = self.aggregates.totals_kurus()
+        return {"toplam_gelir": to_tl(inc), "toplam_gider": to_tl(exp), "bakiye": to_tl(inc - exp)}
 
     def get_category_breakdown(self):
-        data = self.repo.load_all()
-        bd = {}
-        for t in data:
-            k = f"{t['tip']} - {t['kategori']}"
-            bd[k] = bd.get(k, 0) + t['tutar']
-        return bd
\ No newline at end of file
+        return {
+            f"{t_type} - {cat}": total
+            for (t_type, cat), total in self.aggregates.category_totals().items()
+        }
+
+    # Özet tablolarını defterden sıfırdan oluşturur ve doğrular (bakım komutu)
+    def rebuild_aggregates(self):
+        self.aggregates.rebuild()
+        return self.aggregates.verify()
\ No newline at end of file
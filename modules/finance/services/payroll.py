@@ -0,0 +1,208 @@
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from ..data import Transaction, TransactionType, ExpenseCategory
+from ..data.money import to_kurus, to_tl
+from ..exceptions.errors import DataStorageError
+from .calculator import SalaryCalculator
+
+
+# Aylık maaşları tek geçişte hesaplayıp toplu kaydeden bordro motoru
+class PayrollRun:
+    """
+    Her çalıştırmanın bir bordro numarası (run ID) vardır ve oluşturulan her
+    maaş kaydı bu numarayı 'bordro_no' alanında taşır. Kayıtlar parti parti
+    yazılır, her partiden sonra kontrol noktası (checkpoint) güncellenir.
+    Yarıda kalan bir çalıştırma aynı numarayla devam ettirildiğinde deftere
+    zaten yazılmış kişiler atlanır; böylece kimseye iki kez ödeme yapılmaz.
+    Numara verilmezse sadece aynı bordro dönemine (YYYY-AA) ait yarım
+    çalıştırma kendiliğinden devam ettirilir; eski dönemlerinki ancak
+    numarası açıkça verilerek tamamlanır.
+    """
+
+    # commit verilirse kayıtlar onunla yazılır (örn. toplamları da güncelleyen
+    # FinanceManager._persist), verilmezse doğrudan repo.save_records kullanılır
+    def __init__(self, repo, batch_size=1000, calculator=None, commit=None):
+        self.repo = repo
+        self.commit = commit
+        self.batch_size = batch_size
+        self.calculator = calculator or SalaryCalculator()
+
+    # Kontrol noktası dosyası defterin yanında tutulur
+    @property
+    def checkpoint_path(self):
+        return self.repo.file_path + ".payroll.json"
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"runs": {}}
+        except (OSError, json.JSONDecodeError) as e:
+            raise DataStorageError(self.checkpoint_path, f"Kontrol noktası okunamadı: {str(e)}")
+
+    def _save_checkpoint(self, checkpoint):
+        tmp_path = self.checkpoint_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError as e:
+            raise DataStorageError(self.checkpoint_path, f"Kontrol noktası yazılamadı: {str(e)}")
+
+    # Tamamlanmamış son çalıştırmanın numarası (yoksa None);
+    # period verilirse ("2025-06") sadece o döneme ait çalıştırmalara bakılır
+    def find_unfinished_run(self, period=None):
+        runs = self.load_checkpoint()["runs"]
+        unfinished = [
+            rid for rid, info in runs.items()
+            if info.get("durum") != "tamamlandi" and (period is None or self._run_period(info) == period)
+        ]
+        return unfinished[-1] if unfinished else None
+
+    # Çalıştırmanın bordro dönemi; 'donem' alanı olmayan eski kayıtlarda başlangıç tarihinden
+    @staticmethod
+    def _run_period(info):
+        if "donem" in info:
+            return info["donem"]
+        started = info.get("baslangic", "")
+        return f"{started[6:10]}-{started[3:5]}" if len(started) >= 10 else None
+
+    @staticmethod
+    def current_period(today=None):
+        return (today or datetime.now()).strftime("%Y-%m")
+
+    @staticmethod
+    def new_run_id():
+        return f"BORDRO-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:4]}"
+
+    # Bu çalıştırmada deftere zaten yazılmış kişilerin anahtarları
+    def _already_paid(self, run_id):
+        return {
+            item.get("bordro_kisi") for item in self.repo.iter_records()
+            if item.get("bordro_no") == run_id
+        }
+
+    # Personel listesini (anahtar, ad, brüt maaş) üçlülerine çevirir
+    @staticmethod
+    def _normalize(people):
+        rows = []
+        seen = set()
+        for index, person in enumerate(people):
+            name = person.get("name", person.get("ad", "İsimsiz"))
+            p_id = person.get("id", "??")
+            gross = person.get("salary", person.get("maas", 0))
+
+            if isinstance(gross, str):
+                try:
+                    gross = float(gross)
+                except ValueError:
+                    gross = 0
+
+            # Aynı ID iki kez gelirse sıra numarası ile ayrıştırılır
+            key = str(p_id)
+            if key in seen:
+                key = f"{p_id}#{index}"
+            seen.add(key)
+            rows.append((key, p_id, name, gross))
+        return rows
+
+    def run(self, people, run_id=None, period=None):
+        """
+        period: bordro dönemi ("YYYY-AA", varsayılan içinde bulunulan ay).
+        Dönüş: run_id, success_count, fail_count, skipped_count, total_paid,
+        elapsed (sn) ve throughput (kayıt/sn) alanlarını içeren sözlük.
+        """
+        started = time.perf_counter()
+        checkpoint = self.load_checkpoint()
+        period = period or self.current_period()
+        if run_id is None:
+            run_id = self.find_unfinished_run(period) or self.new_run_id()
+
+        run_info = checkpoint["runs"].setdefault(run_id, {
+            "durum": "devam",
+            "donem": period,
+            "baslangic": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+            "odenen_kisi": 0,
+            "toplam_tutar": 0.0,
+        })
+        # Kontrol noktası defterin gerisinde kalmış ya da hiç yazılmamış
+        # olabilir; ödenmiş kişiler için asıl kaynak her zaman defterdir
+        paid_keys = self._already_paid(run_id)
+        self._save_checkpoint(checkpoint)
+
+        # 1. Geçiş: tüm net maaşlar hesaplanır. Sayısal maaşlar tek bir toplu
+        # (vektörel) çağrıyla, diğerleri hata sayımı için tek tek denenir.
+        rows = []
+        skipped_count = 0
+        for key, p_id, name, gross in self._normalize(people):
+            if key in paid_keys:
+                skipped_count += 1
+                continue
+            rows.append((key, p_id, name, gross))
+
+        numeric = [
+            row for row in rows
+            if isinstance(row[3], (int, float)) and not isinstance(row[3], bool) and row[3] > 0
+        ]
+        nets = dict(zip(
+            (row[0] for row in numeric),
+            self.calculator.calculate_batch([row[3] for row in numeric]) if numeric else [],
+        ))
+
+        pending = []
+        fail_count = 0
+        for key, p_id, name, gross in rows:
+            try:
+                if key in nets:
+                    net_salary = float(nets[key])
+                else:
+                    if gross <= 0:
+                        continue
+                    net_salary = self.calculator.calculate(gross)
+                record = Transaction(
+                    t_type=TransactionType.EXPENSE.value,
+                    category=ExpenseCategory.SALARY.value,
+                    amount=net_salary,
+                    description=f"Maaş Ödemesi: {name} ({p_id})",
+                    athlete_id=p_id if p_id != "??" else None
+                ).to_dict()
+                record["bordro_no"] = run_id
+                record["bordro_kisi"] = key
+                pending.append(record)
+            except Exception as inner_e:
+                print(f"[ATLANDI] {name}: {inner_e}")
+                fail_count += 1
+
+        # 2. Kayıtlar partiler halinde yazılır, her partiden sonra kontrol noktası
+        step = self.batch_size or len(pending) or 1
+        success_count = 0
+        total_kurus = 0
+        for start in range(0, len(pending), step):
+            batch = pending[start:start + step]
+            (self.commit or self.repo.save_records)(batch)
+            batch_kurus = sum(r["tutar_kurus"] for r in batch)
+            success_count += len(batch)
+            total_kurus += batch_kurus
+            run_info["odenen_kisi"] += len(batch)
+            run_info["toplam_tutar"] = to_tl(to_kurus(run_info["toplam_tutar"]) + batch_kurus)
+            self._save_checkpoint(checkpoint)
+
+        elapsed = time.perf_counter() - started
+        run_info["durum"] = "tamamlandi"
+        run_info["sure_sn"] = round(elapsed, 4)
+        self._save_checkpoint(checkpoint)
+
+        return {
+            "run_id": run_id,
+            "success_count": success_count,
+            "fail_count": fail_count,
+            "skipped_count": skipped_count,
+            "total_paid": to_tl(total_kurus),
+            "elapsed": elapsed,
+            "throughput": success_count / elapsed if elapsed > 0 else float(success_count),
+        }
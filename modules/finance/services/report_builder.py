@@ -0,0 +1,210 @@
+import heapq
+import math
+import time
+
+from ..data.constants import TransactionType
+from ..data.money import record_kurus, to_tl
+from ..data.timestamps import SECONDS_PER_DAY, from_epoch, record_timestamp
+from ..exceptions.errors import FinanceError
+
+# Gruplamada kullanılabilecek alanlar; 'gun', 'ay', 'yil' kaydın zamanından türetilir
+GROUP_KEYS = ("tip", "kategori", "sporcu_id", "gun", "ay", "yil")
+_DATE_KEYS = {"gun": 0, "ay": 1, "yil": 2}
+
+
+# Tüm toplayıcıların ortak kısmı: isim ve isteğe bağlı [start, end) zaman penceresi (epoch saniye)
+class _Aggregate:
+    needs_dates = False
+
+    def __init__(self, name, start=None, end=None):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def accepts(self, ts):
+        if self.start is None and self.end is None:
+            return True
+        if math.isnan(ts):
+            return False
+        return (self.start is None or ts >= self.start) and (self.end is None or ts < self.end)
+
+
+# Gelir/gider toplamları ve bakiye
+class Totals(_Aggregate):
+    def __init__(self, name="totals", start=None, end=None):
+        super().__init__(name, start, end)
+        self.reset()
+
+    def reset(self):
+        self._income = self._expense = self._count = 0
+
+    def add(self, item, kurus, ts, dates):
+        # Bilinmeyen tipler toplamlara katılmaz (AggregateStore ile aynı)
+        if item["tip"] == TransactionType.INCOME.value:
+            self._income += kurus
+        elif item["tip"] == TransactionType.EXPENSE.value:
+            self._expense += kurus
+        self._count += 1
+
+    def result(self):
+        return {
+            "toplam_gelir": to_tl(self._income),
+            "toplam_gider": to_tl(self._expense),
+            "bakiye": to_tl(self._income - self._expense),
+            "adet": self._count,
+        }
+
+
+# Kayıt sayısı (t_type verilirse sadece o tipteki kayıtlar)
+class Count(_Aggregate):
+    def __init__(self, name="count", t_type=None, start=None, end=None):
+        super().__init__(name, start, end)
+        self.t_type = t_type
+        self.reset()
+
+    def reset(self):
+        self._count = 0
+
+    def add(self, item, kurus, ts, dates):
+        if self.t_type is None or item["tip"] == self.t_type:
+            self._count += 1
+
+    def result(self):
+        return self._count
+
+
+# Verilen alanlara göre gruplanmış toplam ve adet
+class GroupBy(_Aggregate):
+    """
+    Dönüş: {anahtar: {'toplam': TL, 'adet': n}}. Tek alanla gruplamada anahtar
+    alanın değeri, birden fazla alanda değerlerin demetidir
+    (örn. ('Gelir', 'Bağış', '2025-03')).
+    """
+
+    def __init__(self, *keys, name=None, start=None, end=None):
+        unknown = [k for k in keys if k not in GROUP_KEYS]
+        if not keys or unknown:
+            raise FinanceError(f"Geçersiz gruplama alanı: {', '.join(unknown) or '(boş)'}", error_code=1015)
+        super().__init__(name or "group_by:" + ",".join(keys), start, end)
+        self.keys = keys
+        self.needs_dates = any(k in _DATE_KEYS for k in keys)
+        self.reset()
+
+    def reset(self):
+        self._cells = {}
+
+    def add(self, item, kurus, ts, dates):
+        key = tuple(
+            (dates[_DATE_KEYS[k]] if dates else "tarihsiz") if k in _DATE_KEYS else item.get(k)
+            for k in self.keys
+        )
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = [0, 0]
+        cell[0] += kurus
+        cell[1] += 1
+
+    def result(self):
+        single = len(self.keys) == 1
+        return {
+            (key[0] if single else key): {"toplam": to_tl(kurus), "adet": count}
+            for key, (kurus, count) in self._cells.items()
+        }
+
+
+# Tutarı en büyük N kayıt (t_type verilirse sadece o tipte)
+class TopN(_Aggregate):
+    def __init__(self, n=5, t_type=None, name=None, start=None, end=None):
+        super().__init__(name or f"top:{n}", start, end)
+        self.n = n
+        self.t_type = t_type
+        self.reset()
+
+    def reset(self):
+        self._heap = []     # (kuruş, sıra, kayıt) en küçüğü başta
+        self._seq = 0
+
+    def add(self, item, kurus, ts, dates):
+        if self.t_type is not None and item["tip"] != self.t_type:
+            return
+        self._seq += 1
+        # Eşit tutarlarda önce gelen kayıt kalır (sıra ters çevrilerek karşılaştırılır)
+        entry = (kurus, -self._seq, item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def result(self):
+        ordered = sorted(self._heap, key=lambda e: e[:2], reverse=True)
+        return [dict(item) for _, _, item in ordered]
+
+
+# Rapor sonucu: toplayıcı adı -> sonuç; taranan kayıt sayısı ve süre de tutulur
+class ReportResult(dict):
+    def __init__(self, values, scanned, elapsed):
+        super().__init__(values)
+        self.scanned = scanned
+        self.elapsed = elapsed
+
+
+class ReportBuilder:
+    """
+    İstenen toplamaların hepsini defter üzerinde TEK bir taramada hesaplar;
+    aynı builder tekrar çalıştırılabilir (her çalıştırmada sıfırdan başlar).
+    Her toplayıcı kendi penceresini (start/end) uygular; tutar kuruşa,
+    zaman damgası ve tarih anahtarları kayıt başına bir kez çevrilir.
+    Toplayıcılar nesne olarak ya da kısa metinle verilebilir:
+        ReportBuilder(["totals", "count", "group_by:tip,kategori", "group_by:ay", "top:5"])
+        ReportBuilder([Totals(), TopN(3, t_type="Gider"), GroupBy("tip", "kategori", start=t0)])
+    """
+
+    def __init__(self, aggregates):
+        self.aggregates = [self._parse(a) if isinstance(a, str) else a for a in aggregates]
+        names = [a.name for a in self.aggregates]
+        if len(set(names)) != len(names):
+            raise FinanceError("Rapor toplayıcı isimleri tekrar ediyor.", error_code=1015)
+
+    @staticmethod
+    def _parse(spec):
+        kind, _, arg = spec.partition(":")
+        if kind == "totals":
+            return Totals()
+        if kind == "count":
+            return Count(t_type=arg or None, name=spec)
+        if kind == "group_by":
+            return GroupBy(*[k.strip() for k in arg.split(",") if k.strip()])
+        if kind == "top":
+            try:
+                return TopN(int(arg or 5), name=spec)
+            except ValueError:
+                pass
+        raise FinanceError(f"Bilinmeyen rapor toplayıcısı: '{spec}'", error_code=1015)
+
+    def run(self, records):
+        started = time.perf_counter()
+        aggregates = self.aggregates
+        needs_dates = any(a.needs_dates for a in aggregates)
+        windowed = any(a.start is not None or a.end is not None for a in aggregates)
+        day_keys = {}   # gün numarası -> (gün, ay, yıl) metinleri
+        scanned = 0
+        for aggregate in aggregates:
+            aggregate.reset()
+
+        for item in records:
+            scanned += 1
+            kurus = record_kurus(item)
+            ts = record_timestamp(item) if needs_dates or windowed else float("nan")
+            dates = None
+            if needs_dates and not math.isnan(ts):
+                day = int(ts // SECONDS_PER_DAY)
+                dates = day_keys.get(day)
+                if dates is None:
+                    text = from_epoch(day * SECONDS_PER_DAY).strftime("%Y-%m-%d")
+                    dates = day_keys[day] = (text, text[:7], text[:4])
+            for aggregate in aggregates:
+                if aggregate.accepts(ts):
+                    aggregate.add(item, kurus, ts, dates)
+
+        values = {a.name: a.result() for a in aggregates}
+        return ReportResult(values, scanned, time.perf_counter() - started)
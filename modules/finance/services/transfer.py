@@ -0,0 +1,287 @@
+import csv
+import json
+import math
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from ..data import FinanceRules, Transaction
+from ..data.constants import DATE_FORMAT, DATETIME_FORMAT, TransactionType
+from ..data.ids import new_transaction_id
+from ..data.time_index import day_epoch
+from ..data.timestamps import SECONDS_PER_DAY, to_epoch, record_timestamp
+from ..exceptions.errors import (
+    CategoryMismatchError,
+    DataStorageError,
+    FinanceError,
+    InvalidDataTypeError,
+    InvalidDateFormatError
+)
+
+# Dışa/içe aktarılan sütunlar (CSV başlık satırı bu sırayla yazılır)
+EXPORT_FIELDS = ("id", "tarih", "tip", "kategori", "tutar", "aciklama", "sporcu_id")
+FORMATS = ("csv", "jsonl")
+_TYPES = {t.value for t in TransactionType}
+
+
+# Dosya uzantısından format ('csv' / 'jsonl'); bilinmiyorsa DataStorageError
+def detect_format(path, fmt=None):
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise DataStorageError(path, f"Desteklenmeyen dosya formatı: '{fmt}' (csv / jsonl)")
+    return fmt
+
+
+# Binlik ayraçlı tam sayı kısmı: 1-3 hane, ardından üçer haneli gruplar
+_GROUPED = {sep: re.compile(r"\d{1,3}(?:%s\d{3})+$" % re.escape(sep)) for sep in ".,"}
+_AMBIGUOUS_WHOLE = re.compile(r"[1-9]\d{0,2}$")
+
+
+# Ondalık ayracı son ayraçtır: "1.234,56" (Türkçe) ve "1,234.56" ya da
+# "1234.56" / "1234,56" kabul edilir. Tek ayraçtan sonra tam üç hane gelen
+# "1.250" / "1,250" binlik mi ondalık mı olduğu bilinemediği için reddedilir.
+def _parse_amount(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value if value is not None else "").strip().replace(" ", "")
+    body = text.lstrip("+-")
+    last = max(body.rfind("."), body.rfind(","))
+    if last >= 0:
+        decimal = body[last]
+        whole, fraction = body[:last], body[last + 1:]
+        thousands = "," if decimal == "." else "."
+        if decimal in whole:
+            # Aynı ayraç birden çok kez: binlik ayracıdır ("1.250.000")
+            thousands, decimal, whole, fraction = decimal, None, body, ""
+        if thousands in whole:
+            if not _GROUPED[thousands].match(whole):
+                raise InvalidDataTypeError("Sayısal Tutar", text)
+            whole = whole.replace(thousands, "")
+        elif decimal and len(fraction) == 3 and _AMBIGUOUS_WHOLE.match(whole):
+            raise InvalidDataTypeError("Ondalık ayracı belirgin tutar (örn. 1.250,00)", text)
+        text = text[:len(text) - len(body)] + whole + ("." + fraction if decimal else "")
+    try:
+        return float(text)
+    except ValueError:
+        raise InvalidDataTypeError("Sayısal Tutar", type(value).__name__)
+
+
+# "GG-AA-YYYY[ SS:DD:ss]" tarihini datetime'a çevirir
+def _parse_date(value):
+    text = str(value).strip()
+    for fmt in (DATETIME_FORMAT, DATE_FORMAT):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    raise InvalidDateFormatError(text, "GG-AA-YYYY[ SS:DD:ss]")
+
+
+# Tek satırı doğrulayıp defter kaydına çevirir (FinanceManager._build_transaction ile aynı kurallar)
+def _build_record(row, rules):
+    if not isinstance(row, dict):
+        raise InvalidDataTypeError("Nesne (JSON object)", type(row).__name__)
+    amount = _parse_amount(row.get("tutar"))
+    if not math.isfinite(amount):
+        raise InvalidDataTypeError("Sayısal Tutar", "nan/inf")
+    rules.check_business_limits(amount)
+    t_type = str(row.get("tip") or "").strip()
+    category = str(row.get("kategori") or "").strip()
+    # validate_category_consistency bilinmeyen tipleri sessizce geçirir
+    if t_type not in _TYPES:
+        raise CategoryMismatchError(t_type, category)
+    rules.validate_category_consistency(t_type, category)
+
+    record = Transaction(
+        t_type=t_type,
+        category=category,
+        amount=amount,
+        description=str(row.get("aciklama") or "").strip(),
+        athlete_id=str(row.get("sporcu_id") or "").strip() or None
+    ).to_dict()
+    if row.get("tarih"):
+        when = _parse_date(row["tarih"])
+        record["tarih"] = when.strftime(DATETIME_FORMAT)
+        record["zaman"] = int(to_epoch(when))
+        # Kimlik de kaydın kendi zamanına göre üretilir; içe aktarılan eski
+        # kayıtlar kimlik sırasında aktarım anına değil işlem tarihine göre yer alır
+        record["id"] = new_transaction_id(at=when)
+    return record
+
+
+def _validate_chunk(chunk):
+    """
+    Havuzdaki işçinin çalıştırdığı adım: [(satır no, satır)] parçasını çözer
+    ve doğrular. JSONL satırları metin olarak gelir ve burada çözülür; CSV
+    satırları (tırnak içi satır sonları nedeniyle) ana süreçte okunur.
+    Dönüş: (kabul edilen kayıtlar, [(satır no, hata, ham satır)])
+    """
+    rules = FinanceRules()
+    accepted, rejected = [], []
+    for line_no, raw in chunk:
+        try:
+            row = json.loads(raw) if isinstance(raw, str) else raw
+            accepted.append(_build_record(row, rules))
+        except FinanceError as e:
+            rejected.append((line_no, f"Engel: {e.message}", raw))
+        except (ValueError, TypeError, AttributeError) as e:
+            rejected.append((line_no, f"Hatalı Satır: {str(e)}", raw))
+    return accepted, rejected
+
+
+# Girdi dosyasını (satır no, satır) olarak akıtır; dosya bellekte tutulmaz
+def _iter_rows(path, fmt):
+    if fmt == "csv":
+        # utf-8-sig: Excel'in eklediği BOM başlığa karışmaz
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# CSV/JSONL dosyasını parça parça doğrulayıp deftere toplu yazan içe aktarma
+class TransactionImporter:
+    """
+    Dosya 'chunk_size' satırlık parçalar halinde okunur; parçalar 'workers'
+    süreçli bir havuzda (workers <= 1 ise aynı süreçte) FinanceRules ile
+    doğrulanır. Havuza en fazla 2 x workers parça verilir, böylece bellek
+    kullanımı dosya boyutundan bağımsız kalır. Kabul edilen kayıtlar
+    'batch_size' kayıtlık yığınlar halinde tek yazmayla işlenir; her kayıt
+    'aktarim_no' alanını taşır. Reddedilen satırlar sebebiyle birlikte
+    '<girdi>.rejected.jsonl' dosyasına yazılır.
+    """
+
+    def __init__(self, repo, commit=None, chunk_size=1000, batch_size=5000, workers=1):
+        self.repo = repo
+        # commit verilmezse kayıtlar doğrudan repo.save_records ile yazılır
+        self.commit = commit
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def run(self, path, fmt=None, rejects_path=None):
+        """
+        Dönüş: run_id, accepted_count, rejected_count, rejects_path (ret yoksa
+        None), elapsed (sn) ve throughput (satır/sn).
+        """
+        started = time.perf_counter()
+        fmt = detect_format(path, fmt)
+        if not os.path.exists(path):
+            raise DataStorageError(path, "İçe aktarılacak dosya bulunamadı.")
+        run_id = f"AKTARIM-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        rejects_path = rejects_path or path + ".rejected.jsonl"
+
+        accepted_count = rejected_count = 0
+        pending = []
+        try:
+            with open(rejects_path, 'w', encoding='utf-8') as rejects:
+                for accepted, rejected in self._validated_chunks(path, fmt):
+                    for record in accepted:
+                        record["aktarim_no"] = run_id
+                    pending.extend(accepted)
+                    accepted_count += len(accepted)
+                    for line_no, reason, raw in rejected:
+                        rejects.write(json.dumps(
+                            {"satir": line_no, "hata": reason, "veri": raw.rstrip("\n") if isinstance(raw, str) else raw},
+                            ensure_ascii=False) + "\n")
+                    rejected_count += len(rejected)
+                    if len(pending) >= self.batch_size:
+                        self._commit(pending)
+                        pending = []
+                self._commit(pending)
+        except OSError as e:
+            raise DataStorageError(path, f"İçe aktarma okuma/yazma hatası: {str(e)}")
+        except UnicodeDecodeError as e:
+            raise DataStorageError(path, f"Dosya UTF-8 değil: {str(e)}")
+
+        if not rejected_count:
+            os.remove(rejects_path)
+        elapsed = time.perf_counter() - started
+        total = accepted_count + rejected_count
+        return {
+            "run_id": run_id,
+            "accepted_count": accepted_count,
+            "rejected_count": rejected_count,
+            "rejects_path": rejects_path if rejected_count else None,
+            "elapsed": elapsed,
+            "throughput": total / elapsed if elapsed > 0 else float(total),
+        }
+
+    def _commit(self, records):
+        if records:
+            (self.commit or self.repo.save_records)(records)
+
+    # Doğrulanmış parçaları dosya sırasıyla üretir
+    def _validated_chunks(self, path, fmt):
+        chunks = _chunks(_iter_rows(path, fmt), self.chunk_size)
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield _validate_chunk(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(_validate_chunk, chunk))
+                if len(in_flight) >= 2 * self.workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+def export_transactions(repo, path, fmt=None, start_date=None, end_date=None, t_type=None):
+    """
+    Defteri CSV/JSONL olarak akıtarak dışa aktarır; kayıtlar tek tek yazılır.
+    start_date / end_date: date (iki uç dahil, gün bazında), t_type: 'Gelir' / 'Gider'.
+    Dosya geçici isimle yazılıp tamamlanınca yerine taşınır.
+    Dönüş: yazılan kayıt sayısı
+    """
+    fmt = detect_format(path, fmt)
+    start = day_epoch(start_date) if start_date else -math.inf
+    end = day_epoch(end_date) + SECONDS_PER_DAY if end_date else math.inf
+    bounded = start_date is not None or end_date is not None
+
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = None
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_FIELDS)
+            for item in repo.iter_records():
+                if t_type and item.get("tip") != t_type:
+                    continue
+                if bounded:
+                    # Tarihi çözülemeyen kayıtlar aralık dışında sayılır (NaN karşılaştırması)
+                    ts = record_timestamp(item)
+                    if not (start <= ts < end):
+                        continue
+                if writer is not None:
+                    writer.writerow([item.get(field, "") for field in EXPORT_FIELDS])
+                else:
+                    # Önbellekten gelen salt okunur kayıtlar düz sözlüğe çevrilir
+                    f.write(json.dumps(dict(item), ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp_path, path)
+    except OSError as e:
+        raise DataStorageError(path, f"Dışa aktarma yazma hatası: {str(e)}")
+    return count
@@ -1,9 +1,17 @@
 import unittest
 import os
 import json
+from datetime import datetime
 from modules.finance.services.manager import FinanceManager
 from modules.finance.services.analyzer import FinancialAnalyzer
+from modules.finance.services.analysis_cache import AnalysisCache
+from modules.finance.services.instrumentation import instrumentation
+from modules.finance.services.report_builder import ReportBuilder, TopN
+from modules.finance.exceptions.errors import FinanceError
+from modules.finance.data.json_db import FinanceRepository
+from modules.finance.data.ledger_cache import ledger_cache
 from modules.finance.data.constants import TransactionType, IncomeCategory, ExpenseCategory
+from modules.finance.data.balance_index import BalanceIndex
 
 # Analiz ,raporlama fonksiyonlarını test eder
 class TestFinancialAnalyzer(unittest.TestCase):
@@ -18,6 +26,10 @@ class TestFinancialAnalyzer(unittest.TestCase):
         self.analyzer = FinancialAnalyzer()
         self.analyzer.repo.file_path = self.test_db_file
         
+        # Özet tablosu yan dosyası (.agg.json) test bitince silinsin
+        agg_path = self.manager.aggregates.path
+        self.addCleanup(lambda: os.path.exists(agg_path) and os.remove(agg_path))
+
         # Dosyayı sıfırla
         with open(self.test_db_file, 'w') as f:
             json.dump([], f)
@@ -99,4 +111,239 @@ class TestFinancialAnalyzer(unittest.TestCase):
         self.assertIn(salary_key, breakdown)
         
         # Değer kontrolü
-        self.assertEqual(breakdown[ticket_key], 1000)
\ No newline at end of file
+        self.assertEqual(breakdown[ticket_key], 1000)
+
+    def test_period_report_skips_old_records(self):
+        """Tarih aralığı dışındaki kayıtlar haftalık rapora girmemeli."""
+        self.manager.repo.save_record({
+            "id": "eski0001", "tarih": "01-01-2000 10:00:00",
+            "tip": TransactionType.INCOME.value, "kategori": IncomeCategory.MATCH_TICKET.value,
+            "tutar": 999.0, "aciklama": "Eski bilet"
+        })
+        report = self.analyzer.analyze_by_period("week")
+
+        self.assertEqual(report[TransactionType.INCOME.value][IncomeCategory.MATCH_TICKET.value], 1000)
+        self.assertEqual(report[TransactionType.EXPENSE.value], {ExpenseCategory.SALARY.value: 400})
+
+    def test_search_matches_substring_scan(self):
+        """Ters indeksli arama, tüm defteri tarayan alt metin kontrolüyle aynı sonucu vermeli."""
+        self.manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.DONATION.value, 75, "İzmir şubesi bağışı"
+        )
+        records = self.analyzer.repo.load_all()
+        fields = ("id", "kategori", "tarih", "aciklama")
+        for term in ["", "a", "Ö", "Bilet", "bilet", "SPORCU", "20", "İzmir", "yok-böyle-bir-şey", records[0]["id"][:5]]:
+            expected = [r for r in records if any(term in r[f] for f in fields)]
+            self.assertEqual(self.analyzer.search_transactions(term), expected, term)
+
+    def test_search_turkish_case_and_ranking(self):
+        """Harf duyarsız arama Türkçe İ/ı kurallarına uymalı; sıralı sonuçlar sayfalanabilmeli."""
+        self.manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.DONATION.value, 75, "İZMİR ŞUBESİ"
+        )
+        self.manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.DONATION.value, 25, "Izgara gecesi"
+        )
+
+        found = self.analyzer.search_transactions("izmir şubesi", ignore_case=True)
+        self.assertEqual([r["aciklama"] for r in found], ["İZMİR ŞUBESİ"])
+        self.assertEqual(self.analyzer.search_transactions("izgara", ignore_case=True), [])
+        self.assertEqual(len(self.analyzer.search_transactions("ızgara", ignore_case=True)), 1)
+
+        self.manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.MATCH_TICKET.value, 10, "Bilet satışı"
+        )
+        ranked = self.analyzer.search_transactions("bilet", ignore_case=True, ranked=True)
+        self.assertEqual([r["aciklama"] for r in ranked], ["Bilet satışı", "Derbi Bileti"])
+        page = self.analyzer.search_transactions("e", page=2, page_size=2)
+        self.assertEqual(page, self.analyzer.search_transactions("e")[2:4])
+
+    def test_athlete_index_uses_structured_id(self):
+        """'sporcu_id' alanlı kayıtlar bulunmalı; P1 araması P10'u yakalamamalı."""
+        self.manager.add_transaction(
+            TransactionType.EXPENSE.value, ExpenseCategory.SALARY.value, 100, "Prim", athlete_id="P1"
+        )
+        self.manager.add_transaction(
+            TransactionType.EXPENSE.value, ExpenseCategory.SALARY.value, 300, "Prim", athlete_id="P10"
+        )
+        self.manager.add_transaction(
+            TransactionType.EXPENSE.value, ExpenseCategory.SALARY.value, 50, "Ödeme: P10"
+        )
+
+        self.assertEqual(self.analyzer.calculate_athlete_total_cost("P1")["total_cost"], 100)
+        self.assertEqual(self.analyzer.calculate_athlete_total_cost("P10")["total_cost"], 350)
+        self.assertEqual(self.analyzer.calculate_athlete_total_cost("SPORCU")["transaction_count"], 0)
+        self.assertEqual(self.analyzer.calculate_all_athletes_cost(), {
+            "P1": {"total_cost": 100.0, "transaction_count": 1},
+            "P10": {"total_cost": 300.0, "transaction_count": 1},
+        })
+
+    def test_range_month_and_rolling_analytics(self):
+        """Takvim ayı, çeyrek, kayan pencere ve aydan aya karşılaştırma sıralı indeksten gelmeli."""
+        def old(t_id, tarih, amount, cat=IncomeCategory.DONATION.value):
+            return {"id": t_id, "tarih": tarih, "tip": TransactionType.INCOME.value,
+                    "kategori": cat, "tutar": amount, "aciklama": "arşiv"}
+
+        # Bilerek tarih sırası dışında eklenir
+        self.manager.repo.save_records([
+            old("m1", "15-03-2024 10:00:00", 100.1),
+            old("f1", "28-02-2024 23:59:00", 50.2),
+            old("m2", "31-03-2024 09:00:00", 0.2),
+            old("a1", "01-04-2024 00:00:00", 7.0),
+            old("y1", "10-03-2023 12:00:00", 40.0),
+        ])
+        income = TransactionType.INCOME.value
+        donation = IncomeCategory.DONATION.value
+
+        self.assertEqual(self.analyzer.analyze_month(2024, 3)[income], {donation: 100.3})
+        self.assertEqual(self.analyzer.analyze_quarter(2024, 1)[income], {donation: 150.5})
+        self.assertEqual(self.analyzer.analyze_range(datetime(2024, 2, 28), datetime(2024, 3, 15))[income],
+                         {donation: 150.3})
+
+        mom = self.analyzer.compare_month_over_month(2024, 3)[income][donation]
+        self.assertEqual((mom["onceki"], mom["simdiki"], mom["fark"]), (50.2, 100.3, 50.1))
+        yoy = self.analyzer.compare_year_over_year(2024, 3)[income][donation]
+        self.assertEqual((yoy["onceki"], yoy["oran"]), (40.0, 150.75))
+
+        series = self.analyzer.rolling_sum(window_days=30, end_date=datetime(2024, 4, 1), days=3)
+        self.assertEqual([day.day for day, _ in series], [30, 31, 1])
+        self.assertEqual([report[income].get(donation) for _, report in series], [100.1, 100.3, 107.3])
+
+    def test_balance_at_date_and_series(self):
+        """Bakiye, geriye tarihli kayıtlar dahil tarih sırasıyla toplanmış net akış olmalı."""
+        def old(t_id, tarih, t_type, amount):
+            return {"id": t_id, "tarih": tarih, "tip": t_type, "kategori": "Diğer",
+                    "tutar": amount, "aciklama": "arşiv"}
+        income, expense = TransactionType.INCOME.value, TransactionType.EXPENSE.value
+
+        self.manager.repo.save_records([
+            old("b1", "01-01-2024 10:00:00", income, 1000.10),
+            old("b2", "05-01-2024 12:00:00", expense, 250.05),
+        ])
+        self.assertEqual(self.analyzer.balance_at(datetime(2023, 12, 31)), 0)
+        self.assertEqual(self.analyzer.balance_at(datetime(2024, 1, 4)), 1000.10)
+        self.assertEqual(self.analyzer.balance_at(datetime(2024, 1, 5)), 750.05)
+
+        # Geriye tarihli kayıt sonraki tüm günlerin bakiyesini değiştirir
+        self.manager.repo.save_records([old("b3", "03-01-2024 09:00:00", expense, 0.05)])
+        series = self.analyzer.balance_series(end_date=datetime(2024, 1, 6), days=7)
+        self.assertEqual([day.day for day, _ in series], [31, 1, 2, 3, 4, 5, 6])
+        self.assertEqual([b for _, b in series], [0, 1000.10, 1000.10, 1000.05, 1000.05, 750.0, 750.0])
+
+        # Bugünkü bakiye toplam gelir - giderle aynıdır
+        self.assertEqual(self.analyzer.balance_at(datetime.now()) * 100,
+                         round(self.analyzer.get_budget_status()["net_bakiye"] * 100))
+
+    def test_balance_index_grows_in_both_directions(self):
+        def rec(tarih, amount):
+            return {"tarih": tarih, "tip": TransactionType.INCOME.value, "tutar": amount}
+
+        index = BalanceIndex.from_records([rec("01-06-2024", 1)])
+        index.extend([rec("15-12-2024", 2)])     # kapsamın ilerisi
+        index.extend([rec("01-01-2020", 4)])     # kapsamın gerisi
+        index.extend([rec("02-06-2024", 8)])     # kapsam içi nokta güncellemesi
+        expected = {datetime(2019, 12, 31): 0, datetime(2020, 1, 1): 400, datetime(2024, 6, 1): 500,
+                    datetime(2024, 6, 2): 1300, datetime(2024, 12, 15): 1500, datetime(2030, 1, 1): 1500}
+        for day, kurus in expected.items():
+            self.assertEqual(index.balance_at(day), kurus)
+
+    def test_dashboard_matches_separate_reports(self):
+        self.manager.repo.save_records([{
+            "id": "eski1", "tarih": "01-01-2020 10:00:00", "tip": TransactionType.EXPENSE.value,
+            "kategori": ExpenseCategory.TAX.value, "tutar": 900.0, "aciklama": "Eski vergi"}])
+        # Özet tabloları ve zaman indeksi hazırken defter sadece en büyük giderler için taranmalı
+        self.manager.rebuild_aggregates()
+        self.analyzer.analyze_by_period("month")
+        calls = []
+        iter_records = self.analyzer.repo.iter_records
+        self.analyzer.repo.iter_records = lambda: calls.append(1) or iter_records()
+
+        report = self.analyzer.dashboard()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(report["ozet"], self.manager.get_financial_summary())
+        self.assertEqual(report["kategori_dagilimi"], self.manager.get_category_breakdown())
+        self.assertEqual(report["butce_durumu"], self.analyzer.get_budget_status())
+        self.assertEqual(report["donem_raporu"], self.analyzer.analyze_by_period("month"))
+        self.assertEqual([t["tutar"] for t in report["en_buyuk_giderler"]], [900.0, 400.0])
+        self.assertEqual(report["adet"], 4)
+
+    def test_report_builder_aggregates(self):
+        records = [
+            {"tarih": "05-03-2025", "tip": "Gelir", "kategori": "Bağış", "tutar": 10.1},
+            {"tarih": "20-03-2025", "tip": "Gelir", "kategori": "Bağış", "tutar": 0.2},
+            {"tarih": "02-04-2025", "tip": "Gider", "kategori": "Ekipman", "tutar": 5.0},
+            {"tarih": "bozuk", "tip": "Gider", "kategori": "Ekipman", "tutar": 1.0},
+        ]
+        # Bilinmeyen tip gider sayılmaz (özet tablolarıyla aynı)
+        self.assertEqual(ReportBuilder(["totals"]).run(records + [
+            {"tarih": "05-03-2025", "tip": "Transfer", "kategori": "Diğer", "tutar": 7.0}])["totals"],
+            {"toplam_gelir": 10.3, "toplam_gider": 6.0, "bakiye": 4.3, "adet": 5})
+        builder = ReportBuilder(["totals", "count:Gider", "group_by:ay", "group_by:tip,kategori",
+                                 TopN(2, name="ilk2")])
+        result = builder.run(records)
+
+        self.assertEqual(result.scanned, 4)
+        self.assertEqual(result["totals"]["bakiye"], 4.3)
+        self.assertEqual(result["count:Gider"], 2)
+        self.assertEqual(result["group_by:ay"], {"2025-03": {"toplam": 10.3, "adet": 2},
+                                                 "2025-04": {"toplam": 5.0, "adet": 1},
+                                                 "tarihsiz": {"toplam": 1.0, "adet": 1}})
+        self.assertEqual(result["group_by:tip,kategori"][("Gelir", "Bağış")], {"toplam": 10.3, "adet": 2})
+        self.assertEqual([r["tutar"] for r in result["ilk2"]], [10.1, 5.0])
+        # Aynı builder tekrar çalıştırılınca sonuçlar birikmez
+        self.assertEqual(builder.run(records)["totals"]["adet"], 4)
+
+        with self.assertRaises(FinanceError):
+            ReportBuilder(["group_by:renk"])
+        with self.assertRaises(FinanceError):
+            ReportBuilder(["ortalama"])
+
+    def test_analysis_cache_hits_and_invalidates_on_write(self):
+        """Aynı rapor ikinci kez hesaplanmamalı; manager yazınca sonuç tazelenmeli."""
+        self.analyzer.analysis_cache.clear()
+        first = self.analyzer.get_budget_status()
+        first["net_bakiye"] = -1   # dönen kopya değiştirilse de önbellek bozulmamalı
+        self.assertEqual(self.analyzer.get_budget_status()["net_bakiye"], 1100)
+        self.assertEqual(self.analyzer.cache_stats()["hits"], 1)
+
+        self.manager.add_transaction(TransactionType.EXPENSE.value, ExpenseCategory.TRAVEL.value, 100, "Otobüs")
+        self.assertEqual(self.analyzer.get_budget_status()["net_bakiye"], 1000)
+        self.assertEqual(self.analyzer.cache_stats()["misses"], 2)
+
+    def test_analysis_cache_is_bounded(self):
+        cache = AnalysisCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_compute(key, 1, lambda: {"sonuc": key})
+
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"], stats["hits"]), (2, 1, 1))
+        # 'b' en uzun süre kullanılmayandı, çıkarılmış olmalı
+        calls = []
+        cache.get_or_compute("b", 1, lambda: calls.append(1) or {})
+        self.assertEqual(calls, [1])
+        self.assertEqual(AnalysisCache(max_bytes=10).get_or_compute("x", 1, lambda: [1, 2, 3]), [1, 2, 3])
+
+    def test_instrumentation_is_opt_in_and_restores_methods(self):
+        original_load_all = FinanceRepository.load_all
+        instrumentation.reset()
+        with instrumentation.active():
+            self.assertIsNot(FinanceRepository.load_all, original_load_all)
+            ledger_cache.invalidate()
+            self.analyzer.analysis_cache.clear()
+            self.analyzer.calculate_athlete_total_cost("S-1")
+            self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 50, "Bağış")
+        # Kapatılınca orijinal metotlar geri konur ve yeni ölçüm yapılmaz
+        self.assertIs(FinanceRepository.load_all, original_load_all)
+        self.manager.get_all_transactions()
+
+        metrics = instrumentation.snapshot()
+        self.assertEqual(metrics["FinancialAnalyzer.calculate_athlete_total_cost"]["cagri"], 1)
+        self.assertEqual(metrics["FinanceManager.add_transaction"]["cagri"], 1)
+        self.assertNotIn("FinanceManager.get_all_transactions", metrics)
+        read = metrics["FinanceRepository._read_records"]
+        self.assertEqual(read["satir"], 3)   # setUp kayıtları, sonraki okumalar önbellekten
+        self.assertGreater(read["okunan_bayt"], 0)
+        self.assertGreater(metrics["FinanceRepository._write_file"]["yazilan_bayt"], 0)
+        self.assertEqual(sum(read["histogram"].values()), read["cagri"])
+        self.assertIn("FinanceRepository._read_records", instrumentation.format_report())
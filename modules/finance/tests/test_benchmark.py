@@ -0,0 +1,39 @@
+import unittest
+from datetime import date
+
+from modules.finance.benchmark import synthetic_records, run_benchmarks, compare_to_baseline
+from modules.finance.data.constants import IncomeCategory, ExpenseCategory
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_synthetic_ledger_is_deterministic(self):
+        first = list(synthetic_records(300, seed=7, end_day=date(2025, 6, 30)))
+        second = list(synthetic_records(300, seed=7, end_day=date(2025, 6, 30)))
+        self.assertEqual(first, second)
+
+        categories = {c.value for c in IncomeCategory} | {c.value for c in ExpenseCategory}
+        self.assertTrue(all(r["kategori"] in categories for r in first))
+        self.assertEqual(len({r["id"] for r in first}), 300)
+        # Kayıtlar zaman sırasında üretilir
+        self.assertEqual([r["zaman"] for r in first], sorted(r["zaman"] for r in first))
+
+    def test_small_run_and_baseline_comparison(self):
+        document = run_benchmarks([200], storage="journal", end_day=date(2025, 6, 30), repeat=1,
+                                  memory=False, single_ops=2, bulk_rows=20, people=5)
+        cases = {r["case"] for r in document["results"]}
+        self.assertIn("load_all.soguk", cases)
+        self.assertIn("rapor.tum_sporcular.sicak", cases)
+        self.assertIn("maas_odemesi", cases)
+        self.assertEqual(document["meta"]["boyutlar"], [200])
+
+        # Aynı sonuç kendine göre gerilemez; süreler iki katına çıkınca geriler
+        self.assertEqual(compare_to_baseline(document, document), [])
+        slower = {"results": [dict(r, seconds=r["seconds"] * 2 + 0.01, per_op=r["per_op"] * 2 + 0.01)
+                              for r in document["results"]]}
+        regressions = compare_to_baseline(slower, document, threshold=0.5)
+        self.assertEqual(len(regressions), len(document["results"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
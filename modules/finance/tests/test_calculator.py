@@ -7,7 +7,8 @@ from modules.finance.services.calculator import (
     TaxDeductionCalculator, 
     SalaryCalculator
 )
-from modules.finance.exceptions.errors import InvalidRateError, InvalidAmountError
+from modules.finance.exceptions.errors import InvalidRateError, InvalidAmountError, InvalidDataTypeError
+from modules.finance.exceptions.errors import InvalidDateFormatError
 
 # Hesaplayıcı fonksiyonlarını test eder
 class TestFinancialCalculators(unittest.TestCase):
@@ -90,4 +91,45 @@ class TestFinancialCalculators(unittest.TestCase):
         Beklenen: InvalidRateError fırlatmalı.
         """
         with self.assertRaises(InvalidRateError):
-            self.tax_calc.tax_rate = 1.5
\ No newline at end of file
+            self.tax_calc.tax_rate = 1.5
+
+    # --- TOPLU (BATCH) HESAP TESTLERİ ---
+    def test_batch_matches_scalar(self):
+        """
+        Senaryo: Aynı tutarlar tek tek ve toplu hesaplanıyor (yuvarlama sınırındakiler dahil).
+        Beklenen: Sonuçlar birebir aynı olmalı.
+        """
+        amounts = [0, 1.005, 2.675, 0.125, 1000, 12345.675, 99999.995, 150000, 7]
+        days = [0, 30, 180, 181, 400, -3, 1, 90, 200]
+
+        for calc in (self.salary_calc, self.tax_calc, TaxDeductionCalculator.corporate_tax_calculator()):
+            self.assertEqual([float(x) for x in calc.calculate_batch(amounts)],
+                             [calc.calculate(a) for a in amounts])
+        self.assertEqual([float(x) for x in self.late_fee_calc.calculate_batch(amounts, days_late=days)],
+                         [self.late_fee_calc.calculate(a, days_late=d) for a, d in zip(amounts, days)])
+        self.assertEqual([float(x) for x in self.late_fee_calc.calculate_batch(amounts, days_late=200)],
+                         [self.late_fee_calc.calculate(a, days_late=200) for a in amounts])
+
+    def test_batch_validation(self):
+        """
+        Senaryo: Toplu hesapta negatif veya sayı olmayan tutar.
+        Beklenen: Skaler yol ile aynı hata tipleri fırlatılmalı.
+        """
+        with self.assertRaises(InvalidAmountError):
+            self.salary_calc.calculate_batch([100, -1, 5])
+        with self.assertRaises(InvalidDataTypeError):
+            self.tax_calc.calculate_batch([100, "yüz"])
+        with self.assertRaises(InvalidDataTypeError):
+            self.late_fee_calc.calculate_batch([100, 200], days_late=[1.5, 2])
+
+    def test_days_overdue_batch(self):
+        """
+        Senaryo: Tekrarlanan vade tarihleriyle toplu gecikme günü hesabı.
+        Beklenen: Skaler hesapla aynı gün sayıları, hatalı tarihte InvalidDateFormatError.
+        """
+        today = datetime(2025, 3, 1, 15, 30)
+        dues = ["01-01-2025", "28-02-2025", "01-01-2025", "10-03-2025"]
+        days = self.late_fee_calc.calculate_days_overdue_batch(dues, today=today)
+        self.assertEqual([int(d) for d in days], [59, 1, 59, 0])
+        with self.assertRaises(InvalidDateFormatError):
+            self.late_fee_calc.calculate_days_overdue_batch(["2025-01-01"], today=today)
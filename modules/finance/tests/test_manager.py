@@ -1,8 +1,16 @@
 import unittest
 import os
 import json
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock 
 from modules.finance.services.manager import FinanceManager
+from modules.finance.services.payroll import PayrollRun
+from modules.finance.data.dues_db import DuesRepository
+from modules.finance.services.dues import DuesAssessment
+from modules.finance.services.transfer import _parse_amount
+from modules.finance.exceptions.errors import FinanceError
+from modules.finance.data.columnar import ColumnarLedger
+from modules.finance.data.ids import id_timestamp
 from modules.finance.data.constants import TransactionType, IncomeCategory, ExpenseCategory
 
 class TestFinanceManager(unittest.TestCase):
@@ -29,11 +37,18 @@ class TestFinanceManager(unittest.TestCase):
 
         self.manager.info_repo = MagicMock()
 
+        # 5. Özet tablosu ve bordro kontrol noktası yan dosyaları da silinsin
+        self._cleanup_files(self.test_db_file + ".agg.json", self.test_db_file + ".payroll.json")
+
     def tearDown(self):
         # Test bitince çöp dosyayı sil
         if os.path.exists(self.test_db_file):
             os.remove(self.test_db_file)
 
+    # Testin oluşturduğu ek dosyaları test bitince siler
+    def _cleanup_files(self, *paths):
+        self.addCleanup(lambda: [os.remove(p) for p in paths if os.path.exists(p)])
+
     def test_add_transaction_success(self):
         success, message = self.manager.add_transaction(
             TransactionType.INCOME.value,
@@ -65,6 +80,90 @@ class TestFinanceManager(unittest.TestCase):
         )
         self.assertFalse(success)
 
+    def test_add_transactions_bulk(self):
+        """
+        Senaryo: Toplu giriş, biri limit aşımı biri kategori hatası.
+        Beklenen: Geçerli satırlar tek yazmada kaydedilmeli, hatalılar raporlanmalı.
+        """
+        rows = [
+            (TransactionType.INCOME.value, IncomeCategory.MATCH_TICKET.value, 120, "Bilet 1"),
+            {"tip": TransactionType.INCOME.value, "kategori": IncomeCategory.MATCH_TICKET.value,
+             "tutar": 80, "aciklama": "Bilet 2"},
+            (TransactionType.INCOME.value, IncomeCategory.MATCH_TICKET.value, 20000000),
+            (TransactionType.INCOME.value, ExpenseCategory.SALARY.value, 50),
+        ]
+        results = self.manager.add_transactions(rows)
+
+        self.assertEqual([ok for ok, _ in results], [True, True, False, False])
+        self.assertIn("Limit", results[2][1])
+        records = self.manager.get_all_transactions()
+        self.assertEqual([r["aciklama"] for r in records], ["Bilet 1", "Bilet 2"])
+
+    def test_update_and_delete_transaction(self):
+        self.manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.DONATION.value, 300, "Bağış"
+        )
+        t_id = self.manager.get_all_transactions()[0]["id"]
+
+        self.assertTrue(self.manager.update_transaction(t_id, new_amount=450, new_desc="Düzeltme")[0])
+        record = self.manager.get_all_transactions()[0]
+        self.assertEqual((record["tutar"], record["aciklama"]), (450.0, "Düzeltme"))
+
+        self.assertTrue(self.manager.delete_transaction(t_id)[0])
+        self.assertEqual(self.manager.get_all_transactions(), [])
+        self.assertFalse(self.manager.update_transaction(t_id, new_amount=10)[0])
+
+    def test_aggregates_follow_writes(self):
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 300, "Bağış")
+        self.manager.add_transactions([
+            (TransactionType.EXPENSE.value, ExpenseCategory.SALARY.value, 120, "Maaş"),
+            (TransactionType.INCOME.value, IncomeCategory.DONATION.value, 50, "Bağış 2"),
+        ])
+        t_id = self.manager.get_all_transactions()[0]["id"]
+        self.manager.update_transaction(t_id, new_amount=400)
+        self.manager.delete_transaction(self.manager.get_all_transactions()[2]["id"])
+
+        self.assertEqual(self.manager.get_financial_summary()["bakiye"], 280.0)
+        ok, diffs = self.manager.aggregates.verify()
+        self.assertTrue(ok, diffs)
+        self.assertTrue(os.path.exists(self.test_db_file + ".agg.json"))
+
+    def test_delete_removes_every_record_with_the_id_from_aggregates(self):
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 300, "Bağış")
+        data = self.manager.repo.load_all()
+        self.manager.repo._save_to_file(data + [dict(data[0], tutar=200.0)])
+        self.manager.rebuild_aggregates()
+
+        self.assertTrue(self.manager.delete_transaction(data[0]["id"])[0])
+        self.assertEqual(self.manager.get_all_transactions(), [])
+        self.assertEqual(self.manager.get_financial_summary()["toplam_gelir"], 0.0)
+        ok, diffs = self.manager.aggregates.verify()
+        self.assertTrue(ok, diffs)
+
+    def test_summaries_are_exact_in_kurus(self):
+        """Binlerce küçük tutarın toplamı kuruş kaymadan hesaplanmalı."""
+        rows = [("Gelir", "Bağış", 0.1)] * 1000 + [("Gider", "Ekipman", 0.7)] * 10
+        self.manager.add_transactions(rows)
+        self.assertNotEqual(sum([0.1] * 1000), 100.0)
+
+        self.assertEqual(self.manager.get_financial_summary(),
+                         {"toplam_gelir": 100.0, "toplam_gider": 7.0, "bakiye": 93.0})
+        self.assertEqual(ColumnarLedger.from_records(self.manager.repo.load_view()).totals(), (100.0, 7.0))
+        self.assertEqual(self.manager.repo.load_all()[0]["tutar_kurus"], 10)
+
+    def test_aggregates_rebuilt_after_external_change(self):
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 300, "Bağış")
+        self.assertEqual(self.manager.get_financial_summary()["toplam_gelir"], 300.0)
+
+        # Defter manager dışından değiştiriliyor
+        data = self.manager.repo.load_all()
+        data.append(dict(data[0], id="dis", tutar=200.0))
+        self.manager.repo._save_to_file(data)
+
+        self.assertEqual(self.manager.get_financial_summary()["toplam_gelir"], 500.0)
+        self.assertEqual(list(self.manager.aggregates.daily_totals().values()),
+                         [{TransactionType.INCOME.value: 500.0}])
+
     def test_process_monthly_salaries_success(self):
         """
         Senaryo: Arkadaşının modülünden 2 kişilik düzgün veri geliyor.
@@ -91,6 +190,7 @@ class TestFinanceManager(unittest.TestCase):
         # 20000 brüt - net daha düşük olmalı
         self.assertTrue(records[0]['tutar'] < 20000)
         self.assertEqual(records[0]['kategori'], ExpenseCategory.SALARY.value)
+        self.assertEqual([r['sporcu_id'] for r in records], ["GS-01", "GS-09"])
 
     def test_process_monthly_salaries_mixed_data(self):
         """
@@ -113,6 +213,217 @@ class TestFinanceManager(unittest.TestCase):
         self.assertEqual(len(records), 1)
         self.assertIn("Düzgün Oyuncu", records[0]['aciklama'])
 
+    def test_payroll_resume_does_not_double_pay(self):
+        """
+        Senaryo: Bordro ilk partiden sonra çöküyor, sonra tekrar çalıştırılıyor.
+        Beklenen: Yarım kalan bordro devam etmeli, ilk partidekilere tekrar ödeme yapılmamalı.
+        """
+        fake_data = [{"name": f"Oyuncu {i}", "salary": 10000 + i, "id": f"P{i}"} for i in range(5)]
+        self.manager.info_repo.get_all.return_value = fake_data
+
+        payroll = PayrollRun(self.manager.repo, batch_size=2)
+        original_save = self.manager.repo.save_records
+        calls = []
+
+        def crash_after_first_batch(records):
+            calls.append(len(records))
+            if len(calls) == 2:
+                raise OSError("disk dolu")
+            original_save(records)
+
+        self.manager.repo.save_records = crash_after_first_batch
+        with self.assertRaises(OSError):
+            payroll.run(fake_data)
+        self.manager.repo.save_records = original_save
+        run_id = payroll.find_unfinished_run()
+        self.assertIsNotNone(run_id)
+
+        success, msg = self.manager.process_monthly_salaries()
+        self.assertTrue(success)
+        self.assertIn("3 Kişiye", msg)
+        self.assertIn(run_id, msg)
+
+        records = self.manager.get_all_transactions()
+        self.assertEqual(sorted(r["bordro_kisi"] for r in records), [f"P{i}" for i in range(5)])
+        self.assertIsNone(payroll.find_unfinished_run())
+
+    def test_payroll_rerun_checks_ledger_without_checkpoint(self):
+        """Kontrol noktası kaybolsa da aynı bordro numarası defterdeki ödemeleri tekrarlamamalı."""
+        fake_data = [{"name": f"Oyuncu {i}", "salary": 10000 + i, "id": f"P{i}"} for i in range(3)]
+        payroll = PayrollRun(self.manager.repo)
+        run_id = payroll.run(fake_data)["run_id"]
+        os.remove(payroll.checkpoint_path)
+
+        result = payroll.run(fake_data, run_id=run_id)
+        self.assertEqual((result["success_count"], result["skipped_count"]), (0, 3))
+        self.assertEqual(len(self.manager.get_all_transactions()), 3)
+
+    def test_payroll_does_not_resume_previous_period(self):
+        """Geçen aydan yarım kalan bordro bu ayın bordrosunda kendiliğinden tamamlanmamalı."""
+        fake_data = [{"name": f"Oyuncu {i}", "salary": 10000 + i, "id": f"P{i}"} for i in range(3)]
+        self.manager.info_repo.get_all.return_value = fake_data
+        payroll = PayrollRun(self.manager.repo, batch_size=2)
+        original_save = self.manager.repo.save_records
+        calls = []
+
+        def crash_after_first_batch(records):
+            calls.append(len(records))
+            if len(calls) == 2:
+                raise OSError("disk dolu")
+            original_save(records)
+
+        self.manager.repo.save_records = crash_after_first_batch
+        with self.assertRaises(OSError):
+            payroll.run(fake_data, period="2020-01")
+        self.manager.repo.save_records = original_save
+        stale_run = payroll.find_unfinished_run("2020-01")
+        self.assertIsNotNone(stale_run)
+        self.assertIsNone(payroll.find_unfinished_run(PayrollRun.current_period()))
+
+        success, msg = self.manager.process_monthly_salaries()
+        self.assertTrue(success)
+        self.assertIn("3 Kişiye", msg)
+        self.assertNotIn(stale_run, msg)
+        self.assertEqual(len(self.manager.get_all_transactions()), 5)
+        # Eski çalıştırma numarası açıkça verilerek tamamlanabilir
+        self.assertIn("1 Kişiye", self.manager.process_monthly_salaries(run_id=stale_run)[1])
+
+    def test_late_fee_assessment_posts_only_delta(self):
+        """
+        Senaryo: 3 açık aidat (30 gün, 200 gün gecikmiş ve vadesi gelmemiş), gece değerlendirmesi iki kez.
+        Beklenen: İlk çalıştırma tüm faizi, aynı gün tekrar çalıştırma hiçbir şeyi,
+        10 gün sonraki çalıştırma sadece aradaki farkı (ödenen aidat hariç) işlemeli.
+        """
+        dues_path = os.path.abspath(self.test_db_file + ".dues.json")
+        self._cleanup_files(dues_path, dues_path + ".assessment.json")
+        dues_repo = DuesRepository(dues_path)
+        today = datetime(2025, 6, 30, 3, 0)
+        for member, days_ago in (("U1", 30), ("U2", 200), ("U3", -5)):
+            due_date = (today - timedelta(days=days_ago)).strftime("%d-%m-%Y")
+            dues_repo.issue([member], f"donem-{member}", 1000, due_date)
+
+        self.assertTrue(self.manager.assess_late_fees(dues_repo, today=today)[0])
+        self.assertEqual(self.manager.get_financial_summary()["toplam_gelir"], 150.0 + 4000.0)
+        self.assertTrue(self.manager.assess_late_fees(dues_repo, today=today)[0])
+        self.assertEqual(len(self.manager.get_all_transactions()), 2)
+
+        dues_repo.mark_paid(dues_repo.open_dues()[1]["id"])
+        success, msg = self.manager.assess_late_fees(dues_repo, today=today + timedelta(days=10))
+        self.assertTrue(success)
+        # U1: 40 gün -> 200 TL (fark 50), U3: 5 gün -> 25 TL, U2 ödendi
+        self.assertIn("75.00 TL", msg)
+        records = self.manager.get_all_transactions()
+        self.assertEqual([r["kategori"] for r in records], [IncomeCategory.MEMBERSHIP_FEE.value] * 4)
+        self.assertEqual([d["tahakkuk_faiz"] for d in dues_repo.load_all()], [200.0, 4000.0, 25.0])
+
+    def test_dues_ids_are_unique(self):
+        dues_path = os.path.abspath(self.test_db_file + ".dues.json")
+        self._cleanup_files(dues_path)
+        dues_repo = DuesRepository(dues_path)
+        self.assertEqual(dues_repo.issue([f"U{i}" for i in range(5000)], "2025-01", 500, "15-01-2025"), 5000)
+        ids = [d["id"] for d in dues_repo.load_all()]
+        self.assertEqual(len(set(ids)), 5000)
+        self.assertEqual({len(i) for i in ids}, {26})
+
+    def test_late_fee_assessment_applies_business_limits(self):
+        """
+        Senaryo: 200 gün gecikmiş 3 milyon TL'lik aidatın faizi (12 milyon) işlem limitini aşıyor.
+        Beklenen: O aidat işlenmeden reddedilmeli, diğeri işlenmeli; tahakkuk numaraları tekil olmalı.
+        """
+        dues_path = os.path.abspath(self.test_db_file + ".dues.json")
+        self._cleanup_files(dues_path, dues_path + ".assessment.json")
+        dues_repo = DuesRepository(dues_path)
+        today = datetime(2025, 6, 30, 3, 0)
+        due_date = (today - timedelta(days=200)).strftime("%d-%m-%Y")
+        dues_repo.issue(["U1"], "donem-1", 3000000, due_date)
+        dues_repo.issue(["U2"], "donem-2", 1000, due_date)
+
+        success, msg = self.manager.assess_late_fees(dues_repo, today=today)
+        self.assertTrue(success)
+        self.assertIn("1 aidat limit dışı", msg)
+        self.assertEqual(self.manager.get_financial_summary()["toplam_gelir"], 4000.0)
+        self.assertEqual([d["tahakkuk_faiz"] for d in dues_repo.load_all()], [0.0, 4000.0])
+        self.assertNotEqual(DuesAssessment.new_run_id(today), DuesAssessment.new_run_id(today))
+
+    def test_import_csv_rejects_invalid_rows(self):
+        csv_path = self.test_db_file + ".import.csv"
+        self._cleanup_files(csv_path, csv_path + ".rejected.jsonl")
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("tip,kategori,tutar,aciklama,tarih,sporcu_id\n"
+                    "Gelir,Bağış,\"1.250,50\",Bağışçı,05-01-2025,\n"
+                    "Gider,Ekipman,300,Top,,P1\n"
+                    "Gelir,Ekipman,10,Uyumsuz,,\n"
+                    "Gider,Ekipman,abc,Bozuk,,\n"
+                    "Gider,Ekipman,20,Tarihsiz,32-01-2025,\n")
+
+        success, message = self.manager.import_transactions(csv_path)
+
+        self.assertTrue(success)
+        records = self.manager.get_all_transactions()
+        self.assertEqual([r["tutar"] for r in records], [1250.5, 300.0])
+        self.assertEqual(records[0]["tarih"], "05-01-2025 00:00:00")
+        # Tarihli satırın kimliği işlem tarihinden üretilir
+        self.assertEqual(id_timestamp(records[0]["id"]), records[0]["zaman"])
+        self.assertLess(records[0]["id"], records[1]["id"])
+        self.assertEqual(records[1]["sporcu_id"], "P1")
+        self.assertEqual(self.manager.get_financial_summary()["bakiye"], 950.5)
+        with open(csv_path + ".rejected.jsonl", encoding='utf-8') as f:
+            rejects = [json.loads(line) for line in f]
+        self.assertEqual([r["satir"] for r in rejects], [4, 5, 6])
+        self.assertTrue(rejects[0]["hata"].startswith("Engel: Kategori"))
+
+    def test_import_amount_separators(self):
+        """Son ayraç ondalıktır; '1.250' gibi belirsiz tutarlar reddedilmeli."""
+        for text, expected in (("1.234,56", 1234.56), ("1,250.00", 1250.0), ("1.250.000", 1250000.0),
+                               ("1234,5", 1234.5), ("0.125", 0.125), ("12.50", 12.5)):
+            self.assertEqual(_parse_amount(text), expected)
+        for text in ("1.250", "1,250", "1,234,56", "1.2.3"):
+            with self.assertRaises(FinanceError):
+                _parse_amount(text)
+
+    def test_import_with_worker_pool_and_filtered_export(self):
+        """Havuzlu içe aktarma satır sırasını korumalı; dışa aktarma filtreleri uygulanmalı."""
+        jsonl_path = self.test_db_file + ".import.jsonl"
+        self._cleanup_files(jsonl_path, jsonl_path + ".rejected.jsonl")
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for i in range(1, 41):
+                t_type, cat = ("Gelir", "Bağış") if i % 2 else ("Gider", "Ekipman")
+                f.write(json.dumps({"tip": t_type, "kategori": cat, "tutar": i,
+                                    "tarih": f"{i % 28 + 1:02d}-02-2025"}) + "\n")
+            f.write("{bozuk json\n")
+
+        success, _ = self.manager.import_transactions(jsonl_path, workers=2, chunk_size=7)
+
+        self.assertTrue(success)
+        self.assertEqual([r["tutar"] for r in self.manager.get_all_transactions()],
+                         [float(i) for i in range(1, 41)])
+
+        export_path = self.test_db_file + ".export.csv"
+        self._cleanup_files(export_path)
+        success, _ = self.manager.export_transactions(
+            export_path, start_date=datetime(2025, 2, 1).date(),
+            end_date=datetime(2025, 2, 10).date(), t_type="Gider")
+        self.assertTrue(success)
+        with open(export_path, encoding='utf-8') as f:
+            rows = f.read().splitlines()
+        self.assertEqual(rows[0], "id,tarih,tip,kategori,tutar,aciklama,sporcu_id")
+        # i % 28 + 1 <= 10 ve çift: 2, 4, 6, 8, 28, 30, 32, 34, 36
+        self.assertEqual(sorted(float(r.split(",")[4]) for r in rows[1:]),
+                         [2.0, 4.0, 6.0, 8.0, 28.0, 30.0, 32.0, 34.0, 36.0])
+
+    def test_jsonl_export_with_warm_cache(self):
+        """Önbellek doluyken (salt okunur kayıtlar) JSONL dışa aktarma çalışmalı."""
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 300, "Bağış")
+        self.manager.repo.load_view()
+        export_path = self.test_db_file + ".export.jsonl"
+        self._cleanup_files(export_path)
+
+        success, _ = self.manager.export_transactions(export_path)
+        self.assertTrue(success)
+        with open(export_path, encoding='utf-8') as f:
+            exported = [json.loads(line) for line in f]
+        self.assertEqual(exported, self.manager.get_all_transactions())
+
     def test_process_monthly_salaries_empty(self):
         """
         Senaryo: Karşı taraftan boş liste geliyor.
@@ -0,0 +1,556 @@
+import unittest
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+from modules.finance.data import (
+    FinanceRepository, JournalFinanceRepository, SqliteFinanceRepository, ShardedFinanceRepository
+)
+from modules.finance.data.ledger_cache import ledger_cache
+from modules.finance.data.transaction import Transaction, CompactTransaction
+from modules.finance.data.ids import new_transaction_id, id_timestamp
+from modules.finance.data.id_index import IdIndex
+from modules.finance.data.timestamps import to_epoch
+from modules.finance.data.streaming import iter_json_array
+from modules.finance.exceptions.errors import DataStorageError
+from modules.finance.services.manager import FinanceManager
+from modules.finance.services.analyzer import FinancialAnalyzer
+from modules.finance.data.constants import TransactionType, IncomeCategory
+
+# Alternatif depolama modlarını test eder
+class TestJournalRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger_file = os.path.join(self.tmp_dir, "finance.json")
+        self.repo = JournalFinanceRepository(self.ledger_file, compact_threshold=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _record(self, i):
+        return {"id": f"r{i}", "tarih": "01-01-2025 10:00:00", "tip": "Gelir",
+                "kategori": "Bağış", "tutar": float(i), "aciklama": "test"}
+
+    def test_append_does_not_rewrite_snapshot(self):
+        """Yeni kayıt sadece günlüğe eklenmeli, snapshot aynı kalmalı."""
+        self.repo.save_record(self._record(1))
+
+        with open(self.ledger_file, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [])
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["r1"])
+
+    def test_bulk_append(self):
+        self.repo.save_records([self._record(1), self._record(2)])
+
+        with open(self.repo.journal_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(len(self.repo.load_all()), 2)
+
+    def test_threshold_compaction(self):
+        """Eşiğe ulaşınca günlük snapshot'a katlanmalı."""
+        for i in range(3):
+            self.repo.save_record(self._record(i))
+
+        self.assertEqual(os.path.getsize(self.repo.journal_path), 0)
+        self.assertEqual(len(FinanceRepository(self.ledger_file).load_all()), 3)
+
+    def test_existing_ledger_is_migrated(self):
+        """Eski formattaki finance.json kayıtları korunmalı."""
+        with open(self.ledger_file, 'w', encoding='utf-8') as f:
+            json.dump([self._record(7)], f)
+
+        self.repo.save_record(self._record(8))
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["r7", "r8"])
+
+    def test_corrections_are_appended_not_rewritten(self):
+        """Silme/güncelleme snapshot'ı yeniden yazmamalı; birleştirmede işlenmeli."""
+        self.repo.compact_threshold = 10
+        self.repo.save_records([self._record(1), self._record(2)])
+        self.repo.compact()
+        snapshot_mtime = os.path.getmtime(self.ledger_file)
+
+        self.assertTrue(self.repo.update_record("r1", {"tutar": 5.0}))
+        self.assertTrue(self.repo.delete_record("r2"))
+        self.assertFalse(self.repo.delete_record("yok"))
+
+        self.assertEqual(os.path.getmtime(self.ledger_file), snapshot_mtime)
+        with open(self.repo.journal_path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)["_op"] for line in f], ["update", "delete"])
+        self.assertEqual([(r["id"], r["tutar"]) for r in self.repo.load_all()], [("r1", 5.0)])
+        ledger_cache.invalidate()
+        self.assertEqual([(r["id"], r["tutar"]) for r in self.repo.iter_records()], [("r1", 5.0)])
+
+        self.repo.compact()
+        with open(self.ledger_file, encoding='utf-8') as f:
+            self.assertEqual([(r["id"], r["tutar"]) for r in json.load(f)], [("r1", 5.0)])
+        self.assertEqual(os.path.getsize(self.repo.journal_path), 0)
+
+    def test_interrupted_compaction_does_not_replay_journal(self):
+        """Birleştirme hangi adımda kesilirse kesilsin kayıtlar iki kez okunmamalı."""
+        with open(self.ledger_file, 'w', encoding='utf-8') as f:
+            json.dump([self._record(1)], f)
+        folded = json.dumps([self._record(1), self._record(2)])
+
+        # 1) Günlük taşındı, yeni snapshot henüz '.tmp' dosyasında
+        with open(self.repo.folding_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._record(2)) + "\n")
+        with open(self.ledger_file + ".tmp", 'w', encoding='utf-8') as f:
+            f.write(folded)
+        repo = JournalFinanceRepository(self.ledger_file)
+        self.assertEqual([r["id"] for r in repo.load_all()], ["r1", "r2"])
+        self.assertFalse(os.path.exists(repo.folding_path))
+
+        # 2) Snapshot yerine kondu, katlanan günlük henüz silinmedi
+        with open(self.repo.folding_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self._record(2)) + "\n")
+        ledger_cache.invalidate()
+        self.repo.save_record(self._record(3))
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["r1", "r2", "r3"])
+
+    def test_torn_journal_line_is_skipped(self):
+        """Yarım yazılmış satır sonraki kayıtları bozmamalı."""
+        with open(self.repo.journal_path, 'w', encoding='utf-8') as f:
+            f.write('{"id": "yar')
+
+        self.repo.save_record(self._record(2))
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["r2"])
+
+    def test_manager_with_journal_mode(self):
+        manager = FinanceManager(repo=self.repo)
+        success, _ = manager.add_transaction(
+            TransactionType.INCOME.value, IncomeCategory.DONATION.value, 250, "Bağışçı"
+        )
+        self.assertTrue(success)
+        self.assertEqual(manager.get_financial_summary()["toplam_gelir"], 250)
+
+
+class TestSqliteRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.repo = SqliteFinanceRepository(os.path.join(self.tmp_dir, "finance.db"))
+        self.manager = FinanceManager(repo=self.repo)
+        self.analyzer = FinancialAnalyzer(repo=self.repo)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_crud_roundtrip(self):
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 100, "Bağış A")
+        record = self.repo.load_all()[0]
+
+        self.assertEqual(self.manager.update_transaction(record["id"], new_amount=150)[0], True)
+        self.assertEqual(self.repo.load_all()[0]["tutar"], 150.0)
+        self.assertEqual(self.manager.delete_transaction(record["id"])[0], True)
+        self.assertEqual(self.repo.load_all(), [])
+        self.assertFalse(self.manager.delete_transaction(record["id"])[0])
+
+    def test_period_and_search_queries(self):
+        """Tarih aralığı sorgusu JSON deposu ile aynı sonucu vermeli."""
+        old = {"id": "eski0001", "tarih": "01-01-2000 10:00:00", "tip": "Gelir",
+               "kategori": "Bağış", "tutar": 5.0, "aciklama": "eski kayıt"}
+        self.repo.save_record(old)
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 70, "yeni kayıt")
+
+        report = self.analyzer.analyze_by_period("week")
+        self.assertEqual(report[TransactionType.INCOME.value], {IncomeCategory.DONATION.value: 70.0})
+        self.assertEqual([r["id"] for r in self.analyzer.search_transactions("eski")], ["eski0001"])
+        self.assertEqual(len(self.repo.load_between(datetime(1999, 12, 31), datetime.now())), 2)
+
+    def test_migrate_from_json(self):
+        json_path = os.path.join(self.tmp_dir, "legacy.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([{"id": "a1", "tarih": "02-02-2024 09:00:00", "tip": "Gider",
+                        "kategori": "Ekipman", "tutar": 12.5, "aciklama": "top", "ek_alan": 1}], f)
+
+        self.assertEqual(self.repo.migrate_from_json(json_path), 1)
+        # İkinci çağrı veriyi tekrar aktarmamalı
+        self.assertEqual(self.repo.migrate_from_json(json_path), 0)
+        self.assertEqual(self.repo.load_all()[0]["ek_alan"], 1)
+
+    def test_integer_columns_and_old_table_migration(self):
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 12.5, "Bağış")
+        record = self.repo.load_all()[0]
+        conn = sqlite3.connect(self.repo.file_path)
+        row = conn.execute("SELECT tutar_kurus, zaman, ek FROM transactions").fetchone()
+        conn.close()
+        self.assertEqual(row, (1250, record["zaman"], None))
+
+        # Sütunlar eklenmeden önceki şemada değerler 'ek' JSON'undaydı
+        old_path = os.path.join(self.tmp_dir, "old.db")
+        conn = sqlite3.connect(old_path)
+        conn.execute("CREATE TABLE transactions (sira INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL, "
+                     "tarih TEXT NOT NULL, gun TEXT, tip TEXT NOT NULL, kategori TEXT NOT NULL, "
+                     "tutar REAL NOT NULL, aciklama TEXT, ek TEXT)")
+        conn.execute("INSERT INTO transactions (id, tarih, gun, tip, kategori, tutar, aciklama, ek) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     (record["id"], record["tarih"], None, record["tip"], record["kategori"], 12.5, "Bağış",
+                      json.dumps({"zaman": record["zaman"], "tutar_kurus": 1250, "kaynak": "eski"})))
+        conn.commit()
+        conn.close()
+
+        old_repo = SqliteFinanceRepository(old_path)
+        self.assertEqual(old_repo.load_all(), [dict(record, kaynak="eski")])
+        conn = sqlite3.connect(old_path)
+        row = conn.execute("SELECT tutar_kurus, zaman, ek FROM transactions").fetchone()
+        conn.close()
+        self.assertEqual(row, (1250, record["zaman"], '{"kaynak": "eski"}'))
+
+
+class TestLedgerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger_file = os.path.join(self.tmp_dir, "finance.json")
+        self.repo = FinanceRepository(self.ledger_file)
+        self.repo.save_record({"id": "c1", "tarih": "01-01-2025 10:00:00", "tip": "Gelir",
+                               "kategori": "Bağış", "tutar": 10.0, "aciklama": "ilk"})
+        ledger_cache.reset_stats()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_repeated_reads_hit_cache(self):
+        """Dosya değişmedikçe ikinci okuma dosyaya gitmemeli."""
+        other_repo = FinanceRepository(self.ledger_file)
+        self.repo.load_view()
+        other_repo.load_view()
+
+        self.assertEqual(FinanceRepository.cache_stats()["hits"], 2)
+        self.assertEqual(FinanceRepository.cache_stats()["misses"], 0)
+
+    def test_view_is_read_only(self):
+        view = self.repo.load_view()
+        with self.assertRaises(TypeError):
+            view[0]["tutar"] = 0
+        # load_all kopya döndüğü için değişiklik önbelleğe yansımamalı
+        self.repo.load_all()[0]["tutar"] = 0
+        self.assertEqual(self.repo.load_view()[0]["tutar"], 10.0)
+
+    def test_external_change_invalidates(self):
+        with open(self.ledger_file, 'w', encoding='utf-8') as f:
+            json.dump([], f)
+
+        self.assertEqual(len(self.repo.load_view()), 0)
+        self.assertEqual(FinanceRepository.cache_stats()["misses"], 1)
+
+    def test_append_keeps_cache_warm(self):
+        self.repo.save_record({"id": "c2", "tarih": "02-01-2025 10:00:00", "tip": "Gider",
+                               "kategori": "Ekipman", "tutar": 3.0, "aciklama": "ikinci"})
+
+        self.assertEqual([r["id"] for r in self.repo.load_view()], ["c1", "c2"])
+        self.assertEqual(FinanceRepository.cache_stats()["misses"], 0)
+
+
+class TestTimestampMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger_file = os.path.join(self.tmp_dir, "finance.json")
+        with open(self.ledger_file, 'w', encoding='utf-8') as f:
+            json.dump([
+                {"id": "m1", "tarih": "31-12-2024 23:59:59", "tip": "Gelir",
+                 "kategori": "Bağış", "tutar": 1.0, "aciklama": "eski"},
+                {"id": "m2", "tarih": "bozuk", "tip": "Gelir",
+                 "kategori": "Bağış", "tutar": 2.0, "aciklama": "tarihsiz"},
+            ], f)
+        self.repo = FinanceRepository(self.ledger_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_migration_runs_once(self):
+        self.assertEqual(self.repo.migrate_timestamps(), 1)
+        # Tarihi bozuk kayıt kalsa da defter tekrar kopyalanmamalı
+        with patch.object(FinanceRepository, "load_all", side_effect=AssertionError("load_all")):
+            self.assertEqual(self.repo.migrate_timestamps(), 0)
+
+        with open(self.ledger_file, encoding='utf-8') as f:
+            migrated = json.load(f)[0]
+        self.assertEqual(migrated["zaman"], int(to_epoch(datetime(2024, 12, 31, 23, 59, 59))))
+
+    def test_new_records_sort_by_zaman(self):
+        manager = FinanceManager(repo=self.repo)
+        manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 5, "yeni")
+        newest = self.repo.load_view()[-1]
+
+        self.assertIsInstance(newest["zaman"], int)
+        self.assertGreater(newest["zaman"], to_epoch(datetime(2024, 12, 31, 23, 59, 59)))
+        self.assertEqual([r["id"] for r in self.repo.load_between(datetime(2024, 12, 31), datetime(2025, 1, 1))], ["m1"])
+
+
+class TestShardedRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.repo = ShardedFinanceRepository(os.path.join(self.tmp_dir, "finance"))
+        self.manager = FinanceManager(repo=self.repo)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _old_record(self, t_id, tarih):
+        return {"id": t_id, "tarih": tarih, "tip": "Gelir", "kategori": "Bağış",
+                "tutar": 10.0, "aciklama": "arşiv"}
+
+    def test_corrections_are_folded_at_threshold(self):
+        repo = ShardedFinanceRepository(os.path.join(self.tmp_dir, "esikli"), compact_threshold=3)
+        repo.save_records([
+            self._old_record("a", "05-01-2024 10:00:00"),
+            self._old_record("b", "20-01-2024 10:00:00"),
+            self._old_record("c", "03-02-2024 10:00:00"),
+            self._old_record("d", "04-02-2024 10:00:00"),
+        ])
+        repo.delete_record("a")
+        repo.update_record("c", {"tutar": 25.0})
+        self.assertEqual(repo.load_manifest()["duzeltme"], 2)
+        old_corrections = repo.corrections_path
+
+        repo.delete_record("d")
+        manifest = repo.load_manifest()
+        self.assertEqual((manifest["nesil"], manifest["duzeltme"]), (1, 0))
+        self.assertFalse(os.path.exists(old_corrections))
+        self.assertFalse(os.path.exists(repo.corrections_path))
+        self.assertEqual({k: v["kayit"] for k, v in manifest["shards"].items()}, {"2024-01": 1, "2024-02": 1})
+
+        ledger_cache.invalidate()
+        self.assertEqual([(r["id"], r["tutar"]) for r in repo.load_all()], [("b", 10.0), ("c", 25.0)])
+        self.assertEqual([r["id"] for r in repo.load_between(datetime(2024, 2, 1), datetime(2024, 2, 28))], ["c"])
+
+    def test_records_split_by_month(self):
+        self.repo.save_records([
+            self._old_record("a", "05-01-2024 10:00:00"),
+            self._old_record("b", "20-01-2024 10:00:00"),
+            self._old_record("c", "03-02-2024 10:00:00"),
+        ])
+        self.assertEqual(sorted(self.repo.load_manifest()["shards"]), ["2024-01", "2024-02"])
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["a", "b", "c"])
+
+    def test_period_query_reads_only_recent_shards(self):
+        """Haftalık rapor eski ay dosyalarını açmamalı."""
+        self.repo.save_record(self._old_record("eski", "05-01-2024 10:00:00"))
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 40, "yeni")
+        # Eski parça okunsaydı bu (bu haftaya tarihli) kayıt da rapora girerdi
+        planted = self._old_record("tuzak", datetime.now().strftime("%d-%m-%Y %H:%M:%S"))
+        with open(self.repo.shard_path("2024-01"), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(planted) + "\n")
+
+        report = FinancialAnalyzer(repo=self.repo).analyze_by_period("week")
+        self.assertEqual(report[TransactionType.INCOME.value], {IncomeCategory.DONATION.value: 40.0})
+
+    def test_corrections_leave_old_shards_untouched(self):
+        self.repo.save_record(self._old_record("eski", "05-01-2024 10:00:00"))
+        shard_file = self.repo.shard_path("2024-01")
+        before = os.path.getmtime(shard_file), os.path.getsize(shard_file)
+
+        self.assertTrue(self.manager.update_transaction("eski", new_amount=25)[0])
+        self.assertEqual(self.repo.load_all()[0]["tutar"], 25.0)
+        self.assertTrue(self.manager.delete_transaction("eski")[0])
+        self.assertEqual(self.repo.load_all(), [])
+        self.assertEqual((os.path.getmtime(shard_file), os.path.getsize(shard_file)), before)
+
+    def test_id_index_survives_corrections(self):
+        """Silme/güncelleme kimlik indeksini yeniden kurdurmamalı; eski kimlikler çalışmalı."""
+        self.repo.save_records([self._old_record("1a2b3c4d", "05-01-2024 10:00:00"),
+                                self._old_record("eski-2", "06-01-2024 10:00:00")])
+        self.manager.add_transaction(TransactionType.INCOME.value, IncomeCategory.DONATION.value, 40, "yeni")
+        new_id = self.repo.load_all()[-1]["id"]
+        index = self.repo.derived("id_index", IdIndex.from_records)
+
+        self.assertTrue(self.manager.update_transaction("1a2b3c4d", new_amount=25)[0])
+        self.assertTrue(self.manager.delete_transaction(new_id)[0])
+        self.assertIs(self.repo.derived("id_index", IdIndex.from_records), index)
+        self.assertEqual(self.repo.find_by_id("1a2b3c4d")["tutar"], 25.0)
+        self.assertIsNone(self.repo.find_by_id(new_id))
+        self.assertEqual(len(index), 2)
+        ledger_cache.invalidate()
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["1a2b3c4d", "eski-2"])
+
+    def test_append_repairs_torn_last_line(self):
+        """Yarım kalmış satırdan sonra eklenen kayıt ve düzeltme kaybolmamalı."""
+        self.repo.save_record(self._old_record("a", "05-01-2024 10:00:00"))
+        with open(self.repo.shard_path("2024-01"), 'a', encoding='utf-8') as f:
+            f.write('{"id": "yarim", "tarih"')
+        self.repo.save_record(dict(self._old_record("b", "06-01-2024 10:00:00"), tutar=20.0))
+        self.assertEqual([r["tutar"] for r in self.repo.load_all()], [10.0, 20.0])
+
+        with open(self.repo.corrections_path, 'a', encoding='utf-8') as f:
+            f.write('{"islem": "sil')
+        self.assertTrue(self.repo.delete_record("a"))
+        ledger_cache.invalidate()
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["b"])
+
+    def test_interrupted_rewrite_keeps_old_generation(self):
+        self.repo.save_records([self._old_record("a", "05-01-2024 10:00:00"),
+                                self._old_record("b", "03-02-2024 10:00:00")])
+        self.repo.delete_record("b")
+        data = self.repo.load_all() + [self._old_record("c", "04-03-2024 10:00:00")]
+
+        with patch.object(ShardedFinanceRepository, "_write_manifest", side_effect=OSError("disk dolu")):
+            with self.assertRaises(OSError):
+                self.repo._write_file(data)
+        ledger_cache.invalidate()
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["a"])
+
+        # Tekrar deneme yarım kalan neslin artıklarını temizleyip tamamlar
+        self.repo._save_to_file(data)
+        ledger_cache.invalidate()
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["a", "c"])
+        self.assertEqual(sorted(os.listdir(self.repo.file_path)),
+                         ["2024-01.1.jsonl", "2024-03.1.jsonl", "manifest.json"])
+
+    def test_new_month_shard_is_listed_before_it_is_written(self):
+        self.repo.save_record(self._old_record("a", "05-01-2024 10:00:00"))
+        written = []
+        original = ShardedFinanceRepository._append
+
+        def crash_after_append(path, payload):
+            original(path, payload)
+            written.append(path)
+            raise OSError("kesildi")
+
+        with patch.object(ShardedFinanceRepository, "_append", staticmethod(crash_after_append)):
+            with self.assertRaises(OSError):
+                self.repo.save_record(self._old_record("b", "03-02-2024 10:00:00"))
+        ledger_cache.invalidate()
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["a", "b"])
+
+    def test_json_migration_is_marked_in_the_same_write(self):
+        json_path = os.path.join(self.tmp_dir, "eski.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([self._old_record("j1", "05-01-2024 10:00:00")], f)
+
+        self.assertEqual(self.repo.migrate_from_json(json_path), 1)
+        self.assertEqual(self.repo.migrate_from_json(json_path), 0)
+        manifest = self.repo.load_manifest()
+        self.assertEqual(manifest["json_migrated"], os.path.abspath(json_path))
+        self.assertEqual([r["id"] for r in self.repo.load_all()], ["j1"])
+
+
+class TestStreamingReads(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.records = [
+            {"id": f"s{i}", "tarih": f"{i % 28 + 1:02d}-0{i % 9 + 1}-2024 10:00:00", "tip": "Gider",
+             "kategori": "Ekipman", "tutar": i + 0.5, "aciklama": f"Şut [{i}], \"çift\" {{}}"}
+            for i in range(40)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_json_array_parser_matches_json_load(self):
+        path = os.path.join(self.tmp_dir, "finance.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=4)
+
+        for chunk_size in (1, 7, 64, 1 << 16):
+            self.assertEqual(list(iter_json_array(path, chunk_size=chunk_size)), self.records)
+
+    def test_truncated_array_raises(self):
+        path = os.path.join(self.tmp_dir, "finance.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.records)[:-30])
+
+        with self.assertRaises(DataStorageError):
+            list(iter_json_array(path, chunk_size=16))
+
+    def test_iter_records_matches_load_all(self):
+        repos = [
+            FinanceRepository(os.path.join(self.tmp_dir, "a.json")),
+            JournalFinanceRepository(os.path.join(self.tmp_dir, "b.json"), compact_threshold=25),
+            SqliteFinanceRepository(os.path.join(self.tmp_dir, "c.db")),
+            ShardedFinanceRepository(os.path.join(self.tmp_dir, "d")),
+        ]
+        for repo in repos:
+            repo.save_records(self.records[:20])
+            for record in self.records[20:]:
+                repo.save_record(record)
+            repo.update_record("s3", {"tutar": 99.0})
+            repo.delete_record("s4")
+            ledger_cache.invalidate()
+
+            streamed = [dict(r) for r in repo.iter_records()]
+            self.assertEqual(streamed, repo.load_all(), type(repo).__name__)
+            self.assertEqual(len(streamed), 39)
+
+    def test_reports_do_not_load_whole_ledger(self):
+        """Özet raporlar kayıt listesini önbelleğe almadan, akıştan hesaplanmalı."""
+        repo = FinanceRepository(os.path.join(self.tmp_dir, "finance.json"))
+        with open(repo.file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f)
+        analyzer = FinancialAnalyzer(repo=repo)
+        manager = FinanceManager(repo=repo)
+
+        self.assertEqual(analyzer.get_budget_status()["net_bakiye"], -sum(r["tutar"] for r in self.records))
+        analyzer.analyze_by_period("year")
+        manager.get_category_breakdown()
+        self.assertIsNone(ledger_cache.peek(repo._cache_key(), repo._watched_paths()))
+
+
+class TestCompactTransaction(unittest.TestCase):
+
+    def test_round_trip_keeps_dict_shape(self):
+        records = [
+            Transaction("Gider", "Ekipman", 1234.56, "Top", athlete_id="P1").to_dict(),
+            # Eski/olağan dışı kayıt: tam sayı tutar, sadece gün, sıkıştırılamayan alanlar
+            {"id": "SPOR-1", "tarih": "01-01-2024", "tip": "Gelir", "kategori": "Eski Kategori",
+             "tutar": 500, "aciklama": None, "bordro_no": "B-1"},
+            {"id": "a1b2c3d4", "tarih": "02-01-2025 10:00:00", "zaman": 1.5, "tip": "Gider",
+             "kategori": "Vergi Ödemesi", "tutar": 0.125, "aciklama": "Kesinti"},
+        ]
+        for record in records:
+            compact = CompactTransaction.from_dict(record)
+            self.assertEqual(compact.to_dict(), record)
+            self.assertEqual(list(compact), list(record))
+            self.assertEqual(type(compact["tutar"]), type(record["tutar"]))
+            self.assertEqual(compact, record)
+        self.assertNotIn("zaman", CompactTransaction.from_dict(records[1]))
+        self.assertIsNone(CompactTransaction.from_dict(records[1]).get("zaman"))
+
+    def test_cached_records_are_compact(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            repo = FinanceRepository(os.path.join(tmp_dir, "finance.json"))
+            record = Transaction("Gelir", "Bağış", 10.1).to_dict()
+            repo.save_record(record)
+            self.assertIsInstance(repo.load_view()[0], CompactTransaction)
+            self.assertEqual(repo.load_all(), [record])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class TestTransactionIds(unittest.TestCase):
+
+    def test_ids_are_monotonic_and_time_ordered(self):
+        ids = [new_transaction_id() for _ in range(1000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 1000)
+        self.assertEqual(len(ids[0]), 26)
+        backdated = new_transaction_id(at=datetime(2025, 3, 1, 12, 0, 0))
+        self.assertEqual(id_timestamp(backdated), to_epoch(datetime(2025, 3, 1, 12, 0, 0)))
+        self.assertLess(backdated, ids[0])
+        self.assertIsNone(id_timestamp("1a2b3c4d"))
+
+    def test_created_between_uses_id_range(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            repo = FinanceRepository(os.path.join(tmp_dir, "finance.json"))
+            records = []
+            for day in (1, 2, 3):
+                record = Transaction("Gelir", "Bağış", float(day)).to_dict()
+                record["id"] = new_transaction_id(at=datetime(2025, 3, day, 9, 30))
+                records.append(record)
+            records.append({"id": "1a2b3c4d", "tarih": "02-03-2025 10:00:00", "tip": "Gelir",
+                            "kategori": "Bağış", "tutar": 9.0, "aciklama": "eski"})
+            repo.save_records(records)
+
+            created = repo.load_created_between(datetime(2025, 3, 2), datetime(2025, 3, 3))
+            self.assertEqual([r["tutar"] for r in created], [2.0, 3.0])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)